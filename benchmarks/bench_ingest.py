@@ -0,0 +1,58 @@
+"""
+GitHub 수집 벤치마크
+
+가짜 GitHub 서버(응답 지연 설정 가능)에 대해 요청을 하나씩 보내는 순차 수집(동시 요청 1개)과
+비동기 동시 수집의 스냅샷 생성 시간을 비교합니다.
+
+    python benchmarks/bench_ingest.py --latency 0.05 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.fake_github import FakeGitHub
+from github_async import AsyncGitHubClient
+
+
+async def async_snapshot(base_url: str, full_name: str, concurrency: int):
+    async with AsyncGitHubClient(base_url=base_url, max_concurrency=concurrency) as client:
+        return await client.fetch_snapshot(full_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--issues', type=int, default=250)
+    args = parser.parse_args()
+
+    with FakeGitHub(latency=args.latency) as fake:
+        fake.add_sample_repo('octo/potless', issues=args.issues)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            asyncio.run(async_snapshot(fake.url, 'octo/potless', 1))
+        sync_elapsed = (time.perf_counter() - start) / args.repeat
+        sync_requests = sum(fake.requests.values()) / args.repeat
+
+        fake.requests.clear()
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            asyncio.run(async_snapshot(fake.url, 'octo/potless', args.concurrency))
+        async_elapsed = (time.perf_counter() - start) / args.repeat
+        async_requests = sum(fake.requests.values()) / args.repeat
+
+    print(f"지연 {args.latency * 1000:.0f}ms, 이슈 {args.issues}개")
+    print(f"{'':<12}{'ms/snapshot':>14}{'requests':>10}")
+    print(f"{'sequential':<12}{sync_elapsed * 1000:>14.1f}{sync_requests:>10.0f}")
+    print(f"{'async':<12}{async_elapsed * 1000:>14.1f}{async_requests:>10.0f}")
+    print(f"{'speedup':<12}{sync_elapsed / async_elapsed:>13.1f}x")
+
+
+if __name__ == '__main__':
+    main()
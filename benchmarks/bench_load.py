@@ -0,0 +1,436 @@
+"""
+MCP 도구 부하 테스트
+
+가짜 GitHub 서버(응답 지연, 페이지 크기, rate limit 응답 설정 가능)를 띄우고 여러 가상 클라이언트가 동시에
+MCP 도구(create_project_from_template, analyze_github_repo, get_project_info, generate_portfolio,
+generate_resume_section)를 섞어 호출해 도구별 처리량과 p50/p95/p99 지연 시간을 측정합니다.
+
+- --target http: 서버를 --workers개 워커로 띄우고 클라이언트마다 MCP streamable HTTP(/mcp) 세션 하나로 호출 (기본)
+- --target inproc: 같은 프로세스에서 FastMCP.call_tool로 호출 (전송 계층 제외)
+- --json: 결과를 JSON으로 저장합니다.
+- --baseline: 저장된 결과와 비교해 p95 지연이나 처리량이 --tolerance 이상 나빠졌거나 오류율이 늘면
+  종료 코드 1로 끝나므로 회귀 검사로 쓸 수 있습니다. --update-baseline은 이번 결과를 기준으로 저장합니다.
+
+    python benchmarks/bench_load.py --clients 16 --duration 15 --latency 0.05 --json load.json
+    python benchmarks/bench_load.py --baseline benchmarks/baseline_load.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import re
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from benchmarks.fake_github import FakeGitHub
+
+RESULT_VERSION = 1
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_load.json')
+# 도구별 호출 비중 (--mix로 바꿀 수 있음)
+DEFAULT_MIX = {
+    'get_project_info': 40,
+    'generate_portfolio': 20,
+    'generate_resume_section': 20,
+    'analyze_github_repo': 10,
+    'create_project_from_template': 10,
+}
+RESUME_SECTIONS = ('motivation', 'contribution', 'challenge')
+# 오류 응답을 구분하는 문자열 (도구는 오류를 예외 대신 문자열/dict로 반환하기도 함)
+ERROR_TEXTS = ('오류 발생', 'Project not found', 'Unsupported', '찾을 수 없습니다')
+PROJECT_ID = re.compile(r'ID: (\d+)')
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """정렬된 값의 q 백분위수 (선형 보간)"""
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def classify(text: str, is_error: bool) -> Optional[str]:
+    """오류 응답이면 요약 메시지, 정상이면 None"""
+    if is_error:
+        return text[:80]
+    if text.startswith('{'):
+        try:
+            body = json.loads(text)
+        except ValueError:
+            body = {}
+        if body.get('error') or body.get('status') == 'failed':
+            return str(body.get('error'))[:80]
+    elif any(marker in text[:200] for marker in ERROR_TEXTS):
+        return text[:80]
+    return None
+
+
+# ----------------------------------------------------------------------
+# 호출 대상
+
+
+class InProcessTarget:
+    """같은 프로세스의 FastMCP 인스턴스를 직접 호출"""
+
+    def __init__(self, env: Dict[str, str]):
+        # 서버 모듈이 import 시점에 읽는 설정(GITHUB_API_URL 등)을 먼저 적용
+        os.environ.update(env)
+        logging.getLogger('httpx').setLevel(logging.WARNING)
+        import project_portfolio_server
+        self.mcp = project_portfolio_server.mcp
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        import job_queue
+        await job_queue.get_queue().stop()
+
+    def session(self):
+        return _InProcessSession(self.mcp)
+
+
+class _InProcessSession:
+    def __init__(self, mcp):
+        self.mcp = mcp
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> Tuple[str, bool]:
+        try:
+            result = await self.mcp.call_tool(name, arguments)
+        except Exception as e:
+            return str(e), True
+        content = result[0] if isinstance(result, tuple) else result
+        return (content[0].text if content else ''), False
+
+
+class HttpTarget:
+    """서버를 하위 프로세스로 띄우고 MCP streamable HTTP로 호출"""
+
+    def __init__(self, env: Dict[str, str], workers: int):
+        self.env = env
+        self.workers = workers
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.port = sock.getsockname()[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process: Optional[subprocess.Popen] = None
+        self.log = tempfile.NamedTemporaryFile(prefix='bench_load_server_', suffix='.log', delete=False)
+
+    async def start(self):
+        import httpx
+
+        self.process = subprocess.Popen(
+            [sys.executable, 'project_portfolio_server.py', '--host', '127.0.0.1', '--port', str(self.port),
+             '--workers', str(self.workers)],
+            cwd=ROOT, env={**os.environ, **self.env}, stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        async with httpx.AsyncClient() as client:
+            deadline = time.monotonic() + 30
+            while time.monotonic() < deadline:
+                if self.process.poll() is not None:
+                    break
+                try:
+                    if (await client.get(self.url + '/health/ready')).status_code == 200:
+                        return
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.1)
+        raise RuntimeError(f"서버가 시작되지 않았습니다. 로그: {self.log.name}")
+
+    async def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                await asyncio.to_thread(self.process.wait, 30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def session(self):
+        return _HttpSession(self.url + '/mcp')
+
+
+class _HttpSession:
+    def __init__(self, url: str):
+        self.url = url
+        self._transport = None
+        self._session = None
+
+    async def __aenter__(self):
+        from mcp import ClientSession
+        from mcp.client.streamable_http import streamablehttp_client
+
+        self._transport = streamablehttp_client(self.url)
+        read, write, _ = await self._transport.__aenter__()
+        self._session = ClientSession(read, write)
+        await self._session.__aenter__()
+        await self._session.initialize()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.__aexit__(*exc)
+        await self._transport.__aexit__(*exc)
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> Tuple[str, bool]:
+        result = await self._session.call_tool(name, arguments)
+        return (result.content[0].text if result.content else ''), result.isError
+
+
+# ----------------------------------------------------------------------
+# 부하 생성
+
+
+class Workload:
+    """가상 클라이언트가 공유하는 상태 (저장소 URL, 만들어진 프로젝트 ID)"""
+
+    def __init__(self, repos: List[str], mix: Dict[str, int], job_wait: float, seed: int):
+        self.repos = repos
+        self.tools = list(mix)
+        self.weights = [mix[tool] for tool in self.tools]
+        self.job_wait = job_wait
+        self.project_ids: List[int] = []
+        self.random = random.Random(seed)
+
+    def next_call(self) -> Tuple[str, Dict[str, Any]]:
+        tool = self.random.choices(self.tools, self.weights)[0]
+        if tool in ('create_project_from_template', 'analyze_github_repo'):
+            return tool, {'github_url': self.random.choice(self.repos), 'wait': self.job_wait}
+        arguments: Dict[str, Any] = {'project_id': self.random.choice(self.project_ids)}
+        if tool == 'get_project_info':
+            arguments['compact'] = True
+        elif tool == 'generate_resume_section':
+            arguments['section_type'] = self.random.choice(RESUME_SECTIONS)
+        return tool, arguments
+
+    def record_created(self, text: str):
+        match = PROJECT_ID.search(text)
+        if match:
+            self.project_ids.append(int(match.group(1)))
+
+
+async def seed_projects(target, workload: Workload):
+    """측정 전에 저장소마다 프로젝트를 하나씩 만듭니다 (GitHub 응답 캐시도 채워짐)."""
+    async with target.session() as session:
+        for url in workload.repos:
+            text, is_error = await session.call('create_project_from_template', {'github_url': url, 'wait': 60})
+            if classify(text, is_error):
+                raise RuntimeError(f"프로젝트 생성 실패 ({url}): {text[:200]}")
+            workload.record_created(text)
+
+
+async def run_client(target, workload: Workload, deadline: float, samples: list):
+    async with target.session() as session:
+        while time.monotonic() < deadline:
+            tool, arguments = workload.next_call()
+            start = time.perf_counter()
+            try:
+                text, is_error = await session.call(tool, arguments)
+            except Exception as e:
+                text, is_error = f"{type(e).__name__}: {e}", True
+            elapsed = time.perf_counter() - start
+            error = classify(text, is_error)
+            samples.append((tool, elapsed, error))
+            if tool == 'create_project_from_template' and error is None:
+                workload.record_created(text)
+
+
+def summarize(samples: list, wall: float) -> Dict[str, Any]:
+    """도구별, 전체 처리량과 지연 시간 분포"""
+    by_tool: Dict[str, list] = defaultdict(list)
+    for sample in samples:
+        by_tool[sample[0]].append(sample)
+
+    def stats(rows: list) -> Dict[str, Any]:
+        latencies = sorted(row[1] for row in rows)
+        errors = Counter(row[2] for row in rows if row[2] is not None)
+        result = {
+            'calls': len(rows),
+            'errors': sum(errors.values()),
+            'errorRate': round(sum(errors.values()) / len(rows), 4) if rows else 0.0,
+            'throughput': round(len(rows) / wall, 2),
+            'meanMs': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+            'maxMs': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+        for q in PERCENTILES:
+            result[f'p{q}Ms'] = round(percentile(latencies, q) * 1000, 2)
+        if errors:
+            result['topErrors'] = dict(errors.most_common(3))
+        return result
+
+    return {
+        'tools': {tool: stats(rows) for tool, rows in sorted(by_tool.items())},
+        'total': stats(samples),
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        mix = {name: int(weight) for name, weight in (item.split('=') for item in args.mix.split(','))}
+
+    fake = FakeGitHub(latency=args.latency, rate_limit=args.rate_limit, rate_limit_window=args.rate_window,
+                      secondary_limit_every=args.secondary_limit_every, per_page_max=args.per_page_max)
+    repos = []
+    for i in range(args.repos):
+        fake.add_sample_repo(f'bench/repo-{i}', issues=args.issues)
+        repos.append(f'https://github.com/bench/repo-{i}')
+
+    workdir = tempfile.mkdtemp(prefix='bench_load_')
+    env = {
+        'PORTFOLIO_DB': os.path.join(workdir, 'portfolio.db'),
+        'GITHUB_CACHE_DIR': os.path.join(workdir, 'github_cache'),
+        'GITHUB_BACKEND': 'api',
+        'GITHUB_TOKENS': ','.join(f'bench-token-{i}' for i in range(args.tokens)),
+        'GITHUB_TOKEN': '',
+        'GITHUB_STATUS_INTERVAL': '3600',
+    }
+    with fake:
+        env['GITHUB_API_URL'] = fake.url
+        target = HttpTarget(env, args.workers) if args.target == 'http' else InProcessTarget(env)
+        await target.start()
+        try:
+            workload = Workload(repos, mix, args.job_wait, args.seed)
+            await seed_projects(target, workload)
+            seeded_requests = sum(fake.requests.values())
+            seeded_statuses = Counter(fake.statuses)
+
+            samples: list = []
+            start = time.monotonic()
+            deadline = start + args.duration
+            await asyncio.gather(*(run_client(target, workload, deadline, samples) for _ in range(args.clients)))
+            wall = time.monotonic() - start
+        finally:
+            await target.stop()
+
+    result = summarize(samples, wall)
+    result.update({
+        'version': RESULT_VERSION,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'host': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'config': {key: getattr(args, key) for key in (
+            'target', 'workers', 'clients', 'duration', 'latency', 'repos', 'issues', 'per_page_max',
+            'rate_limit', 'rate_window', 'secondary_limit_every', 'tokens', 'job_wait', 'seed')},
+        'mix': mix,
+        'wallSeconds': round(wall, 2),
+        'github': {
+            'requests': sum(fake.requests.values()) - seeded_requests,
+            'statuses': {str(status): count for status, count in sorted((fake.statuses - seeded_statuses).items())},
+        },
+    })
+    return result
+
+
+# ----------------------------------------------------------------------
+# 출력과 기준 비교
+
+
+def print_report(result: Dict[str, Any]):
+    config = result['config']
+    print(f"대상 {config['target']} (워커 {config['workers']}), 클라이언트 {config['clients']}, "
+          f"{result['wallSeconds']}초, GitHub 지연 {config['latency'] * 1000:.0f}ms, "
+          f"GitHub 요청 {result['github']['requests']}건 {result['github']['statuses']}")
+    print(f"{'':<30}{'calls':>8}{'err':>6}{'calls/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in [*result['tools'].items(), ('(total)', result['total'])]:
+        print(f"{name:<30}{stats['calls']:>8}{stats['errors']:>6}{stats['throughput']:>10.1f}"
+              f"{stats['p50Ms']:>10.1f}{stats['p95Ms']:>10.1f}{stats['p99Ms']:>10.1f}{stats['maxMs']:>10.1f}")
+    for name, stats in result['tools'].items():
+        for message, count in stats.get('topErrors', {}).items():
+            print(f"  {name}: {count}x {message}")
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준보다 나빠진 항목 목록 (p95 지연, 처리량, 오류율)"""
+    if baseline.get('config') != result.get('config'):
+        changed = sorted(key for key in set(result['config']) | set(baseline.get('config', {}))
+                         if result['config'].get(key) != baseline.get('config', {}).get(key))
+        print(f"주의: 기준과 설정이 다릅니다 ({', '.join(changed)})")
+
+    regressions = []
+    print(f"\n{'기준 대비':<30}{'p95 ms':>22}{'calls/s':>22}{'error rate':>16}")
+    rows = [(name, stats, baseline['tools'].get(name)) for name, stats in result['tools'].items()]
+    rows.append(('(total)', result['total'], baseline.get('total')))
+    for name, stats, base in rows:
+        if not base:
+            print(f"{name:<30}{'(기준 없음)':>22}")
+            continue
+        p95_change = stats['p95Ms'] / base['p95Ms'] - 1 if base['p95Ms'] else 0.0
+        throughput_change = stats['throughput'] / base['throughput'] - 1 if base['throughput'] else 0.0
+        print(f"{name:<30}{base['p95Ms']:>8.1f} → {stats['p95Ms']:>7.1f} {p95_change:>+4.0%}"
+              f"{base['throughput']:>8.1f} → {stats['throughput']:>7.1f} {throughput_change:>+4.0%}"
+              f"{base['errorRate']:>7.1%} → {stats['errorRate']:>5.1%}")
+        if p95_change > tolerance:
+            regressions.append(f"{name}: p95 {base['p95Ms']:.1f}ms → {stats['p95Ms']:.1f}ms")
+        if throughput_change < -tolerance:
+            regressions.append(f"{name}: 처리량 {base['throughput']:.1f} → {stats['throughput']:.1f} calls/s")
+        if stats['errorRate'] > base['errorRate'] + 0.01:
+            regressions.append(f"{name}: 오류율 {base['errorRate']:.1%} → {stats['errorRate']:.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=('http', 'inproc'), default='http')
+    parser.add_argument('--workers', type=int, default=2, help='http 대상의 uvicorn 워커 수')
+    parser.add_argument('--clients', type=int, default=16, help='동시 가상 클라이언트 수')
+    parser.add_argument('--duration', type=float, default=15, help='측정 시간(초)')
+    parser.add_argument('--latency', type=float, default=0.05, help='가짜 GitHub 응답 지연(초)')
+    parser.add_argument('--repos', type=int, default=8)
+    parser.add_argument('--issues', type=int, default=120, help='저장소별 이슈 수')
+    parser.add_argument('--per-page-max', type=int, default=50, help='가짜 GitHub의 최대 페이지 크기')
+    parser.add_argument('--rate-limit', type=int, default=5000, help='토큰별 시간당 요청 수')
+    parser.add_argument('--rate-window', type=float, default=3600, help='rate limit 리셋 주기(초)')
+    parser.add_argument('--secondary-limit-every', type=int, default=0, help='N번째 요청마다 2차 rate limit 응답')
+    parser.add_argument('--tokens', type=int, default=2, help='토큰 풀에 넣을 가짜 토큰 수')
+    parser.add_argument('--job-wait', type=float, default=30, help='저장소 분석 도구의 wait 인자')
+    parser.add_argument('--mix', help='도구별 비중 (예: get_project_info=5,generate_portfolio=1)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='결과를 저장할 JSON 경로')
+    parser.add_argument('--baseline', help=f'비교할 기준 결과 (기본 저장 위치: {os.path.relpath(DEFAULT_BASELINE)})')
+    parser.add_argument('--update-baseline', action='store_true', help='이번 결과를 --baseline 경로에 저장')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='회귀로 볼 변화 비율')
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print_report(result)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    baseline_path = args.baseline or (DEFAULT_BASELINE if args.update_baseline else None)
+    if args.update_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n기준 결과 저장: {baseline_path}")
+    elif baseline_path:
+        with open(baseline_path, encoding='utf-8') as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            print("\n회귀:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nOK: 기준 대비 회귀 없음")
+
+
+if __name__ == '__main__':
+    main()
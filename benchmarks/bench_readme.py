@@ -0,0 +1,116 @@
+"""
+README 추출 벤치마크
+
+실제 README 모음에 대해 기존 정규식 추출(패턴마다 본문 전체를 다시 검색)과
+섹션 색인 기반 추출의 README당 처리 시간을 비교합니다.
+
+말뭉치는 --corpus로 준 Markdown 파일/디렉토리이며, 주지 않으면 이 저장소의 Markdown
+파일과 설치된 패키지 메타데이터의 README(long description)를 사용합니다.
+
+    python benchmarks/bench_readme.py --repeat 20
+    python benchmarks/bench_readme.py --corpus ~/src/readmes
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from importlib import metadata
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from project_portfolio_server import extract_features_and_challenges, extract_tech_stack
+from repo_snapshot import RepoSnapshot
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+def legacy_extract(content: str):
+    """변경 전 추출 방식 (비교용)"""
+    tech_stack = set()
+    lowered = content.lower()
+    for pattern in [r"tech stack[:\s]*(.*?)(?=##|\Z)", r"기술 스택[:\s]*(.*?)(?=##|\Z)",
+                    r"사용 기술[:\s]*(.*?)(?=##|\Z)", r"technologies[:\s]*(.*?)(?=##|\Z)"]:
+        match = re.search(pattern, lowered, re.DOTALL)
+        if match:
+            for groups in re.findall(r'`([^`]+)`|\*\*([^\*]+)\*\*|#\s*([^\n]+)|\b(react|vue|angular|node|python|java|spring|django|flask|mysql|postgresql|mongodb)\b', match.group(1), re.IGNORECASE):
+                keyword = next((k for k in groups if k), None)
+                if keyword:
+                    tech_stack.add(keyword.strip())
+
+    features, challenges = [], []
+    feature_section = re.search(r'# 📕주요기능[^\n]*\n(.*?)(?=\n#|\Z)', content, re.IGNORECASE | re.DOTALL)
+    if feature_section:
+        section_text = feature_section.group(1)
+        for section in re.finditer(r'###\s*(\d+)\.\s*([^\n]+)', section_text):
+            details = re.findall(r'[-\*]\s*([^\n]+)', section_text[section.end():].split('###')[0])
+            features.append(f"{section.group(2)}: {', '.join(details)}" if details else section.group(2))
+    for pattern in [r"# 🔎기획배경\s*(.*?)(?=\n#|\Z)", r"문제[:\s]*(.*?)(?=##|\Z)", r"도전 과제[:\s]*(.*?)(?=##|\Z)"]:
+        match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
+        if match:
+            items = re.findall(r'[-\*]\s*([^\n]+)', match.group(1))
+            challenges.extend(item.strip() for item in items) if items else challenges.append(match.group(1).strip())
+            break
+    return tech_stack, features, challenges
+
+
+def indexed_extract(content: str):
+    snapshot = RepoSnapshot.preloaded(readme_text=content, languages={}, manifests={})
+    return extract_tech_stack(snapshot), extract_features_and_challenges(snapshot)
+
+
+def load_corpus(paths):
+    documents = []
+    if paths:
+        for path in paths:
+            files = glob.glob(os.path.join(path, '**', '*.md'), recursive=True) if os.path.isdir(path) else [path]
+            for name in files:
+                with open(name, encoding='utf-8', errors='replace') as f:
+                    documents.append(f.read())
+        return documents
+
+    for name in glob.glob(os.path.join(ROOT, '**', '*.md'), recursive=True):
+        with open(name, encoding='utf-8') as f:
+            documents.append(f.read())
+    for dist in metadata.distributions():
+        description = dist.metadata.get_payload() or dist.metadata.get('Description') or ''
+        if description.count('\n#') >= 3:
+            documents.append(description)
+    return documents
+
+
+def bench(fn, documents, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for document in documents:
+            fn(document)
+    return (time.perf_counter() - start) / (repeat * len(documents))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', nargs='*')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    documents = load_corpus(args.corpus)
+    if not documents:
+        sys.exit('README가 없습니다.')
+    total_kb = sum(len(document) for document in documents) / 1024
+    largest = max(documents, key=len)
+
+    legacy = bench(legacy_extract, documents, args.repeat)
+    indexed = bench(indexed_extract, documents, args.repeat)
+    legacy_large = bench(legacy_extract, [largest], args.repeat)
+    indexed_large = bench(indexed_extract, [largest], args.repeat)
+
+    print(f"README {len(documents)}개, 평균 {total_kb / len(documents):.1f}KB, 최대 {len(largest) / 1024:.1f}KB")
+    print(f"{'':<10}{'us/readme':>12}{'us/largest':>12}")
+    print(f"{'legacy':<10}{legacy * 1e6:>12.1f}{legacy_large * 1e6:>12.1f}")
+    print(f"{'indexed':<10}{indexed * 1e6:>12.1f}{indexed_large * 1e6:>12.1f}")
+    print(f"{'speedup':<10}{legacy / indexed:>11.1f}x{legacy_large / indexed_large:>11.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+직렬화 벤치마크
+
+POTLESS 시드(project_data/POTLESS/project.json)를 바탕으로 만든 프로젝트 문서 묶음을
+표준 json(indent=2, 기존 get_project_info 방식)과 serialization 백엔드별 compact/indent 출력으로
+인코딩/디코딩해 초당 문서 수와 출력 크기를 비교합니다.
+Project 레코드는 Pydantic 모델의 .dict() + json.dumps 방식(기존)과 비교합니다.
+
+    python benchmarks/bench_serialization.py --projects 200 --repeat 5
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pydantic import BaseModel
+
+import serialization
+from project_portfolio_server import Project, ProjectMember
+
+SEED_PATH = os.path.join(os.path.dirname(__file__), '..', 'project_data', 'POTLESS', 'project.json')
+
+
+def build_corpus(count: int) -> list:
+    """시드를 조금씩 바꾼 프로젝트 문서 count개 (이름, 목록 길이, 중첩 섹션이 제각각)"""
+    with open(SEED_PATH, encoding='utf-8') as f:
+        seed = json.load(f)
+    corpus = []
+    for i in range(count):
+        document = copy.deepcopy(seed)
+        basic = document['projectInfo']['basicInfo']
+        basic['projectName'] = f"{basic['projectName']}-{i}"
+        basic['mainObjectives'] = basic['mainObjectives'] * (1 + i % 3)
+        tech = document['projectInfo']['technicalInfo']
+        tech['otherTools'] = tech['otherTools'] + [f"tool-{j}" for j in range(i % 5)]
+        github = document['projectInfo'].setdefault('githubInfo', {})
+        github['repositoryUrl'] = f"https://github.com/octo/potless-{i}"
+        corpus.append(document)
+    return corpus
+
+
+class LegacyMember(BaseModel):
+    name: str
+    role: str
+    contributions: List[str]
+
+
+class LegacyProject(BaseModel):
+    title: str
+    description: str
+    start_date: datetime
+    end_date: datetime
+    tech_stack: List[str]
+    members: List[LegacyMember]
+    github_url: Optional[str] = None
+    deployment_url: Optional[str] = None
+    key_features: List[str]
+    challenges: List[str]
+    solutions: List[str]
+
+    def dict(self, *args, **kwargs):
+        d = super().model_dump(*args, **kwargs)
+        d['start_date'] = d['start_date'].isoformat()
+        d['end_date'] = d['end_date'].isoformat()
+        return d
+
+
+def performance_highlights(document: dict) -> List[str]:
+    """portfolioGoals가 없는 시드는 성능 개선 항목 설명을 주요 기능으로 씀"""
+    items = document.get('performance', {}).get('async_processing', {}).values()
+    return [item.get('description', '') for item in items]
+
+
+def project_fields(document: dict, i: int) -> dict:
+    info = document['projectInfo']
+    start = datetime(2024, 4, 8) + timedelta(days=i)
+    return {
+        'title': info['basicInfo']['projectName'],
+        'description': '\n'.join(info['basicInfo']['mainObjectives']),
+        'start_date': start,
+        'end_date': start + timedelta(days=42),
+        'tech_stack': [name for names in info['technicalInfo'].values() for name in names],
+        'members': [{'name': f"member-{j}", 'role': 'developer', 'contributions': ['기능 구현', '코드 리뷰']}
+                    for j in range(6)],
+        'github_url': info['githubInfo']['repositoryUrl'],
+        'key_features': info.get('portfolioGoals', {}).get('keyHighlights', performance_highlights(document)),
+        'challenges': info['architectureInfo']['painPoints'],
+        'solutions': info['architectureInfo']['desiredImprovements'],
+    }
+
+
+def rate(count: int, repeat: int, fn) -> float:
+    """repeat번 중 가장 빠른 회차의 초당 처리 수"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def bench_documents(corpus: list, repeat: int) -> list:
+    stored = [json.dumps(document, ensure_ascii=False) for document in corpus]
+    rows = [(
+        'json indent=2 (기존)',
+        rate(len(corpus), repeat, lambda: [json.dumps(d, indent=2, ensure_ascii=False) for d in corpus]),
+        rate(len(corpus), repeat, lambda: [json.loads(text) for text in stored]),
+        sum(len(json.dumps(d, indent=2, ensure_ascii=False).encode()) for d in corpus),
+    )]
+    for name in serialization.available_backends():
+        codec = serialization.get_codec(name)
+        for indent in (False, True):
+            rows.append((
+                f"{name} {'indent' if indent else 'compact'}",
+                rate(len(corpus), repeat, lambda: [codec.dumps(d, indent) for d in corpus]),
+                rate(len(corpus), repeat, lambda: [codec.loads(text) for text in stored]),
+                sum(len(codec.dumps(d, indent).encode()) for d in corpus),
+            ))
+    return rows
+
+
+def bench_records(corpus: list, repeat: int) -> list:
+    fields = [project_fields(document, i) for i, document in enumerate(corpus)]
+    legacy = [LegacyProject(**item) for item in fields]
+    records = [Project(**{**item, 'members': [ProjectMember(**m) for m in item['members']]}) for item in fields]
+    rows = [(
+        'pydantic .dict() (기존)',
+        rate(len(legacy), repeat, lambda: [json.dumps(p.dict(), indent=2, ensure_ascii=False) for p in legacy]),
+        rate(len(legacy), repeat, lambda: [LegacyProject(**json.loads(p.model_dump_json())) for p in legacy]),
+    )]
+    for name in serialization.available_backends():
+        codec = serialization.get_codec(name)
+        encoded = [codec.dumps(record) for record in records]
+        assert Project.from_dict(codec.loads(encoded[0])) == records[0]
+        rows.append((
+            f"Record {name}",
+            rate(len(records), repeat, lambda: [codec.dumps(record) for record in records]),
+            rate(len(records), repeat, lambda: [Project.from_dict(codec.loads(text)) for text in encoded]),
+        ))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.projects)
+    print(f"문서 {len(corpus)}개, 백엔드: {', '.join(serialization.available_backends())}\n")
+
+    rows = bench_documents(corpus, args.repeat)
+    baseline = rows[0]
+    print(f"{'':<24}{'encode/s':>12}{'decode/s':>12}{'KB':>10}{'encode':>10}")
+    for name, encode, decode, size in rows:
+        print(f"{name:<24}{encode:>12.0f}{decode:>12.0f}{size / 1024:>10.0f}{encode / baseline[1]:>9.1f}x")
+
+    print()
+    rows = bench_records(corpus, args.repeat)
+    baseline = rows[0]
+    print(f"{'':<24}{'encode/s':>12}{'decode/s':>12}{'encode':>10}{'decode':>10}")
+    for name, encode, decode in rows:
+        print(f"{name:<24}{encode:>12.0f}{decode:>12.0f}{encode / baseline[1]:>9.1f}x{decode / baseline[2]:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
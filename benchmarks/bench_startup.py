@@ -0,0 +1,94 @@
+"""
+서버 시작 시간 벤치마크
+
+새 인터프리터에서 `python -X importtime -c "import project_portfolio_server"`를 여러 번
+실행해 서버 모듈의 누적 import 시간(중앙값)과 가장 오래 걸린 모듈을 보여줍니다.
+
+중앙값이 예산(--budget-ms)을 넘거나, 시작 시 불러오지 않아야 하는 모듈(LAZY_MODULES)이
+로드되면 종료 코드 1로 끝나므로 회귀 검사로 사용할 수 있습니다.
+
+    python benchmarks/bench_startup.py --runs 7 --budget-ms 1200
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+MODULE = 'project_portfolio_server'
+# 도구를 처음 호출할 때까지 불러오지 않아야 하는 모듈
+LAZY_MODULES = ('github', 'fastapi', 'jinja2', 'yaml', 'markdown', 'requests',
+                'github_async', 'github_cache', 'rendering')
+DEFAULT_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', '1200'))
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+# lazy_import의 _LazyModule은 sys.modules에 있어도 아직 로드되지 않은 것이므로 클래스로 구분
+# (로드되면 일반 ModuleType으로 바뀜)
+_CHECK_LOADED = (
+    "import sys, types, {module}; "
+    "print(','.join(m for m in {lazy!r} if type(sys.modules.get(m)) is types.ModuleType))"
+)
+
+
+def run_importtime(python: str) -> list:
+    """(self_us, cumulative_us, depth, module) 목록"""
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {MODULE}'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            rows.append((int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2, match.group(4)))
+    return rows
+
+
+def loaded_lazy_modules(python: str) -> list:
+    result = subprocess.run(
+        [python, '-c', _CHECK_LOADED.format(module=MODULE, lazy=LAZY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--python', default=sys.executable)
+    args = parser.parse_args()
+
+    # 첫 실행은 .pyc 생성이 포함되므로 버림
+    run_importtime(args.python)
+    totals = []
+    last = []
+    for _ in range(args.runs):
+        last = run_importtime(args.python)
+        totals.append(next(cumulative for _, cumulative, _, name in last if name == MODULE) / 1000)
+    median = statistics.median(totals)
+
+    print(f"{MODULE} import: 중앙값 {median:.1f}ms (최소 {min(totals):.1f}ms, 최대 {max(totals):.1f}ms, {args.runs}회)")
+    print(f"\n최상위 의존성별 누적 시간 (상위 {args.top}개, 마지막 실행)")
+    top_level = sorted((row for row in last if row[2] == 1), key=lambda row: -row[1])
+    for _, cumulative, _, name in top_level[:args.top]:
+        print(f"  {cumulative / 1000:>8.1f}ms  {name}")
+
+    failures = []
+    if median > args.budget_ms:
+        failures.append(f"시작 시간 {median:.1f}ms가 예산 {args.budget_ms:.0f}ms를 넘었습니다.")
+    loaded = loaded_lazy_modules(args.python)
+    if loaded:
+        failures.append(f"시작 시 불러오면 안 되는 모듈이 로드되었습니다: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"\nFAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"\nOK: 예산 {args.budget_ms:.0f}ms 이내")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+저장소 계층 벤치마크
+
+connect-per-call 방식(기존)과 커넥션 풀 방식의 초당 호출 수를 비교합니다.
+
+    python benchmarks/bench_storage.py --calls 5000
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from storage import ConnectionPool
+
+SELECT_SQL = 'SELECT project_data FROM projects WHERE id = ?'
+INSERT_SQL = 'INSERT INTO projects (project_data) VALUES (?)'
+
+
+def setup(path: str, rows: int):
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE projects (id INTEGER PRIMARY KEY AUTOINCREMENT, project_data TEXT)')
+    with open(os.path.join(os.path.dirname(__file__), '..', 'project_info_template.json'), encoding='utf-8') as f:
+        payload = json.dumps(json.load(f))
+    conn.executemany(INSERT_SQL, [(payload,) for _ in range(rows)])
+    conn.commit()
+    conn.close()
+    return payload
+
+
+def bench_connect_per_call(path: str, calls: int, rows: int, payload: str) -> dict:
+    start = time.perf_counter()
+    for i in range(calls):
+        conn = sqlite3.connect(path)
+        conn.execute(SELECT_SQL, (i % rows + 1,)).fetchone()
+        conn.close()
+    reads = calls / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(calls // 10):
+        conn = sqlite3.connect(path)
+        conn.execute(INSERT_SQL, (payload,))
+        conn.commit()
+        conn.close()
+    writes = (calls // 10) / (time.perf_counter() - start)
+    return {'reads_per_sec': reads, 'writes_per_sec': writes}
+
+
+def bench_pool(path: str, calls: int, rows: int, payload: str) -> dict:
+    pool = ConnectionPool(path)
+    start = time.perf_counter()
+    for i in range(calls):
+        pool.fetchone(SELECT_SQL, (i % rows + 1,))
+    reads = calls / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(calls // 10):
+        pool.execute(INSERT_SQL, (payload,))
+    writes = (calls // 10) / (time.perf_counter() - start)
+    pool.close_all()
+    return {'reads_per_sec': reads, 'writes_per_sec': writes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=5000)
+    parser.add_argument('--rows', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before_path = os.path.join(tmp, 'before.db')
+        after_path = os.path.join(tmp, 'after.db')
+        payload = setup(before_path, args.rows)
+        setup(after_path, args.rows)
+
+        before = bench_connect_per_call(before_path, args.calls, args.rows, payload)
+        after = bench_pool(after_path, args.calls, args.rows, payload)
+
+    print(f"{'':<20}{'reads/s':>12}{'writes/s':>12}")
+    print(f"{'connect-per-call':<20}{before['reads_per_sec']:>12.0f}{before['writes_per_sec']:>12.0f}")
+    print(f"{'pooled':<20}{after['reads_per_sec']:>12.0f}{after['writes_per_sec']:>12.0f}")
+    print(f"{'speedup':<20}{after['reads_per_sec'] / before['reads_per_sec']:>11.1f}x"
+          f"{after['writes_per_sec'] / before['writes_per_sec']:>11.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,438 @@
+"""
+로컬 가짜 GitHub REST 서버
+
+네트워크나 토큰 없이 GitHub 연동 코드를 실행하기 위한 테스트/벤치마크용 서버입니다.
+응답 지연, 페이지네이션, ETag(304), 토큰(Authorization 헤더)별 rate limit 응답을 설정할 수 있습니다.
+
+    python benchmarks/fake_github.py --port 8765 --latency 0.05
+    GITHUB_API_URL=http://127.0.0.1:8765 python project_portfolio_server.py
+
+코드에서 사용할 때:
+
+    with FakeGitHub(latency=0.05) as fake:
+        fake.add_repo('octo/potless', readme='# POTLESS', languages={'Dart': 100})
+        client = AsyncGitHubClient(base_url=fake.url)
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+SEED_README = os.path.join(os.path.dirname(__file__), '..', 'project_data', 'POTLESS', 'portfolio.md')
+SAMPLE_PUBSPEC = '''name: potless
+dependencies:
+  flutter:
+    sdk: flutter
+  firebase_core: ^2.24.0
+  tflite_flutter: ^0.10.4
+dev_dependencies:
+  flutter_test:
+    sdk: flutter
+'''
+SAMPLE_REQUIREMENTS = '''fastapi==0.110.0
+uvicorn[standard]>=0.29
+ultralytics
+boto3  # S3 업로드
+'''
+
+
+class FakeRepo:
+    """가짜 저장소 데이터"""
+
+    def __init__(self, full_name: str, readme: Optional[str] = None, languages: Optional[Dict[str, int]] = None,
+                 branches: Optional[List[str]] = None, commits: int = 10, issues: Optional[List[dict]] = None,
+                 description: str = '', files: Optional[Dict[str, str]] = None,
+                 authors: Optional[Dict[str, int]] = None, stats_pending: int = 0):
+        self.full_name = full_name
+        self.name = full_name.split('/')[1]
+        self.readme = readme
+        self.languages = languages or {}
+        self.branches = branches or ['main']
+        self.commits = commits
+        self.issues = issues or []
+        self.description = description
+        # 저장소 트리의 파일 {경로: 내용} (git/trees, git/blobs 응답에 사용)
+        self.files = files or {}
+        # 작성자별 커밋 수 (stats API 응답에 사용). 주어지지 않으면 한 사람이 모든 커밋을 작성
+        self.authors = authors or {'octocat': commits}
+        # 통계 계산 중(202)으로 응답할 남은 횟수 (엔드포인트별)
+        self.stats_pending = Counter({'contributors': stats_pending, 'commit_activity': stats_pending})
+
+    def weeks(self, count: int = 52) -> List[int]:
+        """최근 count주의 주 시작 시각 (유닉스 시각)"""
+        start = 1_700_000_000 - 1_700_000_000 % (7 * 86400)
+        return [start + i * 7 * 86400 for i in range(count)]
+
+    def head_sha(self) -> str:
+        """기본 브랜치 HEAD 커밋 SHA (파일이나 커밋 수가 바뀌면 달라짐)"""
+        state = json.dumps([self.commits, self.readme, sorted(self.files.items())])
+        return hashlib.sha1(state.encode('utf-8')).hexdigest()
+
+    def blobs(self) -> Dict[str, str]:
+        """{blob SHA: 내용}"""
+        return {_blob_sha(text): text for text in self.files.values()}
+
+
+def _blob_sha(text: str) -> str:
+    data = text.encode('utf-8')
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+class FakeGitHub:
+    """스레드에서 동작하는 가짜 GitHub 서버"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 rate_limit: int = 5000, secondary_limit_every: int = 0, per_page_max: int = 100,
+                 rate_limit_window: float = 3600):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        # Authorization 헤더(토큰)별 남은 요청 수. 인증 없는 요청은 ''
+        self.quotas: Dict[str, int] = {}
+        # 이 시간(초)이 지나면 모든 토큰의 할당량이 리셋됨
+        self.rate_limit_window = rate_limit_window
+        self.reset_at = time.time() + rate_limit_window
+        # N번째 요청마다 2차 rate limit(403 + Retry-After) 응답. 0이면 사용 안 함
+        self.secondary_limit_every = secondary_limit_every
+        self.per_page_max = per_page_max
+        self.repos: Dict[str, FakeRepo] = {}
+        self.requests = Counter()
+        self.requests_by_token = Counter()
+        # 응답 상태 코드별 수 (rate limit 응답 확인용)
+        self.statuses = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def remaining(self) -> int:
+        """인증 없는 요청의 남은 요청 수"""
+        return self.remaining_for('')
+
+    @remaining.setter
+    def remaining(self, value: int):
+        self.quotas[''] = value
+
+    def remaining_for(self, authorization: str) -> int:
+        return self.quotas.get(authorization, self.rate_limit)
+
+    def _consume(self, authorization: str) -> Optional[int]:
+        """요청 하나를 할당량에서 빼고 남은 수를 반환합니다. 소진되었으면 None. _lock 안에서 호출합니다."""
+        if time.time() >= self.reset_at:
+            self.quotas.clear()
+            self.reset_at = time.time() + self.rate_limit_window
+        remaining = self.remaining_for(authorization)
+        if remaining <= 0:
+            return None
+        self.quotas[authorization] = remaining - 1
+        return remaining - 1
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_repo(self, full_name: str, **kwargs) -> FakeRepo:
+        repo = FakeRepo(full_name, **kwargs)
+        self.repos[full_name] = repo
+        return repo
+
+    def add_sample_repo(self, full_name: str = 'octo/potless', issues: int = 30) -> FakeRepo:
+        """POTLESS 포트폴리오 문서를 README로 쓰는 예시 저장소를 추가합니다."""
+        with open(SEED_README, encoding='utf-8') as f:
+            readme = f.read()
+        return self.add_repo(
+            full_name,
+            readme=readme,
+            description='AI 기반 포트홀 자동 탐지 시스템',
+            languages={'Dart': 120000, 'Python': 80000, 'Kotlin': 3000, 'Swift': 1000},
+            branches=['main', 'develop', 'feature/detect', 'feature/upload'],
+            commits=512,
+            authors={'alice': 300, 'bob': 150, 'carol': 62},
+            files={
+                'README.md': readme,
+                'app/pubspec.yaml': SAMPLE_PUBSPEC,
+                'server/requirements.txt': SAMPLE_REQUIREMENTS,
+                'server/main.py': 'from fastapi import FastAPI\n',
+            },
+            issues=[
+                {
+                    'number': i + 1,
+                    'title': f"기능 {i}: 탐지 개선" if i % 2 else f"문제 {i}: 업로드 실패",
+                    'body': f"이슈 본문 {i}",
+                    'state': 'closed' if i % 3 else 'open',
+                    'labels': [{'name': 'feature' if i % 2 else 'bug'}],
+                    'updated_at': f"2024-05-{(i % 28) + 1:02d}T00:00:00Z",
+                }
+                for i in range(issues)
+            ],
+        )
+
+    def start(self) -> 'FakeGitHub':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'FakeGitHub':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # 라우팅
+
+    def route(self, path: str, query: Dict[str, List[str]], accept: str = '', authorization: str = ''):
+        """(상태 코드, 본문, 추가 헤더)를 반환합니다. 문자열 본문은 그대로 보냅니다."""
+        if path == '/rate_limit':
+            core = {'limit': self.rate_limit, 'remaining': self.remaining_for(authorization),
+                    'reset': int(self.reset_at)}
+            return 200, {'resources': {'core': core}, 'rate': core}, {}
+        if path == '/user':
+            return 200, {'login': 'fake-user', 'id': 1}, {}
+
+        match = re.match(r'^/(orgs|users)/([^/]+)/repos$', path)
+        if match:
+            owner = match.group(2)
+            items = [self._repo_json(repo) for name, repo in self.repos.items() if name.split('/')[0] == owner]
+            if not items:
+                return 404, {'message': 'Not Found'}, {}
+            return self._paginate(path, query, items)
+
+        match = re.match(r'^/repos/([^/]+/[^/]+)(/.*)?$', path)
+        if not match or match.group(1) not in self.repos:
+            return 404, {'message': 'Not Found'}, {}
+        repo = self.repos[match.group(1)]
+        sub = match.group(2) or ''
+
+        if sub == '':
+            return 200, self._repo_json(repo), {}
+        if sub == '/readme':
+            if repo.readme is None:
+                return 404, {'message': 'Not Found'}, {}
+            content = base64.b64encode(repo.readme.encode('utf-8')).decode()
+            return 200, {
+                'type': 'file', 'encoding': 'base64', 'name': 'README.md', 'path': 'README.md',
+                'sha': hashlib.sha1(repo.readme.encode('utf-8')).hexdigest(),
+                'size': len(repo.readme), 'content': content,
+                'url': f"{self.url}/repos/{repo.full_name}/contents/README.md",
+            }, {}
+        if sub == '/languages':
+            return 200, repo.languages, {}
+        if sub == '/branches':
+            items = [{'name': name, 'commit': {'sha': hashlib.sha1(name.encode()).hexdigest()}}
+                     for name in repo.branches]
+            return self._paginate(path, query, items)
+        if sub == '/commits':
+            items = [{'sha': hashlib.sha1(str(i).encode()).hexdigest()} for i in range(repo.commits)]
+            return self._paginate(path, query, items)
+        match = re.match(r'^/commits/([^/]+)$', sub)
+        if match:
+            if not repo.commits:
+                return 409, {'message': 'Git Repository is empty.'}, {}
+            sha = repo.head_sha()
+            if match.group(1) not in ('HEAD', repo.branches[0], sha):
+                return 422, {'message': f"No commit found for SHA: {match.group(1)}"}, {}
+            if accept == 'application/vnd.github.sha':
+                return 200, sha, {}
+            return 200, {'sha': sha, 'commit': {'message': 'head'}}, {}
+        if re.match(r'^/git/trees/[^/]+$', sub):
+            if not repo.files:
+                return 409, {'message': 'Git Repository is empty.'}, {}
+            tree = [
+                {'path': name, 'mode': '100644', 'type': 'blob', 'sha': _blob_sha(text), 'size': len(text)}
+                for name, text in repo.files.items()
+            ]
+            return 200, {'sha': hashlib.sha1(repo.full_name.encode()).hexdigest(), 'tree': tree,
+                         'truncated': False}, {}
+        match = re.match(r'^/git/blobs/([0-9a-f]{40})$', sub)
+        if match:
+            text = repo.blobs().get(match.group(1))
+            if text is None:
+                return 404, {'message': 'Not Found'}, {}
+            return 200, {'sha': match.group(1), 'encoding': 'base64', 'size': len(text),
+                         'content': base64.b64encode(text.encode('utf-8')).decode()}, {}
+        match = re.match(r'^/stats/(contributors|commit_activity)$', sub)
+        if match:
+            kind = match.group(1)
+            if repo.stats_pending[kind] > 0:
+                repo.stats_pending[kind] -= 1
+                return 202, {}, {}
+            weeks = repo.weeks()
+            if kind == 'contributors':
+                return 200, [
+                    {
+                        'author': {'login': login},
+                        'total': commits,
+                        'weeks': [{'w': w, 'a': commits // 52 * 10 + (i < commits % 52) * 10,
+                                   'd': commits // 52 * 3, 'c': commits // 52 + (i < commits % 52)}
+                                  for i, w in enumerate(weeks)],
+                    }
+                    for login, commits in repo.authors.items()
+                ], {}
+            totals = [sum(commits // 52 + (i < commits % 52) for commits in repo.authors.values())
+                      for i in range(len(weeks))]
+            return 200, [{'week': w, 'total': total, 'days': [total, 0, 0, 0, 0, 0, 0]}
+                         for w, total in zip(weeks, totals)], {}
+        if sub == '/issues':
+            state = query.get('state', ['open'])[0]
+            since = query.get('since', [''])[0]
+            labels = set(filter(None, query.get('labels', [''])[0].split(',')))
+            items = [
+                dict(issue, url=f"{self.url}/repos/{repo.full_name}/issues/{issue['number']}")
+                for issue in repo.issues
+                if (state == 'all' or issue.get('state', 'open') == state)
+                and (not since or issue.get('updated_at', '') >= since)
+                and labels <= {label['name'] for label in issue.get('labels', [])}
+            ]
+            if query.get('sort', ['created'])[0] == 'updated':
+                items.sort(key=lambda issue: issue.get('updated_at', ''),
+                           reverse=query.get('direction', ['desc'])[0] == 'desc')
+            return self._paginate(path, query, items)
+        return 404, {'message': 'Not Found'}, {}
+
+    def _repo_json(self, repo: FakeRepo) -> dict:
+        return {
+            'id': abs(hash(repo.full_name)) % 10 ** 8,
+            'name': repo.name,
+            'full_name': repo.full_name,
+            'description': repo.description,
+            'default_branch': repo.branches[0],
+            'url': f"{self.url}/repos/{repo.full_name}",
+            'html_url': f"https://github.com/{repo.full_name}",
+            'owner': {'login': repo.full_name.split('/')[0]},
+        }
+
+    def _paginate(self, path: str, query: Dict[str, List[str]], items: List[Any]):
+        per_page = min(int(query.get('per_page', ['30'])[0]), self.per_page_max)
+        page = int(query.get('page', ['1'])[0])
+        last = max(1, (len(items) + per_page - 1) // per_page)
+        start = (page - 1) * per_page
+        headers = {}
+        links = []
+        base = {k: v[0] for k, v in query.items() if k != 'page'}
+        qs = '&'.join(f"{k}={v}" for k, v in base.items())
+        if page < last:
+            links.append(f'<{self.url}{path}?{qs}&page={page + 1}>; rel="next"')
+            links.append(f'<{self.url}{path}?{qs}&page={last}>; rel="last"')
+        if links:
+            headers['Link'] = ', '.join(links)
+        return 200, items[start:start + per_page], headers
+
+    # ------------------------------------------------------------------
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: Any, headers: Dict[str, str]):
+                if status == 304:
+                    payload = b''
+                elif isinstance(body, str):
+                    payload = body.encode('utf-8')
+                else:
+                    payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                with fake._lock:
+                    fake.statuses[status] += 1
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain; charset=utf-8' if isinstance(body, str)
+                                 else 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                # GitHub App 설치 토큰 발급 (JWT는 검증하지 않음)
+                match = re.match(r'^/app/installations/(\d+)/access_tokens$', urlsplit(self.path).path)
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                if not match or not self.headers.get('Authorization', '').startswith('Bearer '):
+                    self._send(401 if match else 404, {'message': 'Not Found' if not match else 'Bad credentials'}, {})
+                    return
+                with fake._lock:
+                    fake.requests[self.path] += 1
+                    token = f"ghs_fake{match.group(1)}_{fake.requests[self.path]}"
+                expires = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() + 3600))
+                self._send(201, {'token': token, 'expires_at': expires, 'permissions': {}}, {})
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                path = parts.path
+                authorization = self.headers.get('Authorization', '')
+                with fake._lock:
+                    fake.requests[path] += 1
+                    fake.requests_by_token[authorization] += 1
+                    total = sum(fake.requests.values())
+                    remaining = fake._consume(authorization)
+                    reset = int(fake.reset_at)
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                limit_headers = {
+                    'X-RateLimit-Limit': str(fake.rate_limit),
+                    'X-RateLimit-Remaining': str(remaining or 0),
+                    'X-RateLimit-Reset': str(reset),
+                    'X-RateLimit-Resource': 'core',
+                }
+                if fake.secondary_limit_every and total % fake.secondary_limit_every == 0:
+                    self._send(403, {'message': 'You have exceeded a secondary rate limit.'},
+                               {'Retry-After': '1', **limit_headers})
+                    return
+                if remaining is None:
+                    self._send(403, {'message': 'API rate limit exceeded'}, limit_headers)
+                    return
+
+                status, body, headers = fake.route(path, parse_qs(parts.query), self.headers.get('Accept', ''),
+                                                   authorization)
+                if status == 200:
+                    etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+                    headers['ETag'] = etag
+                    if self.headers.get('If-None-Match') == etag:
+                        # 304는 rate limit에 포함되지 않음
+                        with fake._lock:
+                            fake.quotas[authorization] = min(fake.rate_limit,
+                                                             fake.remaining_for(authorization) + 1)
+                        status = 304
+                self._send(status, body, {**limit_headers, **headers})
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 가짜 GitHub REST 서버')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='요청당 지연(초)')
+    parser.add_argument('--rate-limit', type=int, default=5000)
+    parser.add_argument('--secondary-limit-every', type=int, default=0)
+    args = parser.parse_args()
+
+    fake = FakeGitHub(port=args.port, latency=args.latency, rate_limit=args.rate_limit,
+                      secondary_limit_every=args.secondary_limit_every)
+    fake.add_sample_repo()
+    print(f"가짜 GitHub 서버 실행 중: {fake.url} (저장소: {', '.join(fake.repos)})")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+기여 통계
+
+GitHub 통계 API(/stats/contributors, /stats/commit_activity)의 응답을
+포트폴리오에 쓰는 형태로 요약합니다. 커밋 목록을 페이지 단위로 훑지 않고
+요청 두 번으로 작성자별 커밋 수와 추가/삭제 줄 수를 얻습니다.
+
+통계는 GitHub가 백그라운드에서 계산하므로 처음 요청하면 202를 받을 수 있습니다.
+AsyncGitHubClient.get_statistics()가 백오프하며 다시 요청하고, 계산된 응답은
+github_cache에 저장소별로 캐시됩니다.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# 202(계산 중) 응답을 다시 요청하기까지의 대기 시간과 전체 대기 한도(초)
+POLL_BASE = 1.0
+POLL_MAX = 8.0
+POLL_BUDGET = 20.0
+# contributionStats 문자열에 이름을 적는 상위 기여자 수
+SUMMARY_TOP = 3
+
+
+def _week(timestamp: Optional[int]) -> Optional[str]:
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).date().isoformat()
+
+
+def summarize(contributors: Optional[List[dict]], activity: Optional[List[dict]]) -> Dict[str, Any]:
+    """통계 API 응답을 요약합니다.
+
+    contributors는 /stats/contributors 응답(작성자별 주간 a/d/c),
+    activity는 /stats/commit_activity 응답(최근 52주 주간 커밋 수)입니다.
+    """
+    authors = []
+    for contributor in contributors or []:
+        weeks = contributor.get('weeks') or []
+        active = [week['w'] for week in weeks if week.get('c')]
+        author = contributor.get('author') or {}
+        authors.append({
+            'login': author.get('login') or 'unknown',
+            'commits': contributor.get('total', 0),
+            'additions': sum(week.get('a', 0) for week in weeks),
+            'deletions': sum(week.get('d', 0) for week in weeks),
+            'firstWeek': _week(min(active)) if active else None,
+            'lastWeek': _week(max(active)) if active else None,
+        })
+    authors.sort(key=lambda author: (-author['commits'], author['login']))
+
+    weekly = [week.get('total', 0) for week in activity or []]
+    busiest = max(activity or [], key=lambda week: week.get('total', 0), default=None)
+    return {
+        'totalCommits': sum(author['commits'] for author in authors),
+        'contributors': authors,
+        'lastYearCommits': sum(weekly),
+        'activeWeeks': sum(1 for total in weekly if total),
+        'busiestWeek': _week(busiest['week']) if busiest and busiest.get('total') else None,
+    }
+
+
+def from_commit_count(commit_count: int) -> Dict[str, Any]:
+    """통계를 아직 계산 중일 때 쓰는 요약 (작성자별 정보 없음)"""
+    return {
+        'totalCommits': commit_count,
+        'contributors': [],
+        'lastYearCommits': None,
+        'activeWeeks': None,
+        'busiestWeek': None,
+        'pending': True,
+    }
+
+
+def format_summary(stats: Dict[str, Any]) -> str:
+    """githubInfo.contributionStats에 넣는 한 줄 요약"""
+    text = f"Total commits: {stats['totalCommits']}"
+    authors = stats.get('contributors') or []
+    if authors:
+        top = ', '.join(
+            f"{author['login']} {author['commits']} (+{author['additions']}/-{author['deletions']})"
+            for author in authors[:SUMMARY_TOP]
+        )
+        text += f", contributors: {len(authors)} ({top})"
+    if stats.get('lastYearCommits') is not None:
+        text += f", last 52 weeks: {stats['lastYearCommits']} commits in {stats['activeWeeks']} weeks"
+    return text
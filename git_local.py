@@ -0,0 +1,464 @@
+"""
+로컬 git 저장소 분석 백엔드 (오프라인)
+
+GitHub REST API 대신 로컬 클론이나 bare 미러의 git 객체 저장소에서 README, 매니페스트,
+언어별 크기, 브랜치, 커밋 수와 작성자별 통계를 읽습니다. AsyncGitHubClient와 같은 메서드를
+제공하므로 스냅샷 수집, 이슈 스캔, 변경 감지 코드를 그대로 사용할 수 있습니다.
+
+저장소 선택
+
+- `file:///path/to/repo` URL이나 로컬 경로: 해당 클론 또는 bare 저장소. LOCAL_REPO_ROOTS(os.pathsep으로 구분)나
+  GIT_MIRROR_DIR 아래의 경로만 허용합니다. HTTP로 서빙하면 원격 클라이언트가 경로를 넘기므로, 설정하지 않으면
+  로컬 경로 분석은 꺼져 있습니다.
+- GIT_MIRROR_DIR을 설정하면 `https://github.com/owner/repo`는 `<GIT_MIRROR_DIR>/owner/repo.git`
+  (또는 `owner/repo`)에 미러가 있을 때 미러에서 읽습니다 (`git clone --mirror`로 만든 디렉터리)
+- GITHUB_BACKEND: auto(기본, 미러가 있으면 미러), api(항상 GitHub API), local(GitHub API를 쓰지 않음)
+
+git 명령(cat-file, ls-tree, log)만 사용하므로 얕은(shallow) 클론은 있는 커밋까지만, 부분(partial)
+클론은 로컬에 있는 blob만 읽습니다. 로컬 저장소에는 이슈가 없으므로 이슈 목록은 항상 비어 있습니다.
+"""
+import asyncio
+import functools
+import os
+import posixpath
+import re
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import contribution_stats
+import tech_classifier
+from repo_snapshot import RepoSnapshot, parse_github_url
+from repo_sync import select_readme
+
+GITHUB_BACKEND = os.getenv('GITHUB_BACKEND', 'auto')
+GIT_MIRROR_DIR = os.getenv('GIT_MIRROR_DIR')
+# 로컬 경로/file:// URL로 분석할 수 있는 디렉터리 (GIT_MIRROR_DIR은 항상 포함)
+LOCAL_REPO_ROOTS = [path for path in os.getenv('LOCAL_REPO_ROOTS', '').split(os.pathsep) if path]
+GIT_BINARY = os.getenv('GIT_BINARY', 'git')
+# 동시에 실행할 git 프로세스 수
+MAX_PROCESSES = int(os.getenv('GIT_MAX_PROCESSES', '4'))
+GIT_TIMEOUT = 60.0
+
+# 부분 클론에서 없는 객체를 원격에서 가져오지 않음 (git 2.44+), 자격 증명을 묻지 않음
+GIT_ENV = {'GIT_NO_LAZY_FETCH': '1', 'GIT_TERMINAL_PROMPT': '0', 'LC_ALL': 'C'}
+
+# 확장자별 GitHub(linguist) 언어 이름. 언어 크기는 이 확장자의 파일만 합산합니다.
+EXTENSION_LANGUAGES = {
+    '.py': 'Python', '.pyx': 'Cython', '.ipynb': 'Jupyter Notebook',
+    '.js': 'JavaScript', '.mjs': 'JavaScript', '.cjs': 'JavaScript', '.jsx': 'JavaScript',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript',
+    '.html': 'HTML', '.htm': 'HTML', '.css': 'CSS', '.scss': 'SCSS', '.sass': 'Sass', '.less': 'Less',
+    '.vue': 'Vue', '.svelte': 'Svelte',
+    '.java': 'Java', '.kt': 'Kotlin', '.kts': 'Kotlin', '.scala': 'Scala', '.groovy': 'Groovy',
+    '.swift': 'Swift', '.m': 'Objective-C', '.mm': 'Objective-C++',
+    '.dart': 'Dart', '.go': 'Go', '.rs': 'Rust', '.rb': 'Ruby', '.php': 'PHP',
+    '.c': 'C', '.h': 'C', '.cc': 'C++', '.cpp': 'C++', '.cxx': 'C++', '.hpp': 'C++',
+    '.cs': 'C#', '.fs': 'F#', '.ex': 'Elixir', '.exs': 'Elixir', '.erl': 'Erlang',
+    '.lua': 'Lua', '.r': 'R', '.jl': 'Julia', '.pl': 'Perl', '.hs': 'Haskell', '.clj': 'Clojure',
+    '.sh': 'Shell', '.bash': 'Shell', '.zsh': 'Shell', '.ps1': 'PowerShell',
+    '.sql': 'SQL', '.cmake': 'CMake', '.tf': 'HCL',
+}
+FILENAME_LANGUAGES = {'Dockerfile': 'Dockerfile', 'Makefile': 'Makefile', 'CMakeLists.txt': 'CMake'}
+
+# 미러 디렉터리 안의 경로로 쓰는 GitHub owner/저장소 이름 ('..' 등으로 밖을 가리키지 않도록)
+GITHUB_NAME = re.compile(r'[A-Za-z0-9_.-]+')
+# 트리 하나로 읽는 스냅샷 리소스 (스냅샷마다 ls-tree는 한 번)
+TREE_RESOURCES = ('readme_text', 'languages', 'manifests')
+
+# GitHub 통계 API의 주 시작(일요일 00:00 UTC)에 맞추기 위한 값. 1970-01-04가 일요일
+_WEEK = 7 * 86400
+_FIRST_SUNDAY = 3 * 86400
+_ACTIVITY_WEEKS = 52
+# git log 출력에서 커밋 줄을 numstat 줄과 구분하는 표시 (인자에는 NUL을 넣을 수 없어 %x00으로 전달)
+_COMMIT_MARK = '\x00'
+_COMMIT_FORMAT = '%x00%at%x09%aN'
+
+
+class LocalGitError(Exception):
+    """로컬 저장소를 찾을 수 없거나 git 명령이 실패한 경우
+
+    status는 GitHubAPIError와 같은 의미로, 404(저장소 없음)는 작업 큐에서 재시도하지 않습니다.
+    """
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+def _is_git_dir(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, 'HEAD')) and os.path.isdir(os.path.join(path, 'objects'))
+
+
+def find_repository(path: str) -> Optional[str]:
+    """작업 트리가 있는 클론이나 bare 저장소의 절대 경로. git 저장소가 아니면 None"""
+    path = os.path.abspath(os.path.expanduser(path))
+    if _is_git_dir(path) or _is_git_dir(os.path.join(path, '.git')) or os.path.isfile(os.path.join(path, '.git')):
+        return path
+    return None
+
+
+def _safe_name(name: str) -> bool:
+    return GITHUB_NAME.fullmatch(name) is not None and name not in ('.', '..')
+
+
+def allowed_roots() -> List[str]:
+    """로컬 경로로 분석할 수 있는 디렉터리의 실제 경로 목록"""
+    roots = [*LOCAL_REPO_ROOTS, *([GIT_MIRROR_DIR] if GIT_MIRROR_DIR else [])]
+    return [os.path.realpath(os.path.expanduser(root)) for root in roots]
+
+
+def _local_path(path: str, url: str) -> str:
+    """클라이언트가 넘긴 로컬 경로를 확인합니다. 허용된 디렉터리 밖이면 LocalGitError(403)"""
+    roots = allowed_roots()
+    if not roots:
+        raise LocalGitError("로컬 저장소 분석이 꺼져 있습니다. LOCAL_REPO_ROOTS에 허용할 디렉터리를 설정하세요.", 403)
+    # 심볼릭 링크와 '..'을 풀어 실제 위치로 확인
+    real = os.path.realpath(os.path.expanduser(path))
+    if not any(os.path.commonpath([real, root]) == root for root in roots):
+        raise LocalGitError(f"허용된 디렉터리(LOCAL_REPO_ROOTS) 밖의 경로입니다: {url}", 403)
+    repository = find_repository(real)
+    if repository is None:
+        raise LocalGitError(f"git 저장소가 아닙니다: {url}", 404)
+    return repository
+
+
+def mirror_path(full_name: str, mirror_dir: Optional[str] = GIT_MIRROR_DIR) -> Optional[str]:
+    """'owner/repo'의 로컬 미러 경로. 미러가 없으면 None"""
+    if not mirror_dir or not all(_safe_name(name) for name in full_name.split('/')):
+        return None
+    for candidate in (f"{full_name}.git", full_name):
+        path = find_repository(os.path.join(mirror_dir, *candidate.split('/')))
+        if path:
+            return path
+    return None
+
+
+def resolve(url: str) -> Optional[str]:
+    """URL이 가리키는 로컬 저장소 경로. GitHub API로 분석해야 하는 URL이면 None
+
+    로컬 경로와 file:// URL은 허용된 디렉터리(allowed_roots()) 안의 저장소만 받으며, 밖이면 LocalGitError(403),
+    저장소가 아니면 LocalGitError(404)를 냅니다. GITHUB_BACKEND=local인데 GitHub URL의 미러가 없어도 404입니다.
+    """
+    if not url:
+        return None
+    if url.startswith('file://'):
+        return _local_path(unquote(urlsplit(url).path), url)
+    full_name = parse_github_url(url)
+    if full_name is None:
+        # 로컬 경로 (file:// 없이 절대 경로나 ~, .으로 시작하는 경로를 입력한 경우)
+        is_path = os.path.isabs(os.path.expanduser(url)) or url.startswith('.')
+        return _local_path(url, url) if is_path else None
+    if GITHUB_BACKEND == 'api':
+        return None
+    path = mirror_path(full_name, GIT_MIRROR_DIR)
+    if path is None and GITHUB_BACKEND == 'local':
+        raise LocalGitError(f"{full_name}의 로컬 미러가 없습니다. (GIT_MIRROR_DIR={GIT_MIRROR_DIR})", 404)
+    return path
+
+
+def mirror_owner_urls(owner: str, mirror_dir: Optional[str] = GIT_MIRROR_DIR) -> Optional[List[str]]:
+    """미러 디렉터리에 있는 owner의 저장소 URL 목록. owner 디렉터리가 없으면 None"""
+    if not mirror_dir or not _safe_name(owner) or not os.path.isdir(os.path.join(mirror_dir, owner)):
+        return None
+    names = sorted(name[:-4] if name.endswith('.git') else name
+                   for name in os.listdir(os.path.join(mirror_dir, owner))
+                   if find_repository(os.path.join(mirror_dir, owner, name)))
+    return [f"https://github.com/{owner}/{name}" for name in names]
+
+
+def _week_start(timestamp: int) -> int:
+    return timestamp - (timestamp - _FIRST_SUNDAY) % _WEEK
+
+
+def _language(path: str) -> Optional[str]:
+    name = posixpath.basename(path)
+    if name in FILENAME_LANGUAGES:
+        return FILENAME_LANGUAGES[name]
+    return EXTENSION_LANGUAGES.get(posixpath.splitext(name)[1].lower())
+
+
+class LocalGitClient:
+    """로컬 git 저장소를 AsyncGitHubClient와 같은 메서드로 읽는 클라이언트
+
+    메서드의 full_name 인자는 저장소 경로입니다 (resolve()의 반환값).
+    """
+
+    def __init__(self, git: str = GIT_BINARY, max_processes: int = MAX_PROCESSES, timeout: float = GIT_TIMEOUT):
+        self.git = git
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_processes)
+        self._env = {**os.environ, **GIT_ENV}
+        self.request_count = 0
+
+    async def aclose(self):
+        pass
+
+    async def __aenter__(self) -> 'LocalGitClient':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def _run(self, path: str, *args: str, stdin: Optional[bytes] = None, check: bool = True) -> bytes:
+        """git 명령을 실행하고 표준 출력을 반환합니다."""
+        async with self._semaphore:
+            self.request_count += 1
+            process = await asyncio.create_subprocess_exec(
+                self.git, '-C', path, *args,
+                stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, env=self._env,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(stdin), self.timeout)
+            except BaseException:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
+        if check and process.returncode != 0:
+            raise LocalGitError(f"git {args[0]} 실패 ({path}): {stderr.decode('utf-8', 'replace').strip()[:200]}")
+        return stdout
+
+    async def _head(self, path: str) -> Optional[str]:
+        """HEAD 커밋 SHA. 빈 저장소는 None"""
+        output = await self._run(path, 'rev-parse', '--verify', '--quiet', 'HEAD^{commit}', check=False)
+        return output.decode().strip() or None
+
+    async def _cat_file(self, path: str, mode: str, shas: List[str]) -> bytes:
+        """cat-file --batch/--batch-check 한 번으로 객체를 읽습니다.
+
+        부분 클론에서 로컬에 없는 객체를 만나면 git이 중단하므로, 그때는 로컬에 있는 객체만 골라 다시 읽습니다.
+        """
+        try:
+            return await self._run(path, 'cat-file', mode, stdin=''.join(f"{sha}\n" for sha in shas).encode())
+        except LocalGitError:
+            present = await self._run(path, 'cat-file', '--batch-check=%(objectname)', '--batch-all-objects')
+            local = set(present.decode().split())
+            shas = [sha for sha in shas if sha in local]
+            if not shas:
+                return b''
+            return await self._run(path, 'cat-file', mode, stdin=''.join(f"{sha}\n" for sha in shas).encode())
+
+    async def _read_blobs(self, path: str, shas: List[str]) -> Dict[str, bytes]:
+        """blob 내용. 로컬에 없는 blob(부분 클론)은 빠집니다."""
+        if not shas:
+            return {}
+        output = await self._cat_file(path, '--batch', shas)
+        blobs = {}
+        offset = 0
+        while offset < len(output):
+            end = output.index(b'\n', offset)
+            header = output[offset:end].decode().split()
+            offset = end + 1
+            if len(header) < 3 or header[1] != 'blob':
+                # "<sha> missing" 등
+                continue
+            size = int(header[2])
+            blobs[header[0]] = output[offset:offset + size]
+            offset += size + 1
+        return blobs
+
+    async def get_repo(self, full_name: str) -> Dict[str, Any]:
+        remote, branch, description = await asyncio.gather(
+            self._run(full_name, 'config', '--get', 'remote.origin.url', check=False),
+            self._run(full_name, 'symbolic-ref', '--quiet', '--short', 'HEAD', check=False),
+            self._description(full_name),
+        )
+        directory = os.path.basename(full_name.rstrip(os.sep))
+        name = directory[:-4] if directory.endswith('.git') else directory
+        github_name = parse_github_url(remote.decode().strip().removesuffix('.git'))
+        return {
+            'name': github_name.split('/')[1] if github_name else name,
+            'full_name': github_name or f"{os.path.basename(os.path.dirname(full_name))}/{name}",
+            'description': description,
+            'default_branch': branch.decode().strip() or None,
+        }
+
+    async def _description(self, path: str) -> Optional[str]:
+        """bare 저장소의 description 파일 (git 기본 문구는 제외)"""
+        git_dir = (await self._run(path, 'rev-parse', '--absolute-git-dir')).decode().strip()
+        try:
+            with open(os.path.join(git_dir, 'description'), encoding='utf-8') as f:
+                text = f.read().strip()
+        except OSError:
+            return None
+        return None if not text or text.startswith('Unnamed repository') else text
+
+    async def get_tree(self, full_name: str, ref: str = 'HEAD') -> Dict[str, str]:
+        """ref의 전체 파일 {경로: blob SHA}. 빈 저장소는 {}"""
+        if ref == 'HEAD' and await self._head(full_name) is None:
+            return {}
+        output = await self._run(full_name, 'ls-tree', '-r', '-z', '--full-tree', ref)
+        tree = {}
+        for entry in output.split(b'\0'):
+            if not entry:
+                continue
+            meta, entry_path = entry.split(b'\t', 1)
+            _, kind, sha = meta.decode().split()
+            if kind == 'blob':
+                tree[entry_path.decode('utf-8', 'replace')] = sha
+        return tree
+
+    async def get_blob_text(self, full_name: str, sha: str) -> str:
+        blobs = await self._read_blobs(full_name, [sha])
+        if sha not in blobs:
+            raise LocalGitError(f"blob {sha}이 로컬 저장소에 없습니다 ({full_name})", 404)
+        return blobs[sha].decode('utf-8', errors='replace')
+
+    async def get_readme(self, full_name: str, tree: Optional[Dict[str, str]] = None) -> Optional[str]:
+        if tree is None:
+            tree = await self.get_tree(full_name)
+        path = select_readme(tree)
+        if path is None:
+            return None
+        blob = (await self._read_blobs(full_name, [tree[path]])).get(tree[path])
+        return blob.decode('utf-8', errors='replace') if blob is not None else None
+
+    async def get_languages(self, full_name: str, tree: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """언어별 바이트 수. 확장자로 언어를 정하고 벤더/빌드 디렉터리는 제외합니다."""
+        if tree is None:
+            tree = await self.get_tree(full_name)
+        files = {
+            sha: language for path, sha in tree.items()
+            if (language := _language(path)) and not tech_classifier.IGNORED_DIRS.intersection(path.split('/')[:-1])
+        }
+        if not files:
+            return {}
+        output = await self._cat_file(full_name, '--batch-check', list(files))
+        sizes: Dict[str, int] = defaultdict(int)
+        for line in output.decode().splitlines():
+            parts = line.split()
+            if len(parts) == 3 and parts[1] == 'blob':
+                sizes[files[parts[0]]] += int(parts[2])
+        return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+    async def get_branches(self, full_name: str) -> List[str]:
+        """로컬 브랜치와 origin의 원격 추적 브랜치 이름"""
+        output = await self._run(full_name, 'for-each-ref', '--format=%(refname)', 'refs/heads', 'refs/remotes/origin')
+        branches = []
+        for ref in output.decode().splitlines():
+            name = ref.removeprefix('refs/heads/').removeprefix('refs/remotes/origin/')
+            if name != 'HEAD':
+                branches.append(name)
+        return sorted(dict.fromkeys(branches))
+
+    async def get_commit_count(self, full_name: str) -> int:
+        if await self._head(full_name) is None:
+            return 0
+        return int(await self._run(full_name, 'rev-list', '--count', 'HEAD'))
+
+    async def get_contribution_stats(self, full_name: str) -> Dict[str, Any]:
+        """기본 브랜치 이력에서 작성자별 커밋/줄 수와 최근 52주 활동을 계산합니다 (병합 커밋 제외).
+
+        GitHub 통계 API 응답과 같은 형태로 만들어 contribution_stats.summarize()로 요약합니다.
+        줄 수를 세려면 blob이 필요하므로 부분 클론처럼 blob이 없으면 커밋 수만 셉니다.
+        """
+        if await self._head(full_name) is None:
+            return contribution_stats.summarize([], [])
+        log = ('log', '--no-merges', f"--format={_COMMIT_FORMAT}", 'HEAD')
+        try:
+            output = await self._run(full_name, *log, '--numstat')
+        except LocalGitError:
+            output = await self._run(full_name, *log)
+        authors: Dict[str, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0, 0]))
+        weekly: Dict[int, int] = defaultdict(int)
+        week = None
+        for line in output.decode('utf-8', 'replace').splitlines():
+            if line.startswith(_COMMIT_MARK):
+                timestamp, author = line[1:].split('\t', 1)
+                week = _week_start(int(timestamp))
+                counts = authors[author][week]
+                counts[2] += 1
+                weekly[week] += 1
+            elif line and week is not None:
+                added, deleted, _ = line.split('\t', 2)
+                # 바이너리 파일은 '-'
+                counts[0] += int(added) if added.isdigit() else 0
+                counts[1] += int(deleted) if deleted.isdigit() else 0
+        contributors = [
+            {
+                'author': {'login': author},
+                'total': sum(counts[2] for counts in weeks.values()),
+                'weeks': [{'w': w, 'a': a, 'd': d, 'c': c} for w, (a, d, c) in sorted(weeks.items())],
+            }
+            for author, weeks in authors.items()
+        ]
+        current = _week_start(int(time.time()))
+        activity = [{'week': w, 'total': weekly.get(w, 0)}
+                    for w in range(current - (_ACTIVITY_WEEKS - 1) * _WEEK, current + 1, _WEEK)]
+        return contribution_stats.summarize(contributors, activity)
+
+    async def get_manifests(self, full_name: str, tree: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """매니페스트 파일 {경로: 내용}. 고른 파일의 blob을 cat-file 한 번으로 읽습니다."""
+        shas = await self.get_tree(full_name) if tree is None else tree
+        paths = tech_classifier.select_manifests(shas)
+        blobs = await self._read_blobs(full_name, [shas[path] for path in paths])
+        return {path: blobs[shas[path]].decode('utf-8', errors='replace') for path in paths if shas[path] in blobs}
+
+    async def get_head_sha(self, full_name: str, etag: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """HEAD 커밋 SHA와 비교용 값(SHA). etag와 같으면 SHA는 None, 빈 저장소는 ''"""
+        sha = await self._head(full_name)
+        if sha is None:
+            return '', None
+        if sha == etag:
+            return None, etag
+        return sha, sha
+
+    async def get_conditional(self, path: str, params: Optional[dict] = None, etag: Optional[str] = None,
+                              accept: Optional[str] = None) -> Tuple[None, Optional[str]]:
+        """변경 감지용 조건부 조회. 로컬 저장소에는 이슈가 없으므로 항상 바뀌지 않음(None)입니다."""
+        return None, etag
+
+    async def iter_issues(self, full_name: str, state: str = 'all', labels: Optional[List[str]] = None,
+                          since: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """로컬 저장소에는 이슈가 없습니다."""
+        return
+        yield
+
+    async def get_issues(self, full_name: str) -> List[Dict[str, Any]]:
+        return []
+
+    async def fetch_snapshot(self, full_name: str, resources=None) -> RepoSnapshot:
+        """저장소 정보와 요청한 리소스를 동시에 읽어 스냅샷을 만듭니다.
+
+        README, 언어, 매니페스트는 모두 HEAD 트리에서 찾으므로 트리를 한 번 읽어 함께 씁니다.
+        """
+        loaders = {
+            'readme_text': self.get_readme,
+            'languages': self.get_languages,
+            'branches': self.get_branches,
+            'commit_count': self.get_commit_count,
+            'issues': self.get_issues,
+            'manifests': self.get_manifests,
+            'contribution_stats': self.get_contribution_stats,
+        }
+        resources = tuple(loaders) if resources is None else resources
+        if set(TREE_RESOURCES).intersection(resources):
+            tree = await self.get_tree(full_name)
+            for name in TREE_RESOURCES:
+                loaders[name] = functools.partial(loaders[name], tree=tree)
+        names = ['info', *resources]
+        results = await asyncio.gather(
+            self.get_repo(full_name),
+            *(loaders[name](full_name) for name in resources)
+        )
+        snapshot = RepoSnapshot.preloaded(**dict(zip(names, results)))
+        snapshot.fetch_counts.update(names)
+        return snapshot
+
+
+# 이벤트 루프별 공유 클라이언트 (세마포어가 루프에 묶임)
+_clients: Dict[int, LocalGitClient] = {}
+
+
+def get_local_client() -> LocalGitClient:
+    """현재 이벤트 루프에서 사용할 공유 클라이언트를 반환합니다."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(id(loop))
+    if client is None:
+        client = LocalGitClient()
+        _clients.clear()
+        _clients[id(loop)] = client
+    return client
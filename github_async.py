@@ -0,0 +1,481 @@
+"""
+비동기 GitHub 수집 엔진
+
+저장소 분석에 필요한 독립적인 요청(저장소 정보, README, 언어, 브랜치,
+커밋 수, 이슈, 매니페스트, 기여 통계)을 asyncio로 동시에 보내 이벤트 루프를 막지 않습니다.
+
+- 동시 요청 수는 세마포어로 제한합니다.
+- 5xx, 네트워크 오류는 지터가 있는 지수 백오프로 재시도합니다.
+- 요청마다 token_pool에서 여유가 가장 큰 토큰을 골라 보냅니다. rate limit 응답을 받은 토큰은
+  풀려날 때까지 제외하고 다른 토큰으로 다시 보내며, 모든 토큰이 소진되었으면 가장 먼저 풀리는
+  시각까지 기다리거나(MAX_RATE_LIMIT_WAIT 이하) 정확한 retry_after와 함께 실패합니다.
+- github_cache의 디스크 캐시와 ETag 재검증을 그대로 사용합니다.
+- 로컬 클론/미러를 가리키는 URL은 같은 메서드를 가진 git_local.LocalGitClient로 읽습니다 (resolve()).
+"""
+import asyncio
+import base64
+import contextvars
+import os
+import random
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+import contribution_stats
+import git_local
+import github_cache
+import metrics
+import tech_classifier
+import token_pool
+from repo_snapshot import RepoSnapshot, parse_github_url
+
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+MAX_CONCURRENCY = int(os.getenv('GITHUB_MAX_CONCURRENCY', '8'))
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+# 모든 토큰이 풀릴 때까지 이보다 오래 남았으면 기다리지 않고 실패
+MAX_RATE_LIMIT_WAIT = float(os.getenv('GITHUB_RATE_LIMIT_MAX_WAIT', '60'))
+
+PER_PAGE = 100
+_LINK_PATTERN = re.compile(r'<([^>]+)>;\s*rel="([^"]+)"')
+_PAGE_PATTERN = re.compile(r'[?&]page=(\d+)')
+# 커밋 SHA만 본문으로 받는 미디어 타입 (40바이트)
+SHA_MEDIA_TYPE = 'application/vnd.github.sha'
+
+# True이면 캐시가 아직 유효해도 ETag로 재검증 (revalidating() 참고)
+_revalidate = contextvars.ContextVar('github_revalidate', default=False)
+
+# 스냅샷에 미리 채울 수 있는 리소스 (RepoSnapshot 속성 이름)
+SNAPSHOT_RESOURCES = ('readme_text', 'languages', 'branches', 'commit_count', 'issues', 'manifests',
+                      'contribution_stats')
+
+
+class GitHubAPIError(Exception):
+    """재시도 후에도 실패한 GitHub API 요청"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"GitHub API {status}: {message}")
+        self.status = status
+
+
+class GitHubRateLimitError(GitHubAPIError):
+    """rate limit이 소진되어 retry_after초 뒤에 다시 시도해야 하는 경우"""
+
+    def __init__(self, retry_after: float, message: str = 'rate limit exceeded'):
+        super().__init__(403, message)
+        self.retry_after = retry_after
+
+
+@contextmanager
+def revalidating():
+    """이 블록 안(과 여기서 만든 태스크)의 GET은 캐시가 유효해도 ETag로 재검증합니다.
+
+    저장소가 바뀐 것을 확인한 뒤 최신 값이 필요할 때 사용합니다. 바뀌지 않은 리소스는
+    304로 응답되므로 rate limit을 쓰지 않습니다.
+    """
+    token = _revalidate.set(True)
+    try:
+        yield
+    finally:
+        _revalidate.reset(token)
+
+
+def parse_links(header: Optional[str]) -> Dict[str, str]:
+    """Link 헤더를 {rel: url}로 변환합니다."""
+    return {rel: url for url, rel in _LINK_PATTERN.findall(header or '')}
+
+
+class AsyncGitHubClient:
+    """동시성 제한과 재시도를 갖춘 비동기 GitHub REST 클라이언트"""
+
+    def __init__(self, token: Optional[str] = None, base_url: str = GITHUB_API_URL,
+                 max_concurrency: int = MAX_CONCURRENCY, max_retries: int = MAX_RETRIES,
+                 timeout: float = 30.0, cache: Optional[github_cache.ResponseCache] = None,
+                 tokens: Optional[token_pool.TokenPool] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        headers = {'Accept': 'application/vnd.github+json', 'User-Agent': 'mcp-portfolio-server'}
+        # transport는 테스트에서 httpx.MockTransport로 응답을 흉내 낼 때 사용
+        self._client = httpx.AsyncClient(base_url=base_url, headers=headers, timeout=timeout, transport=transport)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.cache = cache
+        # Authorization 헤더는 요청마다 풀에서 고른 토큰으로 채움
+        self.tokens = tokens if tokens is not None else token_pool.TokenPool.from_tokens([token] if token else [])
+        self.request_count = 0
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def __aenter__(self) -> 'AsyncGitHubClient':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def _acquire_token(self) -> token_pool.TokenState:
+        """여유가 있는 토큰을 예약합니다. 모든 토큰이 소진되었으면 풀릴 때까지 기다리거나 실패합니다."""
+        while True:
+            if self.tokens.expiring():
+                await asyncio.to_thread(self.tokens.refresh_expiring)
+            state, wait = self.tokens.acquire()
+            if state is not None:
+                return state
+            if wait > MAX_RATE_LIMIT_WAIT:
+                raise GitHubRateLimitError(wait, f"all {len(self.tokens)} GitHub token(s) are rate limited")
+            # 리셋 시각을 알고 있으므로 정확히 그때까지만 기다림
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        # full jitter: 0 ~ min(상한, 기본값 * 2^attempt)
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+    def _rate_limit_delay(self, response: httpx.Response) -> Optional[float]:
+        """rate limit 응답이면 기다려야 할 시간을, 아니면 None을 반환합니다."""
+        return token_pool.rate_limit_delay(response)
+
+    async def _send(self, method: str, url: str, params: Optional[dict], headers: Dict[str, str]) -> httpx.Response:
+        for attempt in range(self.max_retries + 1):
+            state = await self._acquire_token()
+            request_headers = dict(headers)
+            if state.authorization:
+                request_headers['Authorization'] = state.authorization
+            response = None
+            delay = None
+            try:
+                async with self._semaphore:
+                    self.request_count += 1
+                    response = await self._client.request(method, url, params=params, headers=request_headers)
+                metrics.record_github_response('async', response.status_code, response.headers)
+                delay = self._rate_limit_delay(response)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            finally:
+                self.tokens.release(state, response.headers if response is not None else None, delay)
+
+            if delay is not None:
+                # 이 토큰은 풀려날 때까지 제외되므로 다음 시도는 다른 토큰으로 보내거나 풀릴 때까지 기다림
+                if attempt == self.max_retries:
+                    raise GitHubRateLimitError(max(self.tokens.wait_time(), 0.0), response.text[:200])
+                continue
+
+            if response.status_code >= 500 and attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            return response
+        return response
+
+    async def request(self, method: str, path: str, params: Optional[dict] = None) -> httpx.Response:
+        """요청을 보냅니다. GET은 디스크 캐시를 거칩니다."""
+        headers: Dict[str, str] = {}
+        request = self._client.build_request(method, path, params=params)
+        url = str(request.url)
+        ttl = github_cache.ttl_for(request.url.path)
+        if self.cache is None or method != 'GET' or ttl <= 0:
+            return await self._send(method, path, params, headers)
+
+        key = github_cache.cache_key(method, url, request.headers, auth=self.tokens.identity)
+        entry = self.cache.lookup(key)
+        if entry and entry['expires_at'] > time.time() and not _revalidate.get():
+            self.cache.count('hits')
+            self.cache.touch(key)
+            return self._cached_response(request, entry)
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = await self._send(method, path, params, headers)
+        if response.status_code == 304 and entry:
+            self.cache.count('revalidated')
+            self.cache.touch(key, ttl)
+            return self._cached_response(request, entry)
+
+        self.cache.count('misses')
+        if response.status_code == 200:
+            stored = {k.lower(): v for k, v in response.headers.items()
+                      if k.lower() not in github_cache.VOLATILE_HEADERS}
+            self.cache.store(key, url, stored, response.content, ttl)
+        return response
+
+    @staticmethod
+    def _cached_response(request: httpx.Request, entry: dict) -> httpx.Response:
+        headers = {k: v for k, v in entry['headers'].items() if k not in github_cache.VOLATILE_HEADERS}
+        return httpx.Response(200, headers=headers, content=entry['body'], request=request)
+
+    async def get_conditional(self, path: str, params: Optional[dict] = None, etag: Optional[str] = None,
+                              accept: Optional[str] = None) -> Tuple[Optional[httpx.Response], Optional[str]]:
+        """디스크 캐시를 거치지 않는 조건부 GET. (응답, ETag)를 반환하며 바뀌지 않았으면(304) 응답은 None
+
+        변경 감지용 요청이므로 캐시의 TTL과 관계없이 항상 GitHub에 묻습니다.
+        304 응답은 rate limit에 포함되지 않습니다.
+        """
+        headers: Dict[str, str] = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if accept:
+            headers['Accept'] = accept
+        response = await self._send('GET', path, params, headers)
+        if response.status_code == 304:
+            return None, etag
+        return response, response.headers.get('etag')
+
+    async def get_json(self, path: str, params: Optional[dict] = None) -> Any:
+        response = await self.request('GET', path, params)
+        if response.status_code != 200:
+            raise GitHubAPIError(response.status_code, response.text[:200])
+        return response.json()
+
+    async def iter_paginated(self, path: str, params: Optional[dict] = None) -> AsyncIterator[Any]:
+        """Link 헤더의 next를 따라가며 항목을 하나씩 내보냅니다.
+
+        다음 페이지는 소비자가 현재 페이지를 다 읽었을 때만 요청하므로,
+        중간에 반복을 멈추면 나머지 페이지는 가져오지 않습니다.
+        """
+        params = {'per_page': PER_PAGE, **(params or {})}
+        next_path: Optional[str] = path
+        while next_path:
+            response = await self.request('GET', next_path, params)
+            if response.status_code != 200:
+                raise GitHubAPIError(response.status_code, response.text[:200])
+            for item in response.json():
+                yield item
+            next_path = parse_links(response.headers.get('link')).get('next')
+            # next URL에는 이미 쿼리가 포함되어 있음
+            params = None
+
+    async def get_paginated(self, path: str, params: Optional[dict] = None) -> List[Any]:
+        """모든 페이지의 항목을 모아 반환합니다."""
+        return [item async for item in self.iter_paginated(path, params)]
+
+    async def get_repo(self, full_name: str) -> Dict[str, Any]:
+        data = await self.get_json(f"/repos/{full_name}")
+        return {
+            'name': data.get('name'),
+            'full_name': data.get('full_name'),
+            'description': data.get('description'),
+            'default_branch': data.get('default_branch'),
+        }
+
+    async def get_readme(self, full_name: str) -> Optional[str]:
+        response = await self.request('GET', f"/repos/{full_name}/readme")
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise GitHubAPIError(response.status_code, response.text[:200])
+        return base64.b64decode(response.json()['content']).decode('utf-8')
+
+    async def get_languages(self, full_name: str) -> Dict[str, int]:
+        return await self.get_json(f"/repos/{full_name}/languages")
+
+    async def get_branches(self, full_name: str) -> List[str]:
+        return [branch['name'] for branch in await self.get_paginated(f"/repos/{full_name}/branches")]
+
+    async def get_commit_count(self, full_name: str) -> int:
+        """per_page=1로 요청해 마지막 페이지 번호로 커밋 수를 계산합니다."""
+        response = await self.request('GET', f"/repos/{full_name}/commits", {'per_page': 1})
+        if response.status_code == 409:  # 빈 저장소
+            return 0
+        if response.status_code != 200:
+            raise GitHubAPIError(response.status_code, response.text[:200])
+        last = parse_links(response.headers.get('link')).get('last')
+        if last:
+            match = _PAGE_PATTERN.search(last)
+            if match:
+                return int(match.group(1))
+        return len(response.json())
+
+    async def get_statistics(self, path: str, budget: Optional[float] = None) -> Optional[List[Any]]:
+        """통계 API를 요청합니다.
+
+        GitHub가 통계를 계산하는 동안은 202를 반환하므로 백오프하며 다시 요청하고,
+        budget초(기본 contribution_stats.POLL_BUDGET) 안에 계산되지 않으면 None을 반환합니다.
+        빈 저장소(204)는 빈 목록입니다.
+        """
+        deadline = time.monotonic() + (contribution_stats.POLL_BUDGET if budget is None else budget)
+        delay = contribution_stats.POLL_BASE
+        while True:
+            response = await self.request('GET', path)
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code in (204, 409):
+                return []
+            if response.status_code != 202:
+                raise GitHubAPIError(response.status_code, response.text[:200])
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, contribution_stats.POLL_MAX)
+
+    async def get_contribution_stats(self, full_name: str) -> Dict[str, Any]:
+        """작성자별 커밋/줄 수와 주간 활동 요약 (contribution_stats.summarize 형식)
+
+        통계가 아직 계산 중이면 커밋 수만 담은 요약을 반환합니다.
+        """
+        contributors, activity = await asyncio.gather(
+            self.get_statistics(f"/repos/{full_name}/stats/contributors"),
+            self.get_statistics(f"/repos/{full_name}/stats/commit_activity"),
+        )
+        if contributors is None:
+            return contribution_stats.from_commit_count(await self.get_commit_count(full_name))
+        return contribution_stats.summarize(contributors, activity)
+
+    async def get_head_sha(self, full_name: str, etag: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """기본 브랜치 HEAD의 커밋 SHA와 ETag. etag 이후 바뀌지 않았으면 SHA는 None, 빈 저장소는 ''"""
+        response, etag = await self.get_conditional(f"/repos/{full_name}/commits/HEAD", etag=etag,
+                                                    accept=SHA_MEDIA_TYPE)
+        if response is None:
+            return None, etag
+        if response.status_code == 409:  # 빈 저장소
+            return '', None
+        if response.status_code != 200:
+            raise GitHubAPIError(response.status_code, response.text[:200])
+        return response.text.strip(), etag
+
+    async def get_tree(self, full_name: str, ref: str = 'HEAD') -> Dict[str, str]:
+        """ref의 전체 파일 {경로: blob SHA}. 재귀 트리 조회 한 번으로 가져옵니다. 빈 저장소는 {}"""
+        response = await self.request('GET', f"/repos/{full_name}/git/trees/{ref}", {'recursive': 1})
+        if response.status_code in (404, 409):  # 빈 저장소
+            return {}
+        if response.status_code != 200:
+            raise GitHubAPIError(response.status_code, response.text[:200])
+        return {item['path']: item['sha'] for item in response.json().get('tree', []) if item.get('type') == 'blob'}
+
+    async def get_blob_text(self, full_name: str, sha: str) -> str:
+        """blob 내용. SHA로 조회하므로 내용이 바뀌지 않는 한 캐시에서 응답합니다."""
+        blob = await self.get_json(f"/repos/{full_name}/git/blobs/{sha}")
+        return base64.b64decode(blob['content']).decode('utf-8', errors='replace')
+
+    async def get_manifests(self, full_name: str, tree: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """매니페스트 파일 {경로: 내용}
+
+        경로는 재귀 트리 조회 한 번으로 찾고(tree를 주면 생략), 찾은 파일의 blob만 동시에 가져옵니다.
+        """
+        shas = await self.get_tree(full_name) if tree is None else tree
+        paths = tech_classifier.select_manifests(shas)
+        texts = await asyncio.gather(*(self.get_blob_text(full_name, shas[path]) for path in paths))
+        return dict(zip(paths, texts))
+
+    async def iter_issues(self, full_name: str, state: str = 'all', labels: Optional[List[str]] = None,
+                          since: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """이슈를 수정 시각 오름차순으로 한 건씩 내보냅니다. 필터는 서버에서 적용됩니다."""
+        params = {'state': state, 'sort': 'updated', 'direction': 'asc'}
+        if labels:
+            params['labels'] = ','.join(labels)
+        if since:
+            params['since'] = since
+        async for issue in self.iter_paginated(f"/repos/{full_name}/issues", params):
+            yield {
+                'number': issue['number'],
+                'title': issue['title'],
+                'body': issue.get('body'),
+                'updated_at': issue.get('updated_at'),
+            }
+
+    async def get_issues(self, full_name: str) -> List[Dict[str, Any]]:
+        return [issue async for issue in self.iter_issues(full_name)]
+
+    async def list_repos(self, owner: str) -> List[str]:
+        """조직 또는 사용자의 저장소 URL 목록을 반환합니다."""
+        try:
+            repos = await self.get_paginated(f"/orgs/{owner}/repos", {'type': 'all'})
+        except GitHubAPIError as e:
+            if e.status != 404:
+                raise
+            repos = await self.get_paginated(f"/users/{owner}/repos")
+        return [repo['html_url'] for repo in repos if not repo.get('archived')]
+
+    async def fetch_snapshot(self, full_name: str, resources=SNAPSHOT_RESOURCES) -> RepoSnapshot:
+        """저장소 정보와 요청한 리소스를 동시에 가져와 스냅샷을 만듭니다."""
+        loaders = {
+            'readme_text': self.get_readme,
+            'languages': self.get_languages,
+            'branches': self.get_branches,
+            'commit_count': self.get_commit_count,
+            'issues': self.get_issues,
+            'manifests': self.get_manifests,
+            'contribution_stats': self.get_contribution_stats,
+        }
+        names = ['info', *resources]
+        results = await asyncio.gather(
+            self.get_repo(full_name),
+            *(loaders[name](full_name) for name in resources)
+        )
+        snapshot = RepoSnapshot.preloaded(**dict(zip(names, results)))
+        snapshot.fetch_counts.update(names)
+        return snapshot
+
+
+# 이벤트 루프별 공유 클라이언트 (httpx 커넥션 풀 재사용). 루프 id는 재사용될 수 있으므로 루프도 함께 보관
+_clients: Dict[int, Tuple[asyncio.AbstractEventLoop, AsyncGitHubClient]] = {}
+
+
+def get_async_client() -> AsyncGitHubClient:
+    """현재 이벤트 루프에서 사용할 공유 클라이언트를 반환합니다.
+
+    커넥션은 만든 루프에서만 닫을 수 있으므로 루프가 끝나기 전에 close_async_client()로 닫습니다.
+    닫지 않고 끝난 루프의 클라이언트는 여기서 목록에서 빼며, 그 커넥션은 루프와 함께 정리됩니다.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(id(loop))
+    if entry is not None and entry[0] is loop:
+        return entry[1]
+    for key, (old_loop, _) in list(_clients.items()):
+        if not old_loop.is_running():
+            del _clients[key]
+    cache = github_cache.get_cache() if github_cache.CACHE_ENABLED else None
+    client = AsyncGitHubClient(cache=cache, tokens=token_pool.get_token_pool())
+    _clients[id(loop)] = (loop, client)
+    return client
+
+
+async def close_async_client():
+    """현재 이벤트 루프의 공유 클라이언트를 닫습니다. 루프를 끝내기 전(lifespan 종료)에 호출합니다."""
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(id(loop))
+    if entry is not None and entry[0] is loop:
+        del _clients[id(loop)]
+        await entry[1].aclose()
+
+
+def resolve(url: str):
+    """URL을 읽을 클라이언트와 저장소 이름(로컬 저장소는 경로)을 반환합니다. 형식이 맞지 않으면 None
+
+    로컬 경로, file:// URL, 미러가 있는 GitHub URL은 git_local 백엔드를, 나머지 GitHub URL은
+    이 모듈의 API 클라이언트를 사용합니다. 이벤트 루프 안에서 호출해야 합니다.
+    """
+    path = git_local.resolve(url)
+    if path is not None:
+        return git_local.get_local_client(), path
+    full_name = parse_github_url(url)
+    if not full_name:
+        return None
+    return get_async_client(), full_name
+
+
+async def list_repos(owner: str) -> List[str]:
+    """조직 또는 사용자의 저장소 URL 목록. 미러 디렉터리에 owner가 있으면 미러 목록을 씁니다."""
+    urls = git_local.mirror_owner_urls(owner) if git_local.GITHUB_BACKEND != 'api' else None
+    if urls is not None:
+        return urls
+    if git_local.GITHUB_BACKEND == 'local':
+        raise git_local.LocalGitError(f"{owner}의 로컬 미러가 없습니다. (GIT_MIRROR_DIR={git_local.GIT_MIRROR_DIR})", 404)
+    return await get_async_client().list_repos(owner)
+
+
+async def fetch_snapshot(url: str, resources=SNAPSHOT_RESOURCES) -> Optional[RepoSnapshot]:
+    """저장소 URL의 스냅샷을 가져옵니다. URL 형식이 맞지 않으면 None"""
+    resolved = resolve(url)
+    if resolved is None:
+        return None
+    client, full_name = resolved
+    return await client.fetch_snapshot(full_name, resources)
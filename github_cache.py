@@ -0,0 +1,250 @@
+"""
+GitHub API 응답 디스크 캐시
+
+github_async.AsyncGitHubClient의 GET 요청이 이 캐시를 거쳐, 같은 저장소를
+다시 분석할 때 API 호출과 rate limit 소모를 줄입니다.
+
+- 응답 본문은 SHA-256 이름의 파일로 저장하고(content-addressed), 인덱스는 SQLite에 둡니다.
+- 캐시 키는 메서드, URL(정렬된 쿼리 파라미터 포함), Accept, 인증 정보의 해시입니다.
+- 리소스별 TTL 안에서는 네트워크 없이 캐시로 응답하고, TTL이 지나면
+  If-None-Match / If-Modified-Since 조건부 요청을 보냅니다. 304는 rate limit에 포함되지 않습니다.
+- 전체 크기가 상한을 넘으면 가장 오래 사용되지 않은 항목부터 지웁니다(LRU).
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import metrics
+
+CACHE_DIR = os.getenv('GITHUB_CACHE_DIR', os.path.join('.cache', 'github'))
+CACHE_MAX_BYTES = int(os.getenv('GITHUB_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+CACHE_ENABLED = os.getenv('GITHUB_CACHE', '1') != '0'
+
+# 경로 패턴별 TTL(초). 위에서부터 처음 일치하는 규칙을 사용합니다.
+TTL_RULES = (
+    (re.compile(r'^/rate_limit'), 0),
+    (re.compile(r'^/user$'), 60),
+    (re.compile(r'^/repos/[^/]+/[^/]+/(readme|languages|contents)'), 3600),
+    # blob은 SHA로 조회하므로 내용이 바뀌지 않음
+    (re.compile(r'^/repos/[^/]+/[^/]+/git/blobs/'), 30 * 86400),
+    (re.compile(r'^/repos/[^/]+/[^/]+/git/trees/'), 600),
+    (re.compile(r'^/repos/[^/]+/[^/]+/(commits|issues|pulls)'), 300),
+    # 통계는 GitHub가 계산해 둔 값이며 자주 바뀌지 않음 (202 응답은 저장하지 않음)
+    (re.compile(r'^/repos/[^/]+/[^/]+/stats/'), 3600),
+    (re.compile(r'^/repos/[^/]+/[^/]+/branches'), 600),
+    (re.compile(r'^/repos/[^/]+/[^/]+$'), 600),
+)
+DEFAULT_TTL = 300
+
+# 캐시된 응답을 그대로 돌려줄 때 빼는 헤더 (오래된 rate limit 값이 토큰 풀에 반영되지 않도록)
+VOLATILE_HEADERS = ('x-ratelimit-limit', 'x-ratelimit-remaining', 'x-ratelimit-reset',
+                     'x-ratelimit-used', 'x-ratelimit-resource', 'date', 'content-encoding',
+                     'transfer-encoding', 'content-length')
+
+
+def ttl_for(path: str) -> int:
+    """요청 경로에 해당하는 TTL을 반환합니다."""
+    for pattern, ttl in TTL_RULES:
+        if pattern.search(path):
+            return ttl
+    return DEFAULT_TTL
+
+
+def cache_key(method: str, url: str, headers, auth: Optional[str] = None) -> str:
+    """메서드, 정규화된 URL, Accept, 인증 정보로 캐시 키를 만듭니다.
+
+    auth를 주면 Authorization 헤더 대신 사용합니다 (토큰 풀의 identity).
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    normalized = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+    # 토큰마다 볼 수 있는 저장소가 다르므로 인증 정보도 키에 포함 (원문은 저장하지 않음)
+    if auth is None:
+        auth = headers.get('Authorization', '')
+    auth = hashlib.sha256(auth.encode()).hexdigest()
+    raw = '\n'.join((method.upper(), normalized, headers.get('Accept', ''), auth))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite 인덱스와 content-addressed 본문 파일로 구성된 디스크 캐시"""
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._blob_dir = os.path.join(directory, 'blobs')
+        os.makedirs(self._blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute('''
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            url TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            headers TEXT,
+            body_sha TEXT,
+            size INTEGER,
+            expires_at REAL,
+            last_access REAL
+        )
+        ''')
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+        # 지운 항목의 본문을 다른 항목이 아직 쓰는지 확인할 때 사용
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_body_sha ON entries(body_sha)")
+        self._db.commit()
+        self.counters = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self._blob_dir, sha[:2], sha)
+
+    def _write_blob(self, path: str, body: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """캐시 항목을 반환합니다. 본문 파일이 없으면 None"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT url, etag, last_modified, headers, body_sha, expires_at FROM entries WHERE key = ?',
+                (key,)
+            ).fetchone()
+        if not row:
+            return None
+        try:
+            with open(self._blob_path(row[4]), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        return {
+            'url': row[0],
+            'etag': row[1],
+            'last_modified': row[2],
+            'headers': json.loads(row[3]),
+            'body': body,
+            'expires_at': row[5],
+        }
+
+    def store(self, key: str, url: str, headers: Dict[str, str], body: bytes, ttl: int):
+        """응답을 저장합니다. 같은 본문은 한 번만 기록됩니다."""
+        sha = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(sha)
+        if not os.path.exists(path):
+            self._write_blob(path, body)
+
+        now = time.time()
+        with self._lock:
+            # 위에서 확인한 뒤 다른 스레드의 정리로 같은 본문 파일이 지워졌으면 다시 기록
+            if not os.path.exists(path):
+                self._write_blob(path, body)
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(key, url, etag, last_modified, headers, body_sha, size, expires_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, url, headers.get('etag'), headers.get('last-modified'),
+                 json.dumps(headers), sha, len(body), now + ttl, now)
+            )
+            self._db.commit()
+            self.counters['stores'] += 1
+        self._evict()
+
+    def touch(self, key: str, ttl: Optional[int] = None):
+        """마지막 사용 시각을 갱신하고, ttl이 주어지면 만료 시각도 연장합니다."""
+        now = time.time()
+        with self._lock:
+            if ttl is None:
+                self._db.execute('UPDATE entries SET last_access = ? WHERE key = ?', (now, key))
+            else:
+                self._db.execute('UPDATE entries SET last_access = ?, expires_at = ? WHERE key = ?',
+                                 (now, now + ttl, key))
+            self._db.commit()
+
+    def _evict(self):
+        with self._lock:
+            total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for key, size, sha in self._db.execute('SELECT key, size, body_sha FROM entries ORDER BY last_access'):
+                if total <= self.max_bytes:
+                    break
+                victims.append((key, sha))
+                total -= size
+            self._db.executemany('DELETE FROM entries WHERE key = ?', [(key,) for key, _ in victims])
+            self._db.commit()
+            self.counters['evictions'] += len(victims)
+
+            # 지운 항목의 본문 중 더 이상 참조되지 않는 파일만 정리 (store()가 락 안에서 파일을 다시 확인함)
+            for sha in {sha for _, sha in victims}:
+                if self._db.execute('SELECT 1 FROM entries WHERE body_sha = ? LIMIT 1', (sha,)).fetchone():
+                    continue
+                try:
+                    os.remove(self._blob_path(sha))
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        """hit/miss 카운터와 현재 캐시 크기를 반환합니다."""
+        with self._lock:
+            entries, size = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+            counters = dict(self.counters)
+        served = counters['hits'] + counters['revalidated']
+        lookups = served + counters['misses']
+        counters.update({
+            'entries': entries,
+            'bytes': size,
+            'hit_ratio': round(served / lookups, 4) if lookups else 0.0,
+        })
+        return counters
+
+    def clear(self):
+        """모든 항목을 지웁니다."""
+        with self._lock:
+            self._db.execute('DELETE FROM entries')
+            self._db.commit()
+        for root, _, files in os.walk(self._blob_dir):
+            for name in files:
+                try:
+                    os.remove(os.path.join(root, name))
+                except OSError:
+                    pass
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache:
+    """프로세스 전역 응답 캐시를 반환합니다."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+                metrics.register_collector('github_cache', _collect_metrics)
+    return _cache
+
+
+def _collect_metrics():
+    stats = get_cache().stats()
+    yield ('github_cache_lookups_total', 'counter', 'GitHub 응답 캐시 조회 결과별 수',
+           [({'result': result}, stats[result]) for result in ('hits', 'revalidated', 'misses')])
+    yield ('github_cache_hit_ratio', 'gauge', '네트워크 본문 전송 없이 응답한 비율 (hit + 304 재검증)',
+           [({}, stats['hit_ratio'])])
+    yield ('github_cache_bytes', 'gauge', '캐시된 응답 본문 크기', [({}, stats['bytes'])])
+    yield ('github_cache_evictions_total', 'counter', 'LRU로 지운 항목 수', [({}, stats['evictions'])])
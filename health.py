@@ -0,0 +1,156 @@
+"""
+헬스 체크
+
+Kubernetes 프로브처럼 몇 초마다 호출되어도 GitHub 할당량이나 네트워크를 쓰지 않도록
+검사를 나눕니다.
+
+- liveness: 프로세스 안의 상태만 확인 (I/O 없음)
+- readiness: 풀 커넥션으로 SQLite ping + 캐시된 GitHub 상태. 종료(drain) 중이면 503
+- GitHub 상태: 백그라운드 작업이 GITHUB_STATUS_INTERVAL마다 /rate_limit(할당량을 쓰지 않음)을
+  조회해 결과와 남은 요청 수를 저장하고, GITHUB_STATUS_TTL이 지나면 stale로 표시합니다.
+  토큰이 여러 개이면 응답 헤더로 추적한 토큰별 상태(tokens)도 함께 보여 줍니다.
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import serving
+import token_pool
+from lazy_import import lazy_import
+from storage import get_pool
+
+github_async = lazy_import('github_async')
+
+GITHUB_STATUS_INTERVAL = float(os.getenv('GITHUB_STATUS_INTERVAL', '60'))
+GITHUB_STATUS_TTL = float(os.getenv('GITHUB_STATUS_TTL', '300'))
+# 1이면 GitHub 상태가 ok가 아닐 때 readiness도 실패
+GITHUB_REQUIRED_FOR_READY = os.getenv('GITHUB_REQUIRED_FOR_READY', '0') == '1'
+
+STARTED_AT = time.monotonic()
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+class GitHubStatus:
+    """백그라운드에서 갱신되는 GitHub 연결 상태"""
+
+    def __init__(self, interval: float = GITHUB_STATUS_INTERVAL, ttl: float = GITHUB_STATUS_TTL):
+        self.interval = interval
+        self.ttl = ttl
+        self.ok: Optional[bool] = None
+        self.error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self.remaining: Optional[int] = None
+        self.limit: Optional[int] = None
+        self.reset: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self):
+        """/rate_limit을 조회해 상태를 갱신합니다. 이 요청은 rate limit에 포함되지 않습니다."""
+        try:
+            response = await github_async.get_async_client().request('GET', '/rate_limit')
+            headers = response.headers
+            core = {}
+            if response.status_code == 200:
+                core = response.json().get('resources', {}).get('core', {})
+            remaining = core.get('remaining', headers.get('x-ratelimit-remaining'))
+            limit = core.get('limit', headers.get('x-ratelimit-limit'))
+            reset = core.get('reset', headers.get('x-ratelimit-reset'))
+            self.remaining = int(remaining) if remaining is not None else None
+            self.limit = int(limit) if limit is not None else None
+            self.reset = int(reset) if reset is not None else None
+            # 이 요청에 쓴 토큰이 소진되어도 다른 토큰에 여유가 있으면 정상
+            self.ok = response.status_code == 200 and (
+                self.remaining != 0 or token_pool.get_token_pool().wait_time() == 0
+            )
+            self.error = None if self.ok else (
+                'rate limit exhausted' if response.status_code == 200 else f"GitHub API {response.status_code}"
+            )
+        except Exception as e:
+            self.ok = False
+            self.error = str(e) or type(e).__name__
+        self.checked_at = time.time()
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """현재 이벤트 루프에서 갱신 작업을 시작합니다."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """마지막으로 확인한 상태 (네트워크 요청 없음)"""
+        age = time.time() - self.checked_at if self.checked_at is not None else None
+        if self.checked_at is None:
+            status = 'unknown'
+        elif age > self.ttl:
+            status = 'stale'
+        else:
+            status = 'ok' if self.ok else 'error'
+        return {
+            'status': status,
+            'checkedAt': _isoformat(self.checked_at),
+            'ageSeconds': round(age, 1) if age is not None else None,
+            'rateLimitRemaining': self.remaining,
+            'rateLimitLimit': self.limit,
+            'rateLimitReset': _isoformat(self.reset),
+            'error': self.error,
+            'tokens': token_pool.get_token_pool().snapshot(),
+        }
+
+
+github_status = GitHubStatus()
+
+
+def liveness() -> Tuple[int, Dict[str, Any]]:
+    """프로세스가 요청을 처리할 수 있는지 (I/O 없음)"""
+    return 200, {
+        'status': 'alive',
+        'uptimeSeconds': round(time.monotonic() - STARTED_AT, 1),
+    }
+
+
+def readiness() -> Tuple[int, Dict[str, Any]]:
+    """트래픽을 받을 준비가 되었는지 (SQLite ping + 캐시된 GitHub 상태)"""
+    checks: Dict[str, Any] = {}
+    ready = True
+    try:
+        get_pool().ping()
+        checks['database'] = {'status': 'ok'}
+    except Exception as e:
+        ready = False
+        checks['database'] = {'status': 'error', 'error': str(e)}
+
+    # 종료 중이면 로드 밸런서가 새 요청을 보내지 않도록 실패
+    checks['server'] = serving.limiter.snapshot()
+    if serving.limiter.draining:
+        ready = False
+
+    checks['github'] = github_status.snapshot()
+    if GITHUB_REQUIRED_FOR_READY and checks['github']['status'] != 'ok':
+        ready = False
+
+    body = {
+        'status': 'ready' if ready else 'unready',
+        'timestamp': datetime.now().isoformat(),
+        'checks': checks,
+    }
+    return (200 if ready else 503), body
@@ -0,0 +1,113 @@
+"""
+스트리밍 이슈 스캐너
+
+이슈를 페이지 단위로 가져오면서 한 건씩 흘려보내고, 최대 건수나 시간 예산에
+도달하면 남은 페이지를 요청하지 않고 멈춥니다. 프로젝트와 필터(state, labels)별로
+마지막으로 본 이슈의 수정 시각을 저장해 두면 같은 필터의 다음 스캔은 그 이후 변경분만 가져옵니다.
+"""
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from storage import get_pool
+
+# 기본 스캔 한도
+MAX_ITEMS = 1000
+TIME_BUDGET = 20.0
+# solutions에 담는 이슈 본문의 최대 길이
+MAX_BODY_CHARS = 2000
+
+
+class IssueScan:
+    """컷오프와 재개 위치를 관리하는 이슈 스트림
+
+    `async for issue in scan` 으로 소비하고, 끝난 뒤 scanned / stop_reason /
+    last_updated_at 으로 결과를 확인합니다.
+    """
+
+    def __init__(self, client, full_name: str, state: str = 'all', labels: Optional[List[str]] = None,
+                 since: Optional[str] = None, boundary_numbers: Optional[List[int]] = None,
+                 max_items: Optional[int] = MAX_ITEMS, time_budget: Optional[float] = TIME_BUDGET):
+        self.client = client
+        self.full_name = full_name
+        self.state = state
+        self.labels = labels
+        self.since = since
+        self.max_items = max_items
+        self.time_budget = time_budget
+        self.scanned = 0
+        self.stop_reason: Optional[str] = None
+        self.last_updated_at = since
+        # last_updated_at과 같은 시각에 수정된 이슈 번호 (since는 경계를 포함하므로 중복 제거용)
+        self.boundary_numbers = set(boundary_numbers or [])
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        skip = set(self.boundary_numbers)
+        async for issue in self.client.iter_issues(self.full_name, self.state, self.labels, self.since):
+            updated_at = issue['updated_at']
+            if updated_at == self.since and issue['number'] in skip:
+                continue
+            if self.max_items is not None and self.scanned >= self.max_items:
+                self.stop_reason = 'max_items'
+                return
+            if deadline is not None and time.monotonic() > deadline:
+                self.stop_reason = 'time_budget'
+                return
+
+            self.scanned += 1
+            if updated_at:
+                if updated_at != self.last_updated_at:
+                    self.last_updated_at = updated_at
+                    self.boundary_numbers = set()
+                self.boundary_numbers.add(issue['number'])
+            yield issue
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'scanned': self.scanned,
+            'truncated': self.stop_reason is not None,
+            'stop_reason': self.stop_reason,
+            'last_updated_at': self.last_updated_at,
+        }
+
+
+def classify_issue(title: str) -> Optional[str]:
+    """이슈 제목으로 'feature' / 'challenge' 여부를 판단합니다."""
+    lowered = title.lower()
+    if "feature" in lowered or "기능" in title:
+        return 'feature'
+    if "challenge" in lowered or "문제" in title:
+        return 'challenge'
+    return None
+
+
+def scan_scope(state: str = 'all', labels: Optional[List[str]] = None) -> str:
+    """스캔 위치를 나누는 필터 키. 같은 필터의 스캔끼리만 위치를 이어 씁니다. (라벨 순서는 무시)"""
+    return json.dumps({'state': state, 'labels': sorted(set(labels or []))}, ensure_ascii=False)
+
+
+def load_scan_state(project_id: int, state: str = 'all', labels: Optional[List[str]] = None) -> Dict[str, Any]:
+    """프로젝트의 해당 필터로 마지막 스캔한 위치를 반환합니다. 없으면 빈 dict"""
+    row = get_pool().fetchone(
+        'SELECT last_updated_at, boundary_numbers FROM issue_scan_scopes WHERE project_id = ? AND scope = ?',
+        (project_id, scan_scope(state, labels))
+    )
+    if not row:
+        return {}
+    return {'since': row[0], 'boundary_numbers': json.loads(row[1] or '[]')}
+
+
+def save_scan_state(project_id: int, github_url: str, scan: IssueScan):
+    """스캔이 끝난 위치를 스캔의 필터별로 저장합니다."""
+    get_pool().execute('''
+    INSERT INTO issue_scan_scopes (project_id, scope, github_url, last_updated_at, boundary_numbers, scanned_count)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(project_id, scope) DO UPDATE SET
+        github_url = excluded.github_url,
+        last_updated_at = excluded.last_updated_at,
+        boundary_numbers = excluded.boundary_numbers,
+        scanned_count = issue_scan_scopes.scanned_count + excluded.scanned_count,
+        updated_at = CURRENT_TIMESTAMP
+    ''', (project_id, scan_scope(scan.state, scan.labels), github_url, scan.last_updated_at,
+          json.dumps(sorted(scan.boundary_numbers)), scan.scanned))
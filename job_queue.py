@@ -0,0 +1,436 @@
+"""
+백그라운드 작업 큐
+
+저장소 분석처럼 오래 걸리는 작업을 MCP 도구 호출 밖에서 실행합니다. 도구는 작업을
+`jobs` 테이블에 넣고 작업 ID를 바로 돌려주며, 같은 이벤트 루프의 워커(JOB_WORKERS개)가
+작업을 하나씩 가져와 실행합니다.
+
+- 중복 제거: 같은 dedupe_key로 대기/실행 중인 작업이 있으면 새로 만들지 않고 그 ID를 반환
+  (부분 unique 색인이 여러 프로세스 사이에서도 보장)
+- 재시도: 실패하면 max_attempts까지 지수 백오프로 다시 대기열에 넣음. JobError와 4xx 응답은 재시도하지 않음
+- 취소: 대기 중이면 바로 cancelled, 실행 중이면 cancel_requested를 표시하고 실행 중인 태스크를 취소
+- 재개: 실행 중인 작업은 HEARTBEAT_INTERVAL마다 heartbeat_at을 갱신합니다. 프로세스가
+  종료되어 STALE_AFTER 동안 갱신되지 않은 작업은 다른(또는 다시 시작한) 프로세스가 대기열로 되돌림
+- 부분 결과: 실행 함수가 save_partial()로 기록한 결과는 실행 중에도 조회할 수 있고, 다시 실행될 때
+  partial_result()로 이어서 처리합니다
+
+MCP 클라이언트는 세션마다 서버 프로세스를 띄우므로 여러 프로세스가 같은 큐를 공유할 수 있습니다.
+작업 선점은 `UPDATE ... WHERE status = 'queued'`의 영향 행 수로 판단합니다.
+"""
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import metrics
+from storage import get_pool
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+# 재시도 대기 시간(초): RETRY_BASE * 2^(시도 횟수 - 1), 최대 RETRY_MAX
+RETRY_BASE = 5.0
+RETRY_MAX = 300.0
+# 새 작업 알림이 없을 때 대기열을 다시 확인하는 간격 (다른 프로세스가 넣은 작업, 재시도 예약)
+POLL_INTERVAL = 1.0
+HEARTBEAT_INTERVAL = 10.0
+STALE_AFTER = float(os.getenv('JOB_STALE_AFTER', '60'))
+# 진행 상황을 데이터베이스에 쓰는 최소 간격 (초)
+PROGRESS_INTERVAL = 0.5
+# 끝난 작업을 보관하는 기간 (일)
+RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', '7'))
+
+ACTIVE_STATUSES = ('queued', 'running')
+FINISHED_STATUSES = ('succeeded', 'failed', 'cancelled')
+STATUSES = ACTIVE_STATUSES + FINISHED_STATUSES
+
+Handler = Callable[..., Awaitable[Any]]
+_handlers: Dict[str, Handler] = {}
+
+_COLUMNS = ('id, kind, dedupe_key, params, status, progress, message, attempts, max_attempts, '
+            'error, cancel_requested, created_at, started_at, finished_at')
+SELECT_JOB = f"SELECT {_COLUMNS} FROM jobs WHERE id = ?"
+SELECT_ACTIVE_BY_KEY = "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running')"
+INSERT_JOB = '''
+INSERT INTO jobs (kind, dedupe_key, params, max_attempts, created_at, available_at)
+VALUES (?, ?, ?, ?, ?, ?)
+'''
+SELECT_NEXT = "SELECT id FROM jobs WHERE status = 'queued' AND available_at <= ? ORDER BY available_at, id LIMIT 1"
+CLAIM_JOB = '''
+UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, started_at = ?, heartbeat_at = ?
+WHERE id = ? AND status = 'queued'
+'''
+SAVE_PARTIAL = "UPDATE jobs SET result = ? WHERE id = ? AND status = 'running'"
+UPDATE_PROGRESS = "UPDATE jobs SET progress = COALESCE(?, progress), message = COALESCE(?, message), heartbeat_at = ? WHERE id = ?"
+HEARTBEAT = "UPDATE jobs SET heartbeat_at = ? WHERE worker = ? AND status = 'running'"
+SELECT_CANCEL_REQUESTED = "SELECT id FROM jobs WHERE worker = ? AND status = 'running' AND cancel_requested = 1"
+# 갱신이 끊긴 실행 중 작업: 시도 횟수가 남았으면 대기열로, 아니면 실패 처리
+REQUEUE_STALE = '''
+UPDATE jobs SET
+    status = CASE WHEN cancel_requested THEN 'cancelled'
+                  WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+    error = CASE WHEN cancel_requested THEN error
+                 WHEN attempts < max_attempts THEN error ELSE '작업자가 응답하지 않습니다.' END,
+    finished_at = CASE WHEN cancel_requested OR attempts >= max_attempts THEN ? ELSE NULL END,
+    message = '작업자 중단 후 재개 대기', available_at = ?, worker = NULL
+WHERE status = 'running' AND heartbeat_at < ?
+'''
+PURGE_FINISHED = "DELETE FROM jobs WHERE status IN ('succeeded', 'failed', 'cancelled') AND finished_at < ?"
+COUNT_BY_STATUS = "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+
+
+class JobError(Exception):
+    """재시도해도 결과가 같은 실패 (잘못된 입력 등)"""
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    """작업 종류별 실행 함수를 등록합니다.
+
+    실행 함수는 `async def fn(job: JobContext, **params)` 형태이며, 반환값(JSON 직렬화 가능)이
+    작업 결과로 저장됩니다.
+    """
+    def register(fn: Handler) -> Handler:
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def is_retryable(error: Exception) -> bool:
+    """다시 시도하면 성공할 수 있는 오류인지. 4xx 응답(rate limit 제외)은 재시도하지 않음"""
+    if isinstance(error, JobError):
+        return False
+    if getattr(error, 'retry_after', None) is not None:
+        return True
+    status = getattr(error, 'status', None)
+    return not (isinstance(status, int) and 400 <= status < 500 and status != 429)
+
+
+def retry_delay(attempts: int, error: Exception) -> float:
+    """다시 시도하기까지 기다릴 시간. rate limit 오류는 retry_after를 따름"""
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is not None:
+        return max(float(retry_after), 0.0)
+    return min(RETRY_BASE * 2 ** max(attempts - 1, 0), RETRY_MAX)
+
+
+class JobContext:
+    """실행 함수에 전달되는 작업 정보와 진행 상황 보고"""
+
+    def __init__(self, queue: 'JobQueue', job_id: int, kind: str, attempt: int):
+        self.queue = queue
+        self.id = job_id
+        self.kind = kind
+        self.attempt = attempt
+        self._reported_at = 0.0
+
+    def report(self, progress: Optional[float] = None, message: Optional[str] = None, force: bool = False):
+        """진행률(0~1)과 메시지를 기록합니다. PROGRESS_INTERVAL보다 자주 부르면 건너뜁니다."""
+        now = time.time()
+        if not force and now - self._reported_at < PROGRESS_INTERVAL:
+            return
+        self._reported_at = now
+        get_pool().execute(UPDATE_PROGRESS, (progress, message, now, self.id))
+
+    def partial_result(self) -> Optional[Any]:
+        """이전 시도가 save_partial()로 기록한 결과 (없으면 None)"""
+        row = get_pool().fetchone("SELECT result FROM jobs WHERE id = ?", (self.id,))
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def save_partial(self, result: Any, conn=None):
+        """지금까지의 결과를 기록합니다. conn을 주면 그 트랜잭션 안에서 기록합니다.
+
+        실행 중에는 get_job_result로, 취소되거나 실패한 뒤에도 마지막으로 기록한 결과를 조회할 수 있습니다.
+        """
+        (conn or get_pool()).execute(SAVE_PARTIAL, (json.dumps(result, ensure_ascii=False, default=str), self.id))
+
+
+class JobQueue:
+    """SQLite에 저장되는 작업 큐와 asyncio 워커"""
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = workers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._background: list = []
+        # 이 프로세스에서 실행 중인 작업 ID -> 실행 함수 태스크
+        self._running: Dict[int, asyncio.Task] = {}
+        # 취소 요청으로 멈춘 작업 (서버 종료로 멈춘 작업과 구분)
+        self._cancelled: set = set()
+        # wait()로 기다리는 작업 ID -> 워커 루프의 Future (작업이 끝나면 깨움)
+        self._waiters: Dict[int, set] = {}
+
+    # 대기열 조작 (동기 함수, 어느 스레드에서나 호출 가능)
+
+    def submit(self, kind: str, params: Dict[str, Any], dedupe_key: Optional[str] = None,
+               max_attempts: int = JOB_MAX_ATTEMPTS) -> Tuple[int, bool]:
+        """작업을 대기열에 넣고 (작업 ID, 기존 작업 재사용 여부)를 반환합니다."""
+        if kind not in _handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        pool = get_pool()
+        for _ in range(2):
+            if dedupe_key is not None:
+                row = pool.fetchone(SELECT_ACTIVE_BY_KEY, (dedupe_key,))
+                if row:
+                    return row[0], True
+            now = time.time()
+            try:
+                cursor = pool.execute(INSERT_JOB, (kind, dedupe_key, json.dumps(params, ensure_ascii=False),
+                                                   max(max_attempts, 1), now, now))
+            except sqlite3.IntegrityError:
+                # 다른 프로세스가 같은 키로 먼저 넣음 -> 그 작업을 다시 조회
+                continue
+            self._notify()
+            return cursor.lastrowid, False
+        raise RuntimeError(f"작업을 등록하지 못했습니다: {dedupe_key}")
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """작업 상태 (결과 제외)"""
+        row = get_pool().fetchone(SELECT_JOB, (job_id,))
+        if row is None:
+            return None
+        (job_id, kind, dedupe_key, params, status, progress, message, attempts, max_attempts,
+         error, cancel_requested, created_at, started_at, finished_at) = row
+        return {
+            'id': job_id,
+            'kind': kind,
+            'status': status,
+            'progress': round(progress or 0.0, 3),
+            'message': message,
+            'attempts': attempts,
+            'maxAttempts': max_attempts,
+            # 재시도 대기 중이면 직전 시도의 오류
+            'lastError': error,
+            'cancelRequested': bool(cancel_requested),
+            'params': json.loads(params) if params else {},
+            'createdAt': _isoformat(created_at),
+            'startedAt': _isoformat(started_at),
+            'finishedAt': _isoformat(finished_at),
+        }
+
+    def result(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """작업 상태와 결과. 아직 끝나지 않았으면 result는 None"""
+        row = get_pool().fetchone("SELECT status, result, error FROM jobs WHERE id = ?", (job_id,))
+        if row is None:
+            return None
+        status, result, error = row
+        response = {
+            'id': job_id,
+            'status': status,
+            'result': json.loads(result) if result is not None else None,
+        }
+        if status == 'failed':
+            response['error'] = error
+        return response
+
+    def cancel(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """작업을 취소합니다. 이미 끝난 작업은 그대로 둡니다."""
+        now = time.time()
+        with get_pool().transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ?, message = '취소됨' "
+                "WHERE id = ? AND status = 'queued'", (now, job_id))
+            if cursor.rowcount == 0:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+        # 다른 프로세스에서 실행 중이면 그 프로세스의 heartbeat가 cancel_requested를 보고 취소
+        self._call_in_loop(lambda: self._cancel_task(job_id))
+        return self.get(job_id)
+
+    async def wait(self, job_id: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """작업이 끝나거나 timeout초가 지날 때까지 기다린 뒤 상태를 반환합니다.
+
+        이 프로세스의 워커가 실행하는 작업은 끝나는 즉시 깨어납니다. 아직 대기 중이거나 다른 프로세스가
+        실행하는 작업은 알림을 받을 수 없으므로 POLL_INTERVAL마다 데이터베이스를 다시 확인합니다.
+        """
+        deadline = time.monotonic() + timeout
+        loop = asyncio.get_running_loop()
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job['status'] in FINISHED_STATUSES or remaining <= 0:
+                return job
+            if loop is not self._loop:
+                # 워커가 없는 루프에서는 알림을 받을 수 없음
+                await asyncio.sleep(min(POLL_INTERVAL, remaining))
+                continue
+            waiter = loop.create_future()
+            self._waiters.setdefault(job_id, set()).add(waiter)
+            try:
+                await asyncio.wait((waiter,), timeout=remaining if job_id in self._running
+                                   else min(POLL_INTERVAL, remaining))
+            finally:
+                waiters = self._waiters.get(job_id)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        del self._waiters[job_id]
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(dict(get_pool().fetchall(COUNT_BY_STATUS)))
+        return counts
+
+    # 워커
+
+    def start(self):
+        """현재 이벤트 루프에서 워커를 시작합니다. 이미 실행 중이면 아무것도 하지 않습니다."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._background:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._requeue_stale()
+        get_pool().execute(PURGE_FINISHED, (time.time() - RETENTION_DAYS * 86400,))
+        self._background = [loop.create_task(self._worker()) for _ in range(max(self.workers, 1))]
+        self._background.append(loop.create_task(self._heartbeat()))
+
+    async def stop(self):
+        """워커를 멈춥니다. 실행 중이던 작업은 다음 프로세스가 바로 이어서 하도록 대기열로 되돌립니다."""
+        tasks, self._background = self._background, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+
+    def _notify(self):
+        if self._wakeup is not None:
+            self._call_in_loop(self._wakeup.set)
+
+    def _call_in_loop(self, callback: Callable[[], Any]):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self._loop is None or running is self._loop:
+            callback()
+        else:
+            self._loop.call_soon_threadsafe(callback)
+
+    def _cancel_task(self, job_id: int):
+        task = self._running.get(job_id)
+        if task is not None:
+            self._cancelled.add(job_id)
+            task.cancel()
+        else:
+            # 대기 중에 바로 취소된 작업은 실행되지 않으므로 여기서 알림
+            self._wake_waiters(job_id)
+
+    def _wake_waiters(self, job_id: int):
+        """작업 상태가 바뀌었음을 wait()에 알립니다. 워커 루프에서 호출합니다."""
+        for waiter in self._waiters.pop(job_id, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _requeue_stale(self):
+        now = time.time()
+        get_pool().execute(REQUEUE_STALE, (now, now, now - STALE_AFTER))
+
+    def _claim(self) -> Optional[Tuple[int, str, Dict[str, Any], int]]:
+        pool = get_pool()
+        while True:
+            now = time.time()
+            row = pool.fetchone(SELECT_NEXT, (now,))
+            if row is None:
+                return None
+            if pool.execute(CLAIM_JOB, (self.worker_id, now, now, row[0])).rowcount == 1:
+                kind, params, attempts = pool.fetchone(
+                    "SELECT kind, params, attempts FROM jobs WHERE id = ?", (row[0],))
+                return row[0], kind, json.loads(params or '{}'), attempts
+            # 다른 워커가 먼저 가져감 -> 다음 작업
+
+    async def _worker(self):
+        while True:
+            claimed = self._claim()
+            if claimed is None:
+                # wait_for는 (Python 3.11 이하) 이벤트가 설정되는 순간 취소되면 취소를 삼켜
+                # stop()이 끝나지 않으므로 타이머로 깨움
+                timer = self._loop.call_later(POLL_INTERVAL, self._wakeup.set)
+                try:
+                    await self._wakeup.wait()
+                finally:
+                    timer.cancel()
+                self._wakeup.clear()
+                continue
+            await self._execute(*claimed)
+
+    async def _execute(self, job_id: int, kind: str, params: Dict[str, Any], attempts: int):
+        pool = get_pool()
+        fn = _handlers.get(kind)
+        if fn is None:
+            pool.execute("UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                         (f"Unknown job kind: {kind}", time.time(), job_id))
+            self._wake_waiters(job_id)
+            return
+
+        task = asyncio.ensure_future(fn(JobContext(self, job_id, kind, attempts), **params))
+        self._running[job_id] = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if job_id not in self._cancelled:
+                # 워커 자체가 멈추는 중 (서버 종료) -> 다음 프로세스가 이어서 실행
+                task.cancel()
+                pool.execute("UPDATE jobs SET status = 'queued', attempts = attempts - 1, worker = NULL, "
+                             "available_at = ?, message = '서버 종료로 대기열에 되돌림' WHERE id = ? AND status = 'running'",
+                             (time.time(), job_id))
+                raise
+            pool.execute("UPDATE jobs SET status = 'cancelled', finished_at = ?, message = '취소됨' WHERE id = ?",
+                         (time.time(), job_id))
+        except Exception as e:
+            now = time.time()
+            error = str(e) or type(e).__name__
+            max_attempts = pool.fetchone("SELECT max_attempts FROM jobs WHERE id = ?", (job_id,))[0]
+            if not is_retryable(e) or attempts >= max_attempts:
+                pool.execute("UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                             (error, now, job_id))
+            else:
+                delay = retry_delay(attempts, e)
+                pool.execute("UPDATE jobs SET status = 'queued', error = ?, worker = NULL, available_at = ?, "
+                             "message = ? WHERE id = ?",
+                             (error, now + delay, f"{delay:.0f}초 뒤 재시도 ({attempts}/{max_attempts})", job_id))
+        else:
+            pool.execute("UPDATE jobs SET status = 'succeeded', result = ?, progress = 1.0, message = '완료', "
+                         "finished_at = ? WHERE id = ?",
+                         (json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id))
+        finally:
+            self._running.pop(job_id, None)
+            self._cancelled.discard(job_id)
+            self._wake_waiters(job_id)
+
+    async def _heartbeat(self):
+        pool = get_pool()
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            if self._running:
+                pool.execute(HEARTBEAT, (time.time(), self.worker_id))
+                for (job_id,) in pool.fetchall(SELECT_CANCEL_REQUESTED, (self.worker_id,)):
+                    self._cancel_task(job_id)
+            self._requeue_stale()
+
+
+_queue: Optional[JobQueue] = None
+
+
+def get_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        _queue = JobQueue()
+    return _queue
+
+
+def _collect_metrics():
+    yield ('background_jobs', 'gauge', '상태별 백그라운드 작업 수',
+           [({'status': status}, count) for status, count in get_queue().counts().items()])
+
+
+metrics.register_collector('jobs', _collect_metrics)
@@ -0,0 +1,59 @@
+"""
+지연 import
+
+모듈 객체는 바로 돌려주되 실제 로딩은 처음 속성에 접근할 때 합니다.
+MCP 클라이언트는 세션마다 서버를 stdio 하위 프로세스로 띄우므로, 도구를 호출할 때만
+필요한 무거운 의존성(httpx, Jinja2, PyYAML 등)은 시작 시점에 불러오지 않습니다.
+
+    github_async = lazy_import('github_async')   # 아직 로드되지 않음
+    github_async.fetch_snapshot(...)             # 여기서 로드
+
+HTTP 서빙에서는 동기 도구가 여러 스레드에서 동시에 실행되므로 모듈마다 락을 두고 한 스레드만
+모듈 코드를 실행합니다. (importlib.util.LazyLoader는 Python 3.12 전까지 스레드 안전하지 않아
+다른 스레드가 실행 중인 모듈의 빈 네임스페이스를 보고 AttributeError가 날 수 있음)
+"""
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Dict
+
+_locks: Dict[str, threading.RLock] = {}
+_loading = set()
+
+
+class _LazyModule(ModuleType):
+    """첫 속성 접근 때 모듈 코드를 실행하고 일반 모듈로 바뀌는 모듈"""
+
+    def __getattr__(self, attr):
+        name = self.__name__
+        with _locks[name]:
+            # 같은 스레드에서 로딩 중 다시 접근하면(순환 import) 일반 모듈처럼 지금까지의 네임스페이스를 씀
+            if type(self) is _LazyModule and name not in _loading:
+                _loading.add(name)
+                try:
+                    self.__spec__.loader.exec_module(self)
+                    self.__class__ = ModuleType
+                finally:
+                    _loading.discard(name)
+        if type(self) is _LazyModule:
+            try:
+                return self.__dict__[attr]
+            except KeyError:
+                raise AttributeError(f"partially initialized module {name!r} has no attribute {attr!r}") from None
+        return getattr(self, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """최상위 모듈을 지연 로딩하는 모듈 객체를 반환합니다. 이미 로드되어 있으면 그대로 반환합니다."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    module = importlib.util.module_from_spec(spec)
+    _locks[name] = threading.RLock()
+    module.__class__ = _LazyModule
+    sys.modules[name] = module
+    return module
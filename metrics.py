@@ -0,0 +1,382 @@
+"""
+운영 지표
+
+외부 의존성 없이 카운터, 게이지, 히스토그램을 모아 Prometheus 텍스트 형식으로
+내보냅니다. (/metrics 엔드포인트)
+
+- MCP 도구: 호출 지연 히스토그램과 오류 수 (instrument_tool)
+- GitHub API: 실제 네트워크 요청 수와 마지막으로 본 rate limit 잔량
+- SQLite: 문장 종류별 실행 시간 (storage의 커넥션이 기록)
+- 캐시: 스크레이프할 때 각 캐시의 카운터를 읽는 수집기(register_collector)
+
+느린 호출은 cProfile로 샘플링할 수 있으며 configure_profiling()으로 실행 중에
+켜고 끌 수 있습니다.
+"""
+import bisect
+import cProfile
+import functools
+import inspect
+import io
+import os
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 초 단위 히스토그램 구간 (Prometheus 기본값)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# SQLite 문장은 대부분 1ms 미만
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 0.5)
+
+# 느린 호출 프로파일링 (실행 중 configure_profiling으로 변경)
+PROFILE_ENABLED = os.getenv('PROFILE_SLOW_CALLS', '0') == '1'
+PROFILE_SLOW_MS = float(os.getenv('PROFILE_SLOW_MS', '1000'))
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0.1'))
+# 보관할 프로파일 수와 요약에 넣는 함수 수
+PROFILE_KEEP = 20
+PROFILE_TOP = 25
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Labels:
+        return tuple((name, str(labels[name])) for name in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [*self.header(), *(f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in items)]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 -> [구간별 개수(누적 아님) ..., +Inf 개수, 합계]
+        self._values: Dict[Labels, List[float]] = {}
+
+    def labels(self, **labels) -> '_HistogramChild':
+        """라벨 값이 고정된 자식. 자주 기록하는 곳에서 라벨 조회 비용을 줄입니다."""
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        return _HistogramChild(self, counts)
+
+    def observe(self, value: float, **labels):
+        self.labels(**labels).observe(value)
+
+    def count(self, **labels) -> int:
+        counts = self._values.get(self._key(labels))
+        return int(sum(counts[:-1])) if counts else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._values.items())
+        lines = self.header()
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float('inf')), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(counts[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class _HistogramChild:
+    __slots__ = ('_buckets', '_counts', '_lock')
+
+    def __init__(self, histogram: Histogram, counts: List[float]):
+        self._buckets = histogram.buckets
+        self._counts = counts
+        self._lock = histogram._lock
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._counts[-1] += value
+
+
+# 수집기: (이름, 종류, 설명, [(라벨 dict, 값), ...]) 목록을 반환하는 함수
+Collector = Callable[[], Iterable[Tuple[str, str, str, Iterable[Tuple[Dict[str, Any], float]]]]]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Collector] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, name: str, collector: Collector):
+        """스크레이프할 때 호출할 수집기를 등록합니다. 같은 이름은 교체됩니다."""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                # 수집기 하나가 실패해도 나머지 지표는 내보냄
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(tuple(labels.items()))} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+TOOL_DURATION = REGISTRY.register(Histogram(
+    'mcp_tool_duration_seconds', 'MCP 도구 실행 시간', ('tool',)))
+TOOL_ERRORS = REGISTRY.register(Counter(
+    'mcp_tool_errors_total', 'MCP 도구 오류 수 (kind=exception: 예외, kind=result: 오류 응답)', ('tool', 'kind')))
+GITHUB_REQUESTS = REGISTRY.register(Counter(
+    'github_api_requests_total', '캐시를 거치지 않고 GitHub로 보낸 요청 수', ('client', 'status')))
+GITHUB_RATE_LIMIT_REMAINING = REGISTRY.register(Gauge(
+    'github_rate_limit_remaining', '마지막 응답의 X-RateLimit-Remaining', ('client',)))
+GITHUB_RATE_LIMIT_RESET = REGISTRY.register(Gauge(
+    'github_rate_limit_reset_timestamp', '마지막 응답의 X-RateLimit-Reset (유닉스 시각)', ('client',)))
+SQLITE_QUERY_DURATION = REGISTRY.register(Histogram(
+    'sqlite_query_duration_seconds', 'SQLite 문장 실행 시간', ('statement',), QUERY_BUCKETS))
+PROFILED_CALLS = REGISTRY.register(Counter(
+    'mcp_tool_profiled_calls_total', '프로파일을 보관한 느린 호출 수', ('tool',)))
+
+
+def register_collector(name: str, collector: Collector):
+    REGISTRY.register_collector(name, collector)
+
+
+def render() -> str:
+    """Prometheus 텍스트 형식의 전체 지표"""
+    return REGISTRY.render()
+
+
+def record_github_response(client: str, status: int, headers):
+    """GitHub 응답 하나를 기록합니다. headers는 대소문자를 구분하지 않는 매핑이어야 합니다."""
+    GITHUB_REQUESTS.inc(client=client, status=status)
+    remaining = headers.get('x-ratelimit-remaining')
+    if remaining is not None:
+        GITHUB_RATE_LIMIT_REMAINING.set(float(remaining), client=client)
+    reset = headers.get('x-ratelimit-reset')
+    if reset is not None:
+        GITHUB_RATE_LIMIT_RESET.set(float(reset), client=client)
+
+
+def statement_kind(sql: str) -> str:
+    """지표 라벨로 쓰는 SQL 문장 종류 (SELECT, INSERT, ...)"""
+    word = sql.lstrip()[:8].split(None, 1)
+    return word[0].upper() if word else 'OTHER'
+
+
+@functools.lru_cache(maxsize=1024)
+def query_timer(sql: str) -> _HistogramChild:
+    """SQL 문장의 실행 시간을 기록할 히스토그램 (문장별로 캐시)"""
+    return SQLITE_QUERY_DURATION.labels(statement=statement_kind(sql))
+
+
+# ----------------------------------------------------------------------
+# 느린 호출 프로파일링
+
+class SlowCallProfiler:
+    """샘플링한 호출을 cProfile로 측정하고, 느린 호출의 요약만 보관합니다.
+
+    비동기 도구는 await 동안 같은 스레드에서 실행된 다른 코루틴도 함께 측정됩니다.
+    """
+
+    def __init__(self, enabled: bool = PROFILE_ENABLED, slow_ms: float = PROFILE_SLOW_MS,
+                 sample_rate: float = PROFILE_SAMPLE_RATE, keep: int = PROFILE_KEEP):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+        self.profiles: deque = deque(maxlen=keep)
+        # cProfile은 동시에 하나만 활성화할 수 있으므로 측정 중이면 다른 호출은 건너뜀
+        self._active = threading.Lock()
+
+    def configure(self, enabled: Optional[bool] = None, slow_ms: Optional[float] = None,
+                  sample_rate: Optional[float] = None) -> Dict[str, Any]:
+        if enabled is not None:
+            self.enabled = enabled
+        if slow_ms is not None:
+            self.slow_ms = slow_ms
+        if sample_rate is not None:
+            self.sample_rate = min(1.0, max(0.0, sample_rate))
+        return self.settings()
+
+    def settings(self) -> Dict[str, Any]:
+        return {'enabled': self.enabled, 'slow_ms': self.slow_ms, 'sample_rate': self.sample_rate,
+                'kept': len(self.profiles)}
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """이번 호출을 측정하면 시작된 Profile을, 아니면 None을 반환합니다."""
+        if not self.enabled or random.random() >= self.sample_rate:
+            return None
+        if not self._active.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # 다른 프로파일러가 이미 동작 중
+            self._active.release()
+            return None
+        return profile
+
+    def finish(self, profile: cProfile.Profile, tool: str, elapsed: float):
+        profile.disable()
+        self._active.release()
+        if elapsed * 1000 < self.slow_ms:
+            return
+        stream = io.StringIO()
+        pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        self.profiles.append({
+            'tool': tool,
+            'elapsed_ms': round(elapsed * 1000, 1),
+            'timestamp': time.time(),
+            'stats': stream.getvalue(),
+        })
+        PROFILED_CALLS.inc(tool=tool)
+
+    def recent(self, limit: int = 5, tool: Optional[str] = None) -> List[Dict[str, Any]]:
+        profiles = [profile for profile in reversed(self.profiles) if tool is None or profile['tool'] == tool]
+        return profiles[:limit]
+
+
+profiler = SlowCallProfiler()
+
+
+def configure_profiling(enabled: Optional[bool] = None, slow_ms: Optional[float] = None,
+                        sample_rate: Optional[float] = None) -> Dict[str, Any]:
+    return profiler.configure(enabled, slow_ms, sample_rate)
+
+
+# ----------------------------------------------------------------------
+# MCP 도구 계측
+
+def _is_error_result(result: Any) -> bool:
+    # 도구들은 예외 대신 {"error": ...}를 반환하는 경우가 많음
+    return isinstance(result, dict) and 'error' in result
+
+
+def instrument_tool(fn: Callable, name: Optional[str] = None) -> Callable:
+    """도구 함수를 감싸 실행 시간, 오류, 느린 호출 프로파일을 기록합니다.
+
+    functools.wraps로 시그니처를 보존하므로 FastMCP가 인자 스키마를 그대로 만듭니다.
+    """
+    tool = name or fn.__name__
+
+    def record(start: float, profile: Optional[cProfile.Profile], result: Any = None, error: bool = False):
+        elapsed = time.perf_counter() - start
+        TOOL_DURATION.observe(elapsed, tool=tool)
+        if error:
+            TOOL_ERRORS.inc(tool=tool, kind='exception')
+        elif _is_error_result(result):
+            TOOL_ERRORS.inc(tool=tool, kind='result')
+        if profile is not None:
+            profiler.finish(profile, tool, elapsed)
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            profile = profiler.start()
+            start = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException:
+                record(start, profile, error=True)
+                raise
+            record(start, profile, result)
+            return result
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profile = profiler.start()
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            record(start, profile, error=True)
+            raise
+        record(start, profile, result)
+        return result
+    return wrapper
@@ -0,0 +1,504 @@
+"""
+스키마 마이그레이션
+
+`schema_version` 테이블에 적용된 버전을 기록하고, 아직 적용되지 않은
+마이그레이션만 순서대로 실행합니다. 모든 단계는 여러 번 실행해도 안전하며,
+데이터를 삭제하지 않습니다. 이미 최신 버전인 데이터베이스에서는
+버전 조회 한 번으로 끝납니다.
+
+이미 배포된 마이그레이션은 언제 실행해도 같은 결과를 내야 하므로 앱 모듈(project_store,
+search_index 등)을 부르지 않고, 필요한 스키마와 로직을 그 시점의 모습 그대로 이 모듈에 둡니다.
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+SEED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'project_data')
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _v1_base_schema(conn: sqlite3.Connection):
+    """프로젝트 및 섹션 테이블"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS projects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_data TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    # 이전 init_db()가 만든 테이블에는 project_data 컬럼이 없음
+    if 'project_data' not in _columns(conn, 'projects'):
+        conn.execute("ALTER TABLE projects ADD COLUMN project_data TEXT")
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS basic_info (
+        project_id INTEGER PRIMARY KEY,
+        project_name TEXT,
+        duration TEXT,
+        team_size TEXT,
+        your_role TEXT,
+        main_objectives TEXT,
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS technical_info (
+        project_id INTEGER PRIMARY KEY,
+        frontend_tech TEXT,
+        backend_tech TEXT,
+        database TEXT,
+        deployment TEXT,
+        other_tools TEXT,
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS architecture_info (
+        project_id INTEGER PRIMARY KEY,
+        current_structure TEXT,
+        pain_points TEXT,
+        desired_improvements TEXT,
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS code_quality (
+        project_id INTEGER PRIMARY KEY,
+        debug_code TEXT,
+        duplications TEXT,
+        performance TEXT,
+        readability TEXT,
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS portfolio_goals (
+        project_id INTEGER PRIMARY KEY,
+        target_audience TEXT,
+        key_highlights TEXT,
+        personal_contributions TEXT,
+        unique_selling_points TEXT,
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS github_info (
+        project_id INTEGER PRIMARY KEY,
+        repository_url TEXT,
+        branch_structure TEXT,
+        contribution_stats TEXT,
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS refactoring_status (
+        project_id INTEGER PRIMARY KEY,
+        completed_tasks TEXT,
+        pending_tasks TEXT,
+        skipped_tasks TEXT,
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS documentation_status (
+        project_id INTEGER PRIMARY KEY,
+        readme_generated BOOLEAN,
+        created_at TIMESTAMP,
+        last_updated TIMESTAMP,
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+
+
+def _v2_seed_potless(conn: sqlite3.Connection):
+    """POTLESS 프로젝트 시드 데이터"""
+    # 같은 이름의 프로젝트가 이미 있으면 다시 넣지 않음
+    exists = conn.execute(
+        "SELECT 1 FROM projects WHERE json_extract(project_data, '$.projectInfo.basicInfo.projectName') = ?",
+        ('POTLESS',)
+    ).fetchone()
+    if exists:
+        return
+
+    with open(os.path.join(SEED_DIR, 'POTLESS', 'project.json'), 'r', encoding='utf-8') as f:
+        project_data = json.load(f)
+    now = datetime.now().isoformat()
+    project_data['timestamp'] = {'created': now, 'lastUpdated': now}
+    conn.execute("INSERT INTO projects (project_data) VALUES (?)", (json.dumps(project_data),))
+
+
+def _v3_issue_scan_state(conn: sqlite3.Connection):
+    """프로젝트별 이슈 스캔 위치 (증분 재개용)"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS issue_scan_state (
+        project_id INTEGER PRIMARY KEY,
+        github_url TEXT,
+        last_updated_at TEXT,
+        boundary_numbers TEXT,
+        scanned_count INTEGER DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+
+
+def _v4_project_revision(conn: sqlite3.Connection):
+    """프로젝트 변경 카운터 (렌더링 캐시 키)"""
+    # updated_at은 초 단위라 같은 초에 두 번 수정되면 구분되지 않음
+    if 'revision' not in _columns(conn, 'projects'):
+        conn.execute("ALTER TABLE projects ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+    conn.execute('''
+    CREATE TRIGGER IF NOT EXISTS projects_revision
+    AFTER UPDATE OF project_data, updated_at ON projects
+    BEGIN
+        UPDATE projects SET revision = revision + 1 WHERE id = NEW.id;
+    END
+    ''')
+
+
+# v5 시점의 섹션 -> (테이블, [(JSON 키, 컬럼, 값 종류)]). 이후 project_store.FIXED_SECTIONS가 바뀌어도
+# 이미 배포된 마이그레이션의 결과가 달라지지 않도록 그대로 고정해 둡니다.
+_V5_FIXED_SECTIONS: Dict[str, Tuple[str, List[Tuple[str, str, str]]]] = {
+    'projectInfo.basicInfo': ('basic_info', [
+        ('projectName', 'project_name', 'text'),
+        ('duration', 'duration', 'text'),
+        ('teamSize', 'team_size', 'text'),
+        ('yourRole', 'your_role', 'text'),
+        ('mainObjectives', 'main_objectives', 'json'),
+    ]),
+    'projectInfo.technicalInfo': ('technical_info', [
+        ('frontendTech', 'frontend_tech', 'json'),
+        ('backendTech', 'backend_tech', 'json'),
+        ('database', 'database', 'json'),
+        ('deployment', 'deployment', 'json'),
+        ('otherTools', 'other_tools', 'json'),
+    ]),
+    'projectInfo.architectureInfo': ('architecture_info', [
+        ('currentStructure', 'current_structure', 'text'),
+        ('painPoints', 'pain_points', 'json'),
+        ('desiredImprovements', 'desired_improvements', 'json'),
+    ]),
+    'projectInfo.codeQualityIssues': ('code_quality', [
+        ('debugCode', 'debug_code', 'json'),
+        ('duplications', 'duplications', 'json'),
+        ('performance', 'performance', 'json'),
+        ('readability', 'readability', 'json'),
+    ]),
+    'projectInfo.portfolioGoals': ('portfolio_goals', [
+        ('targetAudience', 'target_audience', 'text'),
+        ('keyHighlights', 'key_highlights', 'json'),
+        ('personalContributions', 'personal_contributions', 'json'),
+        ('uniqueSellingPoints', 'unique_selling_points', 'json'),
+    ]),
+    'projectInfo.githubInfo': ('github_info', [
+        ('repositoryUrl', 'repository_url', 'text'),
+        ('branchStructure', 'branch_structure', 'text'),
+        ('contributionStats', 'contribution_stats', 'text'),
+    ]),
+    'refactoringStatus': ('refactoring_status', [
+        ('completedTasks', 'completed_tasks', 'json'),
+        ('pendingTasks', 'pending_tasks', 'json'),
+        ('skippedTasks', 'skipped_tasks', 'json'),
+    ]),
+    'documentationStatus': ('documentation_status', [
+        ('readmeGenerated', 'readme_generated', 'bool'),
+        ('readmePath', 'readme_path', 'text'),
+        ('additionalDocs', 'additional_docs', 'json'),
+    ]),
+}
+
+
+def _json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _v5_save_document(conn: sqlite3.Connection, project_id: int, document: dict):
+    """v5 시점의 project_store.save_document()에서 검색 색인을 뺀 것"""
+    sections = []
+    for key, value in document.items():
+        if key == 'projectInfo' and isinstance(value, dict):
+            sections.extend((f"{key}.{sub}", sub_value) for sub, sub_value in value.items())
+        else:
+            sections.append((key, value))
+
+    for position, (path, data) in enumerate(sections):
+        spec = _V5_FIXED_SECTIONS.get(path)
+        # 컬럼에 담지 못해 project_sections에 둘 값 (없으면 행을 지움)
+        generic, extra = True, data
+        if spec is not None and isinstance(data, dict):
+            table, fields = spec
+            stored = {key for key, _, kind in fields
+                      if key in data and (kind == 'json' or not isinstance(data[key], (dict, list)))}
+            values = [(_json(data[key]) if kind == 'json' else data[key]) if key in stored else None
+                      for key, _, kind in fields]
+            conn.execute(
+                f"INSERT OR REPLACE INTO {table} (project_id, {', '.join(column for _, column, _ in fields)}) "
+                f"VALUES (?, {', '.join('?' for _ in fields)})",
+                [project_id, *values]
+            )
+            extra = {key: value for key, value in data.items() if key not in stored}
+            generic = bool(extra)
+            if path == 'projectInfo.technicalInfo':
+                conn.execute('DELETE FROM project_tech WHERE project_id = ?', (project_id,))
+                conn.executemany(
+                    'INSERT OR IGNORE INTO project_tech (project_id, category, name) VALUES (?, ?, ?)',
+                    [(project_id, category, str(name)) for category, names in data.items()
+                     if isinstance(names, list) for name in names if name]
+                )
+        elif spec is not None:
+            conn.execute(f"DELETE FROM {spec[0]} WHERE project_id = ?", (project_id,))
+
+        if not generic:
+            conn.execute('DELETE FROM project_sections WHERE project_id = ? AND path = ?', (project_id, path))
+        else:
+            conn.execute(
+                'INSERT OR REPLACE INTO project_sections (project_id, path, position, data) VALUES (?, ?, ?, ?)',
+                (project_id, path, position, _json(extra))
+            )
+
+
+def _v5_normalize_projects(conn: sqlite3.Connection):
+    """프로젝트 문서를 섹션 테이블로 정규화하고 이름/기술/날짜 색인 추가
+
+    앱 코드(project_store)가 나중에 바뀌어도 결과가 같도록 v5 시점의 저장 로직을 이 모듈에 고정해 둡니다.
+    """
+    if 'readme_path' not in _columns(conn, 'documentation_status'):
+        conn.execute("ALTER TABLE documentation_status ADD COLUMN readme_path TEXT")
+    if 'additional_docs' not in _columns(conn, 'documentation_status'):
+        conn.execute("ALTER TABLE documentation_status ADD COLUMN additional_docs TEXT")
+
+    # 템플릿에 전용 테이블이 없는 섹션과 추가 키 (경로별 JSON)
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS project_sections (
+        project_id INTEGER NOT NULL,
+        path TEXT NOT NULL,
+        position INTEGER NOT NULL DEFAULT 0,
+        data TEXT,
+        PRIMARY KEY (project_id, path),
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+    # 기술 스택 색인 (technicalInfo의 리스트 항목 한 개당 한 행)
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS project_tech (
+        project_id INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        name TEXT NOT NULL,
+        PRIMARY KEY (project_id, category, name),
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_project_tech_name ON project_tech(name COLLATE NOCASE, project_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_basic_info_name ON basic_info(project_name COLLATE NOCASE)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_projects_created_at ON projects(created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_projects_updated_at ON projects(updated_at)")
+
+    # 기존 JSON 문서를 섹션 테이블로 옮김. project_data는 더 이상 읽지 않지만 지우지 않고 남겨 둠
+    # (예전 update_project_info()가 남긴 섹션 행보다 문서가 우선)
+    rows = conn.execute("SELECT id, project_data FROM projects WHERE project_data IS NOT NULL").fetchall()
+    for project_id, project_data in rows:
+        try:
+            document = json.loads(project_data)
+        except ValueError:
+            continue
+        if isinstance(document, dict):
+            _v5_save_document(conn, project_id, document)
+
+
+# v6 시점의 검색 컬럼 (순서가 테이블 컬럼 순서)
+_V6_SEARCH_COLUMNS = ('name', 'tech', 'objectives', 'features', 'challenges', 'readme')
+
+
+def _v6_section(conn: sqlite3.Connection, project_id: int, path: str) -> dict:
+    """v5 테이블에서 섹션 하나를 읽습니다. (전용 테이블 컬럼 + project_sections의 추가 키)"""
+    table, fields = _V5_FIXED_SECTIONS[path]
+    section = {}
+    row = conn.execute(
+        f"SELECT {', '.join(column for _, column, _ in fields)} FROM {table} WHERE project_id = ?", (project_id,)
+    ).fetchone()
+    if row is not None:
+        section.update({key: json.loads(value) if kind == 'json' else value
+                        for (key, _, kind), value in zip(fields, row) if value is not None})
+    extra = conn.execute(
+        'SELECT data FROM project_sections WHERE project_id = ? AND path = ?', (project_id, path)
+    ).fetchone()
+    if extra is not None:
+        data = json.loads(extra[0])
+        if isinstance(data, dict):
+            section.update(data)
+    return section
+
+
+def _v6_join(*values) -> str:
+    parts = []
+    for value in values:
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value if item)
+        elif value:
+            parts.append(str(value))
+    return '\n'.join(parts)
+
+
+def _v6_search_index(conn: sqlite3.Connection):
+    """프로젝트 전문 검색 테이블 (FTS5)
+
+    테이블 정의와 색인 내용은 v6 시점의 search_index를 이 모듈에 고정해 둡니다.
+    trigram 토크나이저가 없는 SQLite(3.34 미만)는 unicode61을 사용합니다.
+    """
+    columns = ', '.join(_V6_SEARCH_COLUMNS)
+    try:
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS project_search USING fts5({columns}, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS project_search USING fts5({columns}, tokenize='unicode61')")
+
+    for (project_id,) in conn.execute("SELECT id FROM projects").fetchall():
+        basic = _v6_section(conn, project_id, 'projectInfo.basicInfo')
+        tech = _v6_section(conn, project_id, 'projectInfo.technicalInfo')
+        architecture = _v6_section(conn, project_id, 'projectInfo.architectureInfo')
+        goals = _v6_section(conn, project_id, 'projectInfo.portfolioGoals')
+        conn.execute('DELETE FROM project_search WHERE rowid = ?', (project_id,))
+        conn.execute(
+            f"INSERT INTO project_search (rowid, {columns}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (project_id,
+             _v6_join(basic.get('projectName')),
+             _v6_join(*tech.values()),
+             _v6_join(basic.get('mainObjectives')),
+             _v6_join(goals.get('keyHighlights'), goals.get('uniqueSellingPoints')),
+             _v6_join(architecture.get('painPoints'), architecture.get('desiredImprovements')),
+             '')
+        )
+
+
+def _v7_jobs(conn: sqlite3.Connection):
+    """백그라운드 작업 큐 (시각은 유닉스 시간)"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        dedupe_key TEXT,
+        params TEXT,
+        status TEXT NOT NULL DEFAULT 'queued',
+        progress REAL NOT NULL DEFAULT 0,
+        message TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL DEFAULT 3,
+        result TEXT,
+        error TEXT,
+        cancel_requested INTEGER NOT NULL DEFAULT 0,
+        worker TEXT,
+        created_at REAL NOT NULL,
+        available_at REAL NOT NULL,
+        started_at REAL,
+        heartbeat_at REAL,
+        finished_at REAL
+    )
+    ''')
+    # 같은 요청은 대기/실행 중인 작업 하나로 합침
+    conn.execute('''
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_dedupe ON jobs(dedupe_key)
+    WHERE status IN ('queued', 'running') AND dedupe_key IS NOT NULL
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, available_at)")
+
+
+def _v8_repo_sync_state(conn: sqlite3.Connection):
+    """프로젝트별 마지막 분석 HEAD SHA와 추적 파일 blob SHA (증분 재분석용)"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS repo_sync_state (
+        project_id INTEGER PRIMARY KEY,
+        github_url TEXT,
+        head_sha TEXT,
+        head_etag TEXT,
+        files TEXT,
+        issues_etag TEXT,
+        checked_at TIMESTAMP,
+        refreshed_at TIMESTAMP,
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+
+
+def _v9_issue_scan_scopes(conn: sqlite3.Connection):
+    """이슈 스캔 위치를 필터(state, labels)별로 저장
+
+    필터가 다르면 본 이슈도 다르므로 위치를 공유하면 라벨 필터 스캔 뒤의 전체 스캔이 그보다 오래된
+    이슈를 건너뜁니다. 기존 issue_scan_state 행은 어떤 필터로 스캔했는지 알 수 없어 옮기지 않고
+    (다음 스캔은 처음부터 읽음), 테이블은 지우지 않고 남겨 둡니다.
+    """
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS issue_scan_scopes (
+        project_id INTEGER NOT NULL,
+        scope TEXT NOT NULL,
+        github_url TEXT,
+        last_updated_at TEXT,
+        boundary_numbers TEXT,
+        scanned_count INTEGER DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (project_id, scope),
+        FOREIGN KEY (project_id) REFERENCES projects(id)
+    )
+    ''')
+
+
+# (버전, 설명, 적용 함수) - 항상 끝에만 추가합니다.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, '기본 스키마', _v1_base_schema),
+    (2, 'POTLESS 시드 데이터', _v2_seed_potless),
+    (3, '이슈 스캔 상태', _v3_issue_scan_state),
+    (4, '프로젝트 revision', _v4_project_revision),
+    (5, '프로젝트 정규화 및 색인', _v5_normalize_projects),
+    (6, '전문 검색 색인', _v6_search_index),
+    (7, '백그라운드 작업 큐', _v7_jobs),
+    (8, '저장소 변경 감지 상태', _v8_repo_sync_state),
+    (9, '필터별 이슈 스캔 상태', _v9_issue_scan_scopes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """적용된 최신 스키마 버전을 반환합니다. 테이블이 없으면 0"""
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """적용되지 않은 마이그레이션을 실행하고 최종 버전을 반환합니다."""
+    # 빠른 경로: 이미 최신이면 버전 조회 한 번으로 끝
+    if current_version(conn) >= LATEST_VERSION:
+        return LATEST_VERSION
+
+    # 여러 워커가 동시에 시작해도 한 프로세스만 마이그레이션하도록 쓰기 잠금을 먼저 잡음
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+        version = current_version(conn)
+        for target, description, step in MIGRATIONS:
+            if target <= version:
+                continue
+            step(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (target, description)
+            )
+            version = target
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return version
@@ -1,546 +1,209 @@
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
-import sqlite3
 from mcp.server.fastmcp import FastMCP
+import asyncio
+import hashlib
 import json
-from github import Github
 import re
-from pathlib import Path
 import os
 from dotenv import load_dotenv
-import markdown
-import jinja2
-import yaml
-import base64
-from fastapi import FastAPI, Response
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+
+from storage import get_pool
+import project_store
+import search_index
+import contribution_stats
+from repo_snapshot import RepoSnapshot
+import readme_parser
+import tech_classifier
+import issue_scanner
+import metrics
+import health
+import job_queue
+import repo_sync
+import serialization
+import serving
+from lazy_import import lazy_import
+
+# 도구를 처음 호출할 때 불러오는 모듈 (httpx, Jinja2 등 무거운 의존성)
+github_async = lazy_import('github_async')
+rendering = lazy_import('rendering')
 
 # 환경 변수 로드
 load_dotenv()
 
-# GitHub API 토큰 설정
-GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
-github = Github(GITHUB_TOKEN)
-
-# 프로젝트 정보를 위한 Pydantic 모델
-class ProjectMember(BaseModel):
+# 프로젝트 정보 레코드 (__slots__ 기반, serialization.dumps로 바로 직렬화)
+class ProjectMember(serialization.Record):
+    __slots__ = ('name', 'role', 'contributions')
     name: str
     role: str
     contributions: List[str]
 
-class Project(BaseModel):
+class Project(serialization.Record):
+    __slots__ = ('title', 'description', 'start_date', 'end_date', 'tech_stack', 'members',
+                 'github_url', 'deployment_url', 'key_features', 'challenges', 'solutions')
     title: str
     description: str
     start_date: datetime
     end_date: datetime
     tech_stack: List[str]
     members: List[ProjectMember]
-    github_url: Optional[str] = None
-    deployment_url: Optional[str] = None
+    github_url: Optional[str]
+    deployment_url: Optional[str]
     key_features: List[str]
     challenges: List[str]
     solutions: List[str]
+    _defaults = {'github_url': None, 'deployment_url': None}
+    _decoders = {
+        'start_date': datetime.fromisoformat,
+        'end_date': datetime.fromisoformat,
+        'members': serialization.records(ProjectMember),
+    }
 
-    def dict(self, *args, **kwargs):
-        d = super().dict(*args, **kwargs)
-        d['start_date'] = d['start_date'].isoformat()
-        d['end_date'] = d['end_date'].isoformat()
-        return d
+class InstrumentedFastMCP(FastMCP):
+    """등록하는 모든 도구를 metrics.instrument_tool과 동시 호출 제한(serving.limit_tool)으로 감싸는 FastMCP"""
 
-# MCP 서버 인스턴스 생성
-mcp = FastMCP("SSAFY Project Portfolio Server")
+    def add_tool(self, fn, name=None, *args, **kwargs):
+        return super().add_tool(serving.limit_tool(metrics.instrument_tool(fn, name), name), name, *args, **kwargs)
 
-# FastAPI 앱 생성
-app = FastAPI()
+# HTTP로 서빙 중이면 작업 큐는 앱 lifespan이 관리
+_http_serving = False
+
+@asynccontextmanager
+async def mcp_lifespan(server):
+    # HTTP 전송은 세션(stateless면 요청)마다 이 lifespan을 실행하므로 작업 큐를 건드리지 않음
+    if _http_serving:
+        yield {}
+        return
+    # 이전 프로세스가 끝내지 못한 작업을 이어서 실행
+    job_queue.get_queue().start()
+    try:
+        yield {}
+    finally:
+        await job_queue.get_queue().stop()
+        await github_async.close_async_client()
+
+# MCP 서버 인스턴스 생성
+mcp = InstrumentedFastMCP("SSAFY Project Portfolio Server", lifespan=mcp_lifespan)
 
 def load_template() -> dict:
     """Load the project information template."""
     with open('project_info_template.json', 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def init_db():
-    """데이터베이스 초기화"""
-    conn = sqlite3.connect('portfolio.db')
-    cursor = conn.cursor()
-    
-    # 기존 테이블들 삭제
-    cursor.execute("DROP TABLE IF EXISTS projects")
-    cursor.execute("DROP TABLE IF EXISTS basic_info")
-    cursor.execute("DROP TABLE IF EXISTS technical_info")
-    cursor.execute("DROP TABLE IF EXISTS architecture_info")
-    cursor.execute("DROP TABLE IF EXISTS code_quality")
-    cursor.execute("DROP TABLE IF EXISTS portfolio_goals")
-    cursor.execute("DROP TABLE IF EXISTS github_info")
-    cursor.execute("DROP TABLE IF EXISTS refactoring_status")
-    cursor.execute("DROP TABLE IF EXISTS documentation_status")
-    
-    # 프로젝트 기본 테이블
-    cursor.execute('''
-    CREATE TABLE projects (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    # 기본 정보 테이블
-    cursor.execute('''
-    CREATE TABLE basic_info (
-        project_id INTEGER PRIMARY KEY,
-        project_name TEXT,
-        duration TEXT,
-        team_size TEXT,
-        your_role TEXT,
-        main_objectives TEXT,
-        FOREIGN KEY (project_id) REFERENCES projects(id)
-    )
-    ''')
-    
-    # 기술 정보 테이블
-    cursor.execute('''
-    CREATE TABLE technical_info (
-        project_id INTEGER PRIMARY KEY,
-        frontend_tech TEXT,
-        backend_tech TEXT,
-        database TEXT,
-        deployment TEXT,
-        other_tools TEXT,
-        FOREIGN KEY (project_id) REFERENCES projects(id)
-    )
-    ''')
-    
-    # 아키텍처 정보 테이블
-    cursor.execute('''
-    CREATE TABLE architecture_info (
-        project_id INTEGER PRIMARY KEY,
-        current_structure TEXT,
-        pain_points TEXT,
-        desired_improvements TEXT,
-        FOREIGN KEY (project_id) REFERENCES projects(id)
-    )
-    ''')
-    
-    # 코드 품질 테이블
-    cursor.execute('''
-    CREATE TABLE code_quality (
-        project_id INTEGER PRIMARY KEY,
-        debug_code TEXT,
-        duplications TEXT,
-        performance TEXT,
-        readability TEXT,
-        FOREIGN KEY (project_id) REFERENCES projects(id)
-    )
-    ''')
-    
-    # 포트폴리오 목표 테이블
-    cursor.execute('''
-    CREATE TABLE portfolio_goals (
-        project_id INTEGER PRIMARY KEY,
-        target_audience TEXT,
-        key_highlights TEXT,
-        personal_contributions TEXT,
-        unique_selling_points TEXT,
-        FOREIGN KEY (project_id) REFERENCES projects(id)
-    )
-    ''')
-    
-    # GitHub 정보 테이블
-    cursor.execute('''
-    CREATE TABLE github_info (
-        project_id INTEGER PRIMARY KEY,
-        repository_url TEXT,
-        branch_structure TEXT,
-        contribution_stats TEXT,
-        FOREIGN KEY (project_id) REFERENCES projects(id)
-    )
-    ''')
-    
-    # 리팩토링 상태 테이블
-    cursor.execute('''
-    CREATE TABLE refactoring_status (
-        project_id INTEGER PRIMARY KEY,
-        completed_tasks TEXT,
-        pending_tasks TEXT,
-        skipped_tasks TEXT,
-        FOREIGN KEY (project_id) REFERENCES projects(id)
-    )
-    ''')
-    
-    # 문서화 상태 테이블
-    cursor.execute('''
-    CREATE TABLE documentation_status (
-        project_id INTEGER PRIMARY KEY,
-        readme_generated BOOLEAN,
-        created_at TIMESTAMP,
-        last_updated TIMESTAMP,
-        FOREIGN KEY (project_id) REFERENCES projects(id)
-    )
-    ''')
-    
-    conn.commit()
-    conn.close()
-
 def update_project_info(project_id, section, data):
-    """프로젝트 정보 업데이트"""
-    conn = sqlite3.connect('portfolio.db')
-    cursor = conn.cursor()
-    
-    # 섹션별 테이블 업데이트
-    if section == "basicInfo":
-        cursor.execute('''
-        INSERT OR REPLACE INTO basic_info 
-        (project_id, project_name, duration, team_size, your_role, main_objectives)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            project_id,
-            data.get('projectName', ''),
-            data.get('duration', ''),
-            data.get('teamSize', ''),
-            data.get('yourRole', ''),
-            json.dumps(data.get('mainObjectives', []))
-        ))
-    
-    elif section == "technicalInfo":
-        cursor.execute('''
-        INSERT OR REPLACE INTO technical_info 
-        (project_id, frontend_tech, backend_tech, database, deployment, other_tools)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            project_id,
-            json.dumps(data.get('frontendTech', [])),
-            json.dumps(data.get('backendTech', [])),
-            json.dumps(data.get('database', [])),
-            json.dumps(data.get('deployment', [])),
-            json.dumps(data.get('otherTools', []))
-        ))
-    
-    # ... 다른 섹션들에 대한 업데이트 로직 추가 ...
-    
-    # 프로젝트 업데이트 시간 갱신
-    cursor.execute('''
-    UPDATE projects 
-    SET updated_at = CURRENT_TIMESTAMP 
-    WHERE id = ?
-    ''', (project_id,))
-    
-    conn.commit()
-    conn.close()
-
-def get_project_info(project_id):
-    """프로젝트 정보 조회"""
-    conn = sqlite3.connect('portfolio.db')
-    cursor = conn.cursor()
-    
-    # 모든 섹션의 정보를 조회
-    project_info = {}
-    
-    # 기본 정보 조회
-    cursor.execute('SELECT * FROM basic_info WHERE project_id = ?', (project_id,))
-    basic_info = cursor.fetchone()
-    if basic_info:
-        project_info['basicInfo'] = {
-            'projectName': basic_info[1],
-            'duration': basic_info[2],
-            'teamSize': basic_info[3],
-            'yourRole': basic_info[4],
-            'mainObjectives': json.loads(basic_info[5])
-        }
-    
-    # 기술 정보 조회
-    cursor.execute('SELECT * FROM technical_info WHERE project_id = ?', (project_id,))
-    tech_info = cursor.fetchone()
-    if tech_info:
-        project_info['technicalInfo'] = {
-            'frontendTech': json.loads(tech_info[1]),
-            'backendTech': json.loads(tech_info[2]),
-            'database': json.loads(tech_info[3]),
-            'deployment': json.loads(tech_info[4]),
-            'otherTools': json.loads(tech_info[5])
-        }
-    
-    # ... 다른 섹션들에 대한 조회 로직 추가 ...
-    
-    conn.close()
-    return project_info
+    """프로젝트 정보 업데이트 (section: 'basicInfo', 'technicalInfo', 'refactoringStatus' 등)"""
+    with get_pool().transaction() as conn:
+        project_store.save_section(conn, project_id, section, data)
+        
+        # 프로젝트 업데이트 시간 갱신
+        conn.execute('''
+        UPDATE projects 
+        SET updated_at = CURRENT_TIMESTAMP 
+        WHERE id = ?
+        ''', (project_id,))
+    
+    rendering.get_render_cache().invalidate(project_id)
 
-# POTLESS 프로젝트 정보 초기화
-def init_potless_project():
-    project_data = {
-        'projectInfo': {
-            'basicInfo': {
-                'projectName': 'POTLESS',
-                'duration': '2024-04-08 ~ 2024-05-20',
-                'teamSize': '6명',
-                'yourRole': '팀장, 모바일 개발자, AI/ML 엔지니어',
-                'mainObjectives': [
-                    'AI 기반 포트홀 자동 탐지 시스템 개발',
-                    '구청 직원들의 실제 피드백을 반영한 기능 구현',
-                    '모바일 환경에 최적화된 AI 모델 개발'
-                ]
-            },
-            'technicalInfo': {
-                'frontendTech': ['Flutter', 'Dart'],
-                'backendTech': ['Python'],
-                'database': [],
-                'deployment': [],
-                'otherTools': ['TensorFlow/PyTorch', 'Jupyter Notebook', 'Tesla V100 GPU']
-            },
-            'architectureInfo': {
-                'currentStructure': '마이크로서비스 아키텍처',
-                'painPoints': ['AI 모델 통합, 특히 On-Device AI 구현'],
-                'desiredImprovements': []
-            },
-            'performance': {
-                'async_processing': {
-                    'isolate_parallel': {
-                        'description': 'Isolate를 활용한 병렬 처리',
-                        'details': '촬영-감지-업로드 작업을 각각 다른 isolate에 할당하여 처리'
-                    }
-                },
-                'ai_optimization': {
-                    'model_lightweight': {
-                        'description': 'AI 모델 경량화',
-                        'details': '모바일 환경에 적합한 모델 경량화 진행'
-                    }
-                }
-            },
-            'ai_development': {
-                'hyperparameter_tuning': {
-                    'description': '하이퍼파라미터 튜닝',
-                    'details': 'batch-epoch 수준의 기본적인 튜닝 진행'
-                },
-                'dataset_preprocessing': {
-                    'description': '데이터셋 전처리',
-                    'details': '포트홀 인식 개선을 위한 데이터셋 전처리 중점'
-                }
-            },
-            'project_management': {
-                'methodology': {
-                    'type': '애자일/스크럼',
-                    'details': {
-                        'sprint_meeting': '매주 월요일 스프린트 회의를 통한 주간 작업 계획 수립',
-                        'daily_scrum': '매일 스크럼을 통한 상황 공유',
-                        'user_feedback': '구청 직원들과의 정기적인 인터뷰를 통한 피드백 수집 및 반영'
-                    }
-                },
-                'feedback_cycle': {
-                    'description': '사용자 중심 피드백 사이클',
-                    'details': '각 인터뷰를 데드라인으로 설정하고, 개발 후 피드백을 받아 지속적인 개선 진행'
-                }
-            },
-            'collaboration_tools': {
-                'project_management': {
-                    'jira': {
-                        'description': '프로젝트 관리 및 이슈 트래킹',
-                        'usage': '스프린트 계획 및 작업 관리'
-                    }
-                },
-                'version_control': {
-                    'github': {
-                        'description': '코드 버전 관리',
-                        'usage': '소스 코드 관리 및 협업'
-                    }
-                },
-                'documentation': {
-                    'notion': {
-                        'description': '문서화 및 지식 공유',
-                        'usage': '프로젝트 문서 및 회의록 관리'
-                    }
-                },
-                'design': {
-                    'figma': {
-                        'description': 'UI/UX 디자인',
-                        'usage': '인터페이스 디자인 및 프로토타이핑'
-                    }
-                },
-                'communication': {
-                    'mattermost': {
-                        'description': '팀 커뮤니케이션',
-                        'usage': '일일 소통 및 정보 공유'
-                    }
-                }
-            },
-            'achievements': {
-                'technical_achievements': {
-                    'automation': {
-                        'description': '포트홀 자동 탐지 시스템',
-                        'details': 'AI 기반 자동 탐지 및 관리 서비스 구현'
-                    },
-                    'user_centric': {
-                        'description': '사용자 중심 기능 개발',
-                        'details': '구청 직원들의 실제 피드백을 반영한 기능 구현'
-                    }
-                },
-                'project_quality': {
-                    'completion': {
-                        'description': '높은 완성도',
-                        'details': '기술적, 기능적 측면에서 높은 완성도 달성'
-                    }
-                },
-                'awards': {
-                    'ssafy_competition': {
-                        'description': 'SSAFY 10기 자율 프로젝트 결선 발표회',
-                        'achievement': '전국 1등',
-                        'details': '전국 SSAFY 캠퍼스 중 최우수 프로젝트 선정'
-                    }
-                }
-            },
-            'personal_growth': {
-                'overall_growth': {
-                    'description': '전반적인 역량 향상',
-                    'areas': {
-                        'technical': 'AI 모델 개발 및 모바일 앱 개발 역량',
-                        'leadership': '팀장으로서의 리더십',
-                        'problem_solving': '기술적 문제 해결 능력',
-                        'communication': '팀원 및 이해관계자와의 커뮤니케이션',
-                        'project_management': '애자일 방식의 프로젝트 관리'
-                    }
-                }
-            }
-        },
-        'timestamp': {
-            'created': datetime.now().isoformat(),
-            'lastUpdated': datetime.now().isoformat()
-        }
-    }
-    
-    conn = sqlite3.connect('portfolio.db')
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO projects (project_data) VALUES (?)", (json.dumps(project_data),))
-    conn.commit()
-    conn.close()
+def load_project(project_id: int, sections: Optional[List[str]] = None) -> Optional[dict]:
+    """프로젝트 문서를 조회합니다. sections를 주면 해당 섹션만 읽습니다."""
+    return project_store.load_project(get_pool().connection(), project_id, sections)
 
-# 데이터베이스 초기화 및 POTLESS 프로젝트 정보 생성
-init_db()
-init_potless_project()
+# README 섹션 제목 패턴 (readme_parser.ReadmeIndex.find에 사용)
+TECH_STACK_TITLE = re.compile(r"tech\s*stack|기술\s*스택|사용\s*기술|technologies", re.IGNORECASE)
+FEATURE_TITLE = re.compile(r"주요\s*기능|features", re.IGNORECASE)
+# 도전 과제 섹션은 앞의 패턴부터 우선 적용
+CHALLENGE_TITLES = (
+    re.compile(r"기획\s*배경"),
+    re.compile(r"문제"),
+    re.compile(r"도전\s*과제"),
+)
+DEFAULT_SOLUTION = "해결 방안: AI 기술과 데이터 분석을 활용한 자동화된 포트홀 관리 시스템 구축"
 
-def extract_tech_stack(repo) -> List[str]:
+def extract_tech_stack(snapshot: RepoSnapshot) -> List[str]:
     """레포지토리에서 기술 스택을 추출합니다."""
-    tech_stack = set()
+    taxonomy = tech_classifier.get_taxonomy()
     
     # 1. 언어 정보에서 추출
-    languages = repo.get_languages()
-    tech_stack.update(languages.keys())
+    tech_stack = dict.fromkeys(snapshot.languages.keys())
     
-    # 2. README에서 기술 스택 추출
+    # 2. README의 기술 스택 섹션에서 분류표에 있는 기술을 추출
     try:
-        readme = repo.get_readme()
-        content = readme.decoded_content.decode('utf-8').lower()
-        
-        # 일반적인 기술 스택 섹션 패턴
-        stack_patterns = [
-            r"tech stack[:\s]*(.*?)(?=##|\Z)",
-            r"기술 스택[:\s]*(.*?)(?=##|\Z)",
-            r"사용 기술[:\s]*(.*?)(?=##|\Z)",
-            r"technologies[:\s]*(.*?)(?=##|\Z)"
-        ]
-        
-        for pattern in stack_patterns:
-            match = re.search(pattern, content, re.DOTALL)
-            if match:
-                # 기술 스택 텍스트에서 일반적인 기술 키워드 추출
-                tech_keywords = re.findall(r'`([^`]+)`|\*\*([^\*]+)\*\*|#\s*([^\n]+)|\b(react|vue|angular|node|python|java|spring|django|flask|mysql|postgresql|mongodb)\b', match.group(1), re.IGNORECASE)
-                for keyword_groups in tech_keywords:
-                    keyword = next((k for k in keyword_groups if k), None)
-                    if keyword:
-                        tech_stack.add(keyword.strip())
-    except:
-        pass
+        readme = snapshot.readme_index
+        section = readme.find(TECH_STACK_TITLE) if readme else None
+        if section:
+            tech_stack.update((name, None) for name, _ in taxonomy.find_in_text(readme.section_text(section)))
+    except Exception as e:
+        print(f"README 파싱 중 오류 발생: {str(e)}")
+    
+    # 3. 매니페스트의 의존성에서 추출
+    for package in tech_classifier.manifest_packages(snapshot.manifests):
+        tech_stack.update((name, None) for name, _ in taxonomy.classify_package(package))
     
     return list(tech_stack)
 
-def extract_features_and_challenges(repo) -> tuple[List[str], List[str], List[str]]:
+def extract_features_and_challenges(snapshot: RepoSnapshot) -> tuple[List[str], List[str], List[str]]:
     """레포지토리의 README에서 주요 기능과 도전 과제를 추출합니다."""
     features = []
     challenges = []
     solutions = []
     
     try:
-        readme = repo.get_readme()
-        content = readme.decoded_content.decode('utf-8')
+        readme = snapshot.readme_index
+        if readme is None:
+            return features, challenges, solutions
         
-        # 주요 기능 추출
-        feature_section = re.search(r'# 📕주요기능[^\n]*\n(.*?)(?=\n#|\Z)', content, re.IGNORECASE | re.DOTALL)
+        # 주요 기능: "1. 기능 이름" 형식의 하위 섹션과 그 글머리 기호 항목
+        feature_section = readme.find(FEATURE_TITLE)
         if feature_section:
-            section_text = feature_section.group(1)
-            # 번호가 매겨진 주요 기능 섹션 찾기
-            numbered_sections = re.finditer(r'###\s*(\d+)\.\s*([^\n]+)', section_text)
-            for section in numbered_sections:
-                section_title = section.group(2)
-                # 섹션 시작부터 다음 섹션이나 파일 끝까지의 내용 추출
-                section_content = section_text[section.end():].split('###')[0]
-                # 글머리 기호로 시작하는 상세 기능 추출
-                details = re.findall(r'[-\*]\s*([^\n]+)', section_content)
+            for section in readme.children(feature_section):
+                numbered = readme_parser.NUMBERED_TITLE_PATTERN.match(section.title)
+                if not numbered:
+                    continue
+                details = readme.bullets(section)
                 if details:
-                    features.append(f"{section_title}: {', '.join(details)}")
+                    features.append(f"{numbered.group(2)}: {', '.join(details)}")
                 else:
-                    features.append(section_title)
+                    features.append(numbered.group(2))
         
-        # 기획 배경 및 도전 과제 추출
-        challenge_patterns = [
-            r"# 🔎기획배경\s*(.*?)(?=\n#|\Z)",
-            r"문제[:\s]*(.*?)(?=##|\Z)",
-            r"도전 과제[:\s]*(.*?)(?=##|\Z)"
-        ]
-        
-        for pattern in challenge_patterns:
-            match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
-            if match:
-                challenge_text = match.group(1)
-                # 글머리 기호로 시작하는 항목 추출
-                items = re.findall(r'[-\*]\s*([^\n]+)', challenge_text)
-                if items:
-                    for item in items:
-                        challenges.append(item.strip())
-                        solutions.append("해결 방안: AI 기술과 데이터 분석을 활용한 자동화된 포트홀 관리 시스템 구축")
-                else:
-                    # 전체 텍스트를 하나의 도전 과제로 처리
-                    challenges.append(challenge_text.strip())
-                    solutions.append("해결 방안: AI 기술과 데이터 분석을 활용한 자동화된 포트홀 관리 시스템 구축")
-                break
+        # 기획 배경 및 도전 과제
+        for pattern in CHALLENGE_TITLES:
+            section = readme.find(pattern)
+            if not section:
+                continue
+            items = readme.bullets(section)
+            if not items:
+                # 전체 텍스트를 하나의 도전 과제로 처리
+                items = [readme.section_text(section).strip()]
+            for item in items:
+                challenges.append(item)
+                solutions.append(DEFAULT_SOLUTION)
+            break
     except Exception as e:
         print(f"README 파싱 중 오류 발생: {str(e)}")
     
     return features, challenges, solutions
 
-def extract_github_info(repo_url: str) -> dict:
-    """Extract available information from GitHub repository."""
+def extract_github_info(repo_url: str, snapshot: RepoSnapshot) -> dict:
+    """Extract available information from GitHub repository.
+
+    snapshot은 GITHUB_INFO_RESOURCES를 담아 github_async.fetch_snapshot()으로 가져온 스냅샷입니다.
+    """
     try:
-        match = re.match(r"https://github\.com/([^/]+)/([^/]+)", repo_url)
-        if not match:
-            return {}
-        
-        owner, repo_name = match.groups()
-        repo = github.get_repo(f"{owner}/{repo_name}")
-        
         # Extract basic repository information
+        stats = snapshot.contribution_stats
         github_info = {
             "repositoryUrl": repo_url,
-            "branchStructure": ", ".join([branch.name for branch in repo.get_branches()]),
-            "contributionStats": f"Total commits: {repo.get_commits().totalCount}"
-        }
-        
-        # Extract technical information from languages
-        languages = repo.get_languages()
-        tech_info = {
-            "frontendTech": [],
-            "backendTech": [],
-            "database": [],
-            "deployment": [],
-            "otherTools": []
+            "branchStructure": ", ".join(snapshot.branches),
+            "contributionStats": contribution_stats.format_summary(stats),
+            # 작성자별 커밋 수와 추가/삭제 줄 수
+            "contributors": stats["contributors"]
         }
         
-        # Categorize technologies
-        for lang in languages:
-            if lang.lower() in ['javascript', 'typescript', 'html', 'css', 'react', 'vue', 'angular']:
-                tech_info["frontendTech"].append(lang)
-            elif lang.lower() in ['python', 'java', 'go', 'ruby', 'php', 'node']:
-                tech_info["backendTech"].append(lang)
-            elif lang.lower() in ['sql', 'mysql', 'postgresql', 'mongodb']:
-                tech_info["database"].append(lang)
-            else:
-                tech_info["otherTools"].append(lang)
+        # 언어와 매니페스트 의존성을 분류표로 분류
+        tech_info = tech_classifier.get_taxonomy().classify(
+            snapshot.languages, tech_classifier.manifest_packages(snapshot.manifests)
+        )
         
         return {
             "githubInfo": github_info,
@@ -550,148 +213,577 @@ def extract_github_info(repo_url: str) -> dict:
         print(f"GitHub 정보 추출 중 오류 발생: {str(e)}")
         return {}
 
+# extract_github_info()가 사용하는 스냅샷 리소스
+GITHUB_INFO_RESOURCES = ('languages', 'branches', 'contribution_stats', 'manifests')
+
+def build_project_data(github_data: Optional[dict] = None) -> dict:
+    """템플릿에 GitHub 정보와 타임스탬프를 채운 프로젝트 문서를 만듭니다."""
+    template = load_template()
+    
+    if github_data:
+        template["projectInfo"]["githubInfo"] = github_data.get("githubInfo", {})
+        template["projectInfo"]["technicalInfo"].update(github_data.get("technicalInfo", {}))
+    
+    now = datetime.now().isoformat()
+    template["timestamp"]["created"] = now
+    template["timestamp"]["lastUpdated"] = now
+    return template
+
+def insert_project(document: dict) -> int:
+    """프로젝트 문서를 저장하고 ID를 반환합니다."""
+    with get_pool().transaction() as conn:
+        project_id = project_store.insert_project(conn, document)
+    rendering.get_render_cache().invalidate(project_id)
+    return project_id
+
+async def submit_job(kind: str, params: Dict[str, Any], dedupe_key: str, wait: float = 0) -> Dict[str, Any]:
+    """작업을 등록하고 wait초까지 기다린 뒤 작업 상태를 반환합니다. 그 안에 끝나면 결과도 포함합니다."""
+    queue = job_queue.get_queue()
+    queue.start()
+    job_id, deduplicated = queue.submit(kind, params, dedupe_key)
+    job = await queue.wait(job_id, wait) if wait and wait > 0 else queue.get(job_id)
+    response = {"job_id": job_id, "status": job["status"], "deduplicated": deduplicated}
+    result = queue.result(job_id)["result"]
+    # 끝나지 않았어도 실행 함수가 기록한 부분 결과가 있으면 포함
+    if job["status"] == "succeeded" or result is not None:
+        response["result"] = result
+    if job["status"] == "failed":
+        response["error"] = job["lastError"]
+    return response
+
+def dedupe_key(kind: str, full_name: str, **params) -> str:
+    """같은 저장소, 같은 인자의 요청을 하나의 작업으로 합치는 키"""
+    return f"{kind}:{full_name.lower()}:{json.dumps(params, sort_keys=True, ensure_ascii=False)}"
+
+@job_queue.handler('create_project_from_template')
+async def create_project_job(job: job_queue.JobContext, github_url: str) -> Dict[str, Any]:
+    job.report(0.1, "저장소 정보 수집 중", force=True)
+    snapshot = await github_async.fetch_snapshot(github_url, GITHUB_INFO_RESOURCES)
+    if snapshot is None:
+        raise job_queue.JobError("Invalid GitHub URL")
+    job.report(0.9, "프로젝트 저장 중", force=True)
+    return {"project_id": insert_project(build_project_data(extract_github_info(github_url, snapshot)))}
+
 @mcp.tool()
-def create_project_from_template(github_url: str = None) -> str:
-    """Create a new project entry using the template structure."""
+async def create_project_from_template(github_url: str = None, wait: float = 0) -> str:
+    """Create a new project entry using the template structure.
+
+    github_url을 주면 저장소 분석은 백그라운드 작업으로 실행되고 작업 ID를 바로 반환합니다.
+    wait초 안에 끝나면 생성된 프로젝트 ID를 반환합니다.
+    """
     try:
-        # Load template
-        template = load_template()
-        
-        # If GitHub URL is provided, extract available information
-        if github_url:
-            github_data = extract_github_info(github_url)
-            template["projectInfo"]["githubInfo"] = github_data.get("githubInfo", {})
-            template["projectInfo"]["technicalInfo"].update(github_data.get("technicalInfo", {}))
+        if not github_url:
+            project_id = insert_project(build_project_data())
+            return f"프로젝트 템플릿이 생성되었습니다. (ID: {project_id})\n필요한 정보를 입력해주세요."
         
-        # Set timestamps
-        now = datetime.now().isoformat()
-        template["timestamp"]["created"] = now
-        template["timestamp"]["lastUpdated"] = now
-        
-        # Save to database
-        conn = sqlite3.connect('portfolio.db')
-        c = conn.cursor()
-        c.execute('INSERT INTO projects (project_data) VALUES (?)',
-                 (json.dumps(template),))
-        project_id = c.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return f"프로젝트 템플릿이 생성되었습니다. (ID: {project_id})\n필요한 정보를 입력해주세요."
+        resolved = github_async.resolve(github_url)
+        if not resolved:
+            return "프로젝트 생성 중 오류 발생: Invalid GitHub URL"
+        full_name = resolved[1]
+        job = await submit_job('create_project_from_template', {"github_url": github_url},
+                               dedupe_key('create_project_from_template', full_name), wait)
+        if job["status"] == "succeeded":
+            return f"프로젝트 템플릿이 생성되었습니다. (ID: {job['result']['project_id']})\n필요한 정보를 입력해주세요."
+        if job["status"] == "failed":
+            return f"프로젝트 생성 중 오류 발생: {job['error']}"
+        return (f"프로젝트 생성 작업이 등록되었습니다. (작업 ID: {job['job_id']}, 상태: {job['status']})\n"
+                f"get_job_status로 진행 상황을, get_job_result로 생성된 프로젝트 ID를 확인하세요.")
     except Exception as e:
         return f"프로젝트 생성 중 오류 발생: {str(e)}"
 
+# 한 번에 처리할 수 있는 최대 저장소 수와 동시에 분석할 저장소 수
+BULK_MAX_REPOS = 200
+BULK_WORKERS = 4
+# 분석이 끝난 저장소를 이 개수만큼 모아 한 트랜잭션으로 저장
+BULK_CHUNK = 4
+
+@job_queue.handler('bulk_create_projects')
+async def bulk_create_projects_job(job: job_queue.JobContext, github_urls: List[str]) -> Dict[str, Any]:
+    """bulk_create_projects 작업: 저장소를 분석해 BULK_CHUNK개씩 저장하고 부분 결과로 기록합니다.
+
+    서버 종료나 재시도로 다시 실행되면 이미 저장한 저장소는 건너뛰고, 실패했던 저장소는 다시 분석합니다.
+    """
+    previous = job.partial_result() or {}
+    result = {"created": previous.get("created", []), "errors": [], "total": len(github_urls)}
+    created_urls = {item["github_url"] for item in result["created"]}
+    urls = [url for url in github_urls if url not in created_urls]
+    workers = asyncio.Semaphore(BULK_WORKERS)
+    pending = []
+    
+    async def analyze(url: str):
+        async with workers:
+            try:
+                snapshot = await github_async.fetch_snapshot(url, GITHUB_INFO_RESOURCES)
+                if snapshot is None:
+                    raise ValueError("Invalid GitHub URL")
+                return url, build_project_data(extract_github_info(url, snapshot)), None
+            except Exception as e:
+                return url, None, str(e)
+    
+    def flush():
+        """모아 둔 프로젝트를 저장하고, 같은 트랜잭션에서 부분 결과에 기록합니다."""
+        if not pending:
+            return
+        with get_pool().transaction() as conn:
+            project_ids = project_store.insert_projects(conn, [document for _, document in pending])
+            result["created"].extend({"github_url": url, "project_id": project_id}
+                                     for (url, _), project_id in zip(pending, project_ids))
+            job.save_partial(result, conn)
+        for project_id in project_ids:
+            rendering.get_render_cache().invalidate(project_id)
+        pending.clear()
+    
+    tasks = [asyncio.ensure_future(analyze(url)) for url in urls]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            url, document, error = await finished
+            if error:
+                result["errors"].append({"github_url": url, "error": error})
+                job.save_partial(result)
+            else:
+                pending.append((url, document))
+                if len(pending) >= BULK_CHUNK:
+                    flush()
+            done = len(result["created"]) + len(result["errors"]) + len(pending)
+            # 부분 결과를 기록했으면 진행률도 바로 맞춤
+            job.report(done / len(github_urls),
+                       f"[{done}/{len(github_urls)}] {url}: {'실패 - ' + error if error else '분석 완료'}",
+                       force=not pending)
+    finally:
+        # 취소되면 남은 분석도 멈춤
+        for task in tasks:
+            task.cancel()
+    flush()
+    return result
+
 @mcp.tool()
-def get_project_info(project_id: int) -> str:
-    """Get complete project information."""
+async def bulk_create_projects(github_urls: List[str] = None, owner: str = None, wait: float = 0) -> Dict[str, Any]:
+    """여러 GitHub 저장소(URL 목록 또는 조직/사용자 이름)로 프로젝트를 한 번에 생성합니다.
+
+    분석은 백그라운드 작업으로 실행되며 작업 ID(job_id)를 바로 반환합니다. 분석이 끝난 저장소는
+    BULK_CHUNK개씩 바로 저장되고, get_job_result의 result에 지금까지 생성된 프로젝트(created)와
+    실패한 저장소(errors)가 기록됩니다. get_job_status로 저장소별 진행 상황을 확인합니다.
+    wait초 안에 끝나면 전체 결과를, 아니면 그때까지의 부분 결과를 함께 반환합니다.
+    """
+    try:
+        urls = list(dict.fromkeys(github_urls or []))
+        if owner:
+            urls.extend(url for url in await github_async.list_repos(owner) if url not in urls)
+        if not urls:
+            return {"error": "github_urls 또는 owner를 입력해주세요."}
+        if len(urls) > BULK_MAX_REPOS:
+            return {"error": f"한 번에 최대 {BULK_MAX_REPOS}개의 저장소만 처리할 수 있습니다. (요청: {len(urls)}개)"}
+    except Exception as e:
+        return {"error": f"저장소 목록 조회 중 오류 발생: {str(e)}"}
+    
     try:
-        conn = sqlite3.connect('portfolio.db')
-        c = conn.cursor()
-        c.execute('SELECT project_data FROM projects WHERE id = ?', (project_id,))
-        result = c.fetchone()
-        conn.close()
+        batch = hashlib.sha256("\n".join(urls).encode()).hexdigest()
+        return await submit_job('bulk_create_projects', {"github_urls": urls},
+                                dedupe_key('bulk_create_projects', batch), wait)
+    except Exception as e:
+        return {"error": str(e)}
+
+@mcp.tool()
+def get_project_info(project_id: int, sections: List[str] = None, compact: bool = False) -> str:
+    """Get complete project information.
+
+    sections로 필요한 섹션만 조회할 수 있습니다. (예: ["basicInfo", "githubInfo"], ["projectInfo"])
+    compact=True면 들여쓰기 없는 JSON을 반환합니다 (POTLESS 기준 응답 크기가 약 25% 작아짐).
+    """
+    try:
+        project = load_project(project_id, sections)
         
-        if not result:
+        if project is None:
             return f"프로젝트 ID {project_id}를 찾을 수 없습니다."
         
-        return json.dumps(json.loads(result[0]), indent=2, ensure_ascii=False)
+        return serialization.dumps(project, indent=not compact)
     except Exception as e:
         return f"프로젝트 정보 조회 중 오류 발생: {str(e)}"
 
 @mcp.tool()
-def analyze_github_repo(github_url: str) -> Dict[str, Any]:
-    """GitHub 레포지토리를 분석하여 프로젝트 정보를 추출합니다."""
+def patch_project(project_id: int, operations: List[Dict[str, Any]], expected_updated_at: str = None,
+                  expected_revision: int = None) -> Dict[str, Any]:
+    """JSON Patch 형식의 연산 목록으로 프로젝트의 여러 섹션을 한 번에 부분 수정합니다.
+
+    operations 예: [{"op": "replace", "path": "/projectInfo/basicInfo/projectName", "value": "POTLESS"},
+                    {"op": "add", "path": "/refactoringStatus/completedTasks/-", "value": "로그 정리"}]
+    op는 add, replace, remove, test이며 path는 문서 기준 JSON Pointer입니다. 모든 연산은 한 트랜잭션으로
+    적용되고 하나라도 실패하면 아무것도 바뀌지 않습니다.
+    expected_updated_at 또는 expected_revision(list_projects 결과의 값)을 주면 그 사이 다른 수정이 있었을 때
+    conflict와 현재 값을 반환합니다. updated_at은 초 단위이므로 정확한 확인에는 revision을 쓰세요.
+    """
+    try:
+        with get_pool().transaction() as conn:
+            result = project_store.apply_patch(conn, project_id, operations,
+                                               expected_updated_at, expected_revision)
+    except project_store.PatchConflict as e:
+        return {"error": str(e), "conflict": True, "updated_at": e.updated_at, "revision": e.revision}
+    except Exception as e:
+        return {"error": f"프로젝트 수정 중 오류 발생: {str(e)}"}
+    if result is None:
+        return {"error": f"프로젝트 ID {project_id}를 찾을 수 없습니다."}
+    
+    rendering.get_render_cache().invalidate(project_id)
+    return {"project_id": project_id, **result}
+
+@mcp.tool()
+def list_projects(name: str = None, tech: str = None, updated_since: str = None,
+                  limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    """프로젝트 목록을 조회합니다.
+
+    name은 프로젝트 이름 접두어, tech는 기술 이름(대소문자 무시),
+    updated_since는 'YYYY-MM-DD HH:MM:SS' 형식의 최소 수정 시각입니다.
+    """
+    return project_store.find_projects(get_pool().connection(), name=name, tech=tech,
+                                       updated_since=updated_since, limit=limit, offset=offset)
+
+async def mine_issues(scan: issue_scanner.IssueScan, job: Optional[job_queue.JobContext] = None):
+    """이슈 제목으로 주요 기능과 도전 과제를 분류합니다. 도전 과제 이슈의 본문은 해결 방안으로 씁니다."""
+    features, challenges, solutions = [], [], []
+    async for issue in scan:
+        if job is not None:
+            job.report(message=f"이슈 {scan.scanned}건 스캔 중")
+        kind = issue_scanner.classify_issue(issue["title"])
+        if kind == 'feature':
+            features.append(issue["title"])
+        elif kind == 'challenge':
+            challenges.append(issue["title"])
+            if issue["body"]:
+                solutions.append(issue["body"][:issue_scanner.MAX_BODY_CHARS])
+    return features, challenges, solutions
+
+def readme_search_text(description: Optional[str], snapshot: RepoSnapshot) -> str:
+    """검색 색인에 넣는 README 텍스트 (설명, README의 주요 기능/도전 과제, 본문)"""
+    features, challenges, _ = extract_features_and_challenges(snapshot)
+    return "\n".join(filter(None, [description, *features, *challenges, snapshot.readme_text]))
+
+@job_queue.handler('analyze_github_repo')
+async def analyze_github_repo_job(
+    job: job_queue.JobContext,
+    github_url: str,
+    project_id: int = None,
+    issue_state: str = "all",
+    issue_labels: List[str] = None,
+    max_issues: int = issue_scanner.MAX_ITEMS,
+    issue_time_budget: float = issue_scanner.TIME_BUDGET
+) -> Dict[str, Any]:
+    """analyze_github_repo 작업: 저장소와 이슈를 분석해 프로젝트 정보를 반환합니다."""
+    resolved = github_async.resolve(github_url)
+    if not resolved:
+        raise job_queue.JobError("Invalid GitHub URL")
+    client, full_name = resolved
+
+    job.report(0.05, "README, 언어, 이슈 수집 중", force=True)
+    resume = issue_scanner.load_scan_state(project_id, issue_state, issue_labels) if project_id else {}
+    scan = issue_scanner.IssueScan(
+        client, full_name,
+        state=issue_state, labels=issue_labels,
+        max_items=max_issues, time_budget=issue_time_budget,
+        **resume
+    )
+    
+    # README, 언어와 이슈 스캔을 동시에 진행
+    snapshot, mined = await asyncio.gather(
+        client.fetch_snapshot(full_name, ('readme_text', 'languages', 'manifests')),
+        mine_issues(scan, job)
+    )
+    
+    job.report(0.9, "분석 결과 정리 중", force=True)
+    # 기본 정보 추출
+    project_info = {
+        "title": snapshot.info["name"],
+        "description": snapshot.info["description"],
+        "github_url": github_url,
+        "tech_stack": extract_tech_stack(snapshot),
+        "key_features": [],
+        "challenges": [],
+        "solutions": []
+    }
+    
+    # README 분석
+    features, challenges, solutions = extract_features_and_challenges(snapshot)
+    project_info["key_features"].extend(features)
+    project_info["challenges"].extend(challenges)
+    project_info["solutions"].extend(solutions)
+    
+    # 이슈 분석
+    project_info["key_features"].extend(mined[0])
+    project_info["challenges"].extend(mined[1])
+    project_info["solutions"].extend(mined[2])
+    project_info["issue_scan"] = scan.summary()
+    
+    if project_id:
+        issue_scanner.save_scan_state(project_id, github_url, scan)
+        # README에서 뽑은 내용을 검색 색인에 반영
+        with get_pool().transaction() as conn:
+            search_index.set_readme_text(conn, project_id, readme_search_text(snapshot.info["description"], snapshot))
+    
+    return project_info
+
+@mcp.tool()
+async def analyze_github_repo(
+    github_url: str,
+    project_id: int = None,
+    issue_state: str = "all",
+    issue_labels: List[str] = None,
+    max_issues: int = issue_scanner.MAX_ITEMS,
+    issue_time_budget: float = issue_scanner.TIME_BUDGET,
+    wait: float = 0
+) -> Dict[str, Any]:
+    """GitHub 레포지토리를 분석하여 프로젝트 정보를 추출합니다.
+
+    분석은 백그라운드 작업으로 실행되며 작업 ID(job_id)를 바로 반환합니다.
+    get_job_status로 진행 상황을, get_job_result로 결과를 조회합니다.
+    wait초 안에 끝나면 결과(result)를 함께 반환하며, 같은 요청이 이미 진행 중이면 그 작업을 반환합니다.
+
+    이슈는 스트리밍으로 스캔하며 max_issues 건 또는 issue_time_budget 초에서 멈춥니다.
+    project_id를 주면 같은 필터(issue_state, issue_labels)로 한 지난 스캔 이후 수정된 이슈만 분석하고
+    위치를 필터별로 저장합니다.
+    github_url에 로컬 클론 경로나 file:// URL을 주면 GitHub API 없이 git 저장소에서 분석합니다 (LOCAL_REPO_ROOTS 아래만).
+    """
     try:
-        # GitHub URL에서 owner와 repo 추출
-        match = re.match(r'https://github.com/([^/]+)/([^/]+)', github_url)
-        if not match:
+        resolved = github_async.resolve(github_url)
+        if not resolved:
             return {"error": "Invalid GitHub URL"}
+        full_name = resolved[1]
         
-        owner, repo_name = match.groups()
-        repo = github.get_repo(f"{owner}/{repo_name}")
-        
-        # 기본 정보 추출
-        project_info = {
-            "title": repo.name,
-            "description": repo.description,
-            "github_url": github_url,
-            "tech_stack": extract_tech_stack(repo),
-            "key_features": [],
-            "challenges": [],
-            "solutions": []
+        params = {
+            "project_id": project_id,
+            "issue_state": issue_state,
+            "issue_labels": issue_labels,
+            "max_issues": max_issues,
+            "issue_time_budget": issue_time_budget,
         }
+        return await submit_job('analyze_github_repo', {"github_url": github_url, **params},
+                                dedupe_key('analyze_github_repo', full_name, **params), wait)
+    except Exception as e:
+        return {"error": str(e)}
+
+@job_queue.handler('refresh_project')
+async def refresh_project_job(job: job_queue.JobContext, project_id: int, include_issues: bool = True) -> Dict[str, Any]:
+    """refresh_project 작업: 마지막 분석 이후 바뀐 부분만 다시 추출합니다."""
+    document = load_project(project_id, ["githubInfo", "technicalInfo"])
+    if document is None:
+        raise job_queue.JobError(f"프로젝트 ID {project_id}를 찾을 수 없습니다.")
+    project_info = document.get("projectInfo", {})
+    github_info = dict(project_info.get("githubInfo") or {})
+    tech_info = dict(project_info.get("technicalInfo") or {})
+    github_url = github_info.get("repositoryUrl")
+    resolved = github_async.resolve(github_url) if github_url else None
+    if not resolved:
+        raise job_queue.JobError("프로젝트에 GitHub 저장소 URL(githubInfo.repositoryUrl)이 없습니다.")
+    
+    client, full_name = resolved
+    # 변경 감지와 재스캔은 필터 없는 스캔(state='all')의 위치를 이어 씀
+    scan_state = issue_scanner.load_scan_state(project_id)
+    job.report(0.1, "변경 확인 중", force=True)
+    changes = await repo_sync.detect_changes(client, full_name, repo_sync.load_state(project_id),
+                                             scan_state.get("since"), include_issues)
+    result = {"project_id": project_id, "changes": changes.summary()}
+    sections = {}
+    search_text = None
+    
+    if changes.head_changed:
+        job.report(0.3, "코드 변경 분석 중", force=True)
         
-        # README 분석
-        try:
-            readme = repo.get_readme()
-            content = base64.b64decode(readme.content).decode('utf-8')
-            project_info.update(analyze_readme(content))
-        except:
-            pass
+        async def fetch_repo_stats():
+            # 캐시 TTL이 남아 있어도 새 HEAD 기준 값을 받도록 재검증 (바뀌지 않았으면 304)
+            with github_async.revalidating():
+                return await asyncio.gather(
+                    client.get_languages(full_name),
+                    client.get_branches(full_name),
+                    client.get_contribution_stats(full_name),
+                )
         
-        # 이슈 분석
-        issues = repo.get_issues(state='all')
-        for issue in issues:
-            if "feature" in issue.title.lower() or "기능" in issue.title:
-                project_info["key_features"].append(issue.title)
-            elif "challenge" in issue.title.lower() or "문제" in issue.title:
-                project_info["challenges"].append(issue.title)
-                if issue.body:
-                    project_info["solutions"].append(issue.body)
+        # blob은 SHA로 조회하므로 바뀌지 않은 매니페스트는 캐시에서 읽음
+        (languages, branches, stats), manifests = await asyncio.gather(
+            fetch_repo_stats(), client.get_manifests(full_name, changes.files)
+        )
+        new_github_info = {**github_info,
+                           "branchStructure": ", ".join(branches),
+                           "contributionStats": contribution_stats.format_summary(stats),
+                           "contributors": stats["contributors"]}
+        new_tech_info = {**tech_info, **tech_classifier.get_taxonomy().classify(
+            languages, tech_classifier.manifest_packages(manifests))}
+        if new_github_info != github_info:
+            sections["githubInfo"] = new_github_info
+        if new_tech_info != tech_info:
+            sections["technicalInfo"] = new_tech_info
         
-        return project_info
+        if changes.readme_changed:
+            search_text = ""
+            if changes.readme_path:
+                readme_text, repo = await asyncio.gather(
+                    client.get_blob_text(full_name, changes.files[changes.readme_path]),
+                    client.get_repo(full_name),
+                )
+                search_text = readme_search_text(repo["description"], RepoSnapshot.preloaded(readme_text=readme_text))
+    
+    if changes.issues_changed:
+        job.report(0.6, "새 이슈 분석 중", force=True)
+        scan = issue_scanner.IssueScan(client, full_name, **scan_state)
+        features, challenges, _ = await mine_issues(scan, job)
+        issue_scanner.save_scan_state(project_id, github_url, scan)
+        if scan.stop_reason:
+            # 남은 이슈가 있으므로 다음 확인에서 304로 건너뛰지 않게 함
+            changes.issues_etag = None
+        result["issues"] = {**scan.summary(), "features": features, "challenges": challenges}
+    
+    job.report(0.9, "변경 내용 저장 중", force=True)
+    with get_pool().transaction() as conn:
+        for section, data in sections.items():
+            project_store.save_section(conn, project_id, section, data)
+        if sections:
+            conn.execute("UPDATE projects SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (project_id,))
+        if search_text is not None:
+            search_index.set_readme_text(conn, project_id, search_text)
+        repo_sync.save_state(conn, project_id, github_url, changes)
+    if sections:
+        rendering.get_render_cache().invalidate(project_id)
+    
+    result["updated"] = list(sections)
+    if search_text is not None:
+        result["updated"].append("searchIndex")
+    if changes.issues_changed:
+        result["updated"].append("issueScan")
+    return result
+
+@mcp.tool()
+async def refresh_project(project_id: int, include_issues: bool = True, wait: float = 30) -> Dict[str, Any]:
+    """프로젝트의 GitHub 저장소에서 마지막 분석 이후 바뀐 부분만 다시 분석해 갱신합니다.
+
+    기본 브랜치 HEAD SHA, README/매니페스트 blob SHA, 이슈 수정 시각을 지난번 값과 비교합니다.
+    바뀌지 않은 저장소는 조건부 요청(304)만 보내며, 처음 호출하면 전체를 분석해 기준 값을 저장합니다.
+    결과의 changes는 바뀐 부분, updated는 갱신한 섹션입니다. wait초 안에 끝나지 않으면 작업 ID를 반환합니다.
+    """
+    try:
+        return await submit_job('refresh_project', {"project_id": project_id, "include_issues": include_issues},
+                                dedupe_key('refresh_project', str(project_id), include_issues=include_issues), wait)
     except Exception as e:
         return {"error": str(e)}
 
+@mcp.tool()
+def get_job_status(job_id: int) -> Dict[str, Any]:
+    """백그라운드 작업의 상태, 진행률, 시도 횟수와 마지막 오류(lastError)를 조회합니다.
+
+    status는 queued, running, succeeded, failed, cancelled 중 하나입니다.
+    """
+    job = job_queue.get_queue().get(job_id)
+    if job is None:
+        return {"error": f"작업 ID {job_id}를 찾을 수 없습니다."}
+    return job
+
+@mcp.tool()
+def get_job_result(job_id: int) -> Dict[str, Any]:
+    """끝난 백그라운드 작업의 결과를 조회합니다.
+
+    아직 진행 중이면 result는 null이며, 부분 결과를 기록하는 작업(bulk_create_projects)은 지금까지의 결과입니다.
+    """
+    result = job_queue.get_queue().result(job_id)
+    if result is None:
+        return {"error": f"작업 ID {job_id}를 찾을 수 없습니다."}
+    return result
+
+@mcp.tool()
+def cancel_job(job_id: int) -> Dict[str, Any]:
+    """대기 중이거나 실행 중인 백그라운드 작업을 취소합니다."""
+    job = job_queue.get_queue().cancel(job_id)
+    if job is None:
+        return {"error": f"작업 ID {job_id}를 찾을 수 없습니다."}
+    return job
+
+@mcp.tool()
+def search_projects(query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+    """프로젝트 이름, 목표, 주요 기능, 도전 과제, 기술 스택, README 내용에서 검색합니다.
+
+    공백으로 나눈 모든 단어를 포함하는 프로젝트를 관련도 순으로 반환합니다.
+    단어가 모두 3글자 미만이면 색인을 쓸 수 없어 관련도(score) 없이 프로젝트 이름 순으로 반환합니다.
+    total은 전체 결과 수이며, limit/offset으로 페이지를 나눠 조회합니다.
+    """
+    try:
+        return search_index.search(get_pool().connection(), query, limit=limit, offset=offset)
+    except Exception as e:
+        return {"error": f"프로젝트 검색 중 오류 발생: {str(e)}"}
+
+# 포트폴리오 형식별 템플릿 (templates/ 기준)
+PORTFOLIO_TEMPLATES = {
+    "markdown": "portfolio.md.j2",
+}
+
+# 자소서 섹션 (templates/resume/<섹션>.j2)
+RESUME_SECTIONS = ("motivation", "contribution", "challenge")
+
+# 포트폴리오/자소서 렌더링에 필요한 섹션
+RENDER_SECTIONS = ("basicInfo", "technicalInfo", "architectureInfo", "portfolioGoals", "githubInfo")
+
+def build_render_context(document: dict) -> dict:
+    """프로젝트 문서를 템플릿이 사용하는 project 변수(Project 모델 필드)로 변환합니다."""
+    info = document.get("projectInfo", {})
+    basic = info.get("basicInfo", {})
+    architecture = info.get("architectureInfo", {})
+    goals = info.get("portfolioGoals", {})
+    
+    tech_stack = []
+    for techs in info.get("technicalInfo", {}).values():
+        if isinstance(techs, list):
+            tech_stack.extend(tech for tech in techs if tech not in tech_stack)
+    
+    members = []
+    if basic.get("yourRole"):
+        members.append({
+            "name": "본인",
+            "role": basic["yourRole"],
+            "contributions": goals.get("personalContributions", [])
+        })
+    # GitHub 기여 통계의 작성자별 커밋/줄 수
+    for author in info.get("githubInfo", {}).get("contributors") or []:
+        members.append({
+            "name": author["login"],
+            "role": "contributor",
+            "contributions": [f"커밋 {author['commits']}개 (+{author['additions']} / -{author['deletions']}줄)"]
+        })
+    
+    return {
+        "title": basic.get("projectName", ""),
+        "description": "\n".join(basic.get("mainObjectives", [])),
+        "github_url": info.get("githubInfo", {}).get("repositoryUrl"),
+        "tech_stack": tech_stack,
+        "key_features": goals.get("keyHighlights", []),
+        "challenges": architecture.get("painPoints", []),
+        "solutions": architecture.get("desiredImprovements", []),
+        "members": members
+    }
+
+def render_project(project_id: int, template_name: str) -> Optional[str]:
+    """프로젝트를 템플릿으로 렌더링합니다. 같은 리비전의 결과는 캐시에서 반환합니다."""
+    row = get_pool().fetchone('SELECT updated_at, revision FROM projects WHERE id = ?', (project_id,))
+    if not row:
+        return None
+    
+    key = (project_id, row[0], row[1], template_name, rendering.get_renderer().version(template_name))
+    return rendering.get_render_cache().get_or_render(
+        key, lambda: rendering.render(
+            template_name, project=build_render_context(load_project(project_id, RENDER_SECTIONS) or {})
+        )
+    )
+
 @mcp.tool()
 def generate_portfolio(project_id: int, format: str = "markdown") -> str:
     """프로젝트 정보를 기반으로 포트폴리오를 생성합니다."""
-    project_info = get_project_info(project_id)
-    if not project_info:
-        return "Project not found"
+    template_name = PORTFOLIO_TEMPLATES.get(format)
+    if not template_name:
+        return "Unsupported format"
     
-    if format == "markdown":
-        template = """
-# {{ project.title }}
-
-## 프로젝트 개요
-{{ project.description }}
-
-## 기술 스택
-{% for tech in project.tech_stack %}
-- {{ tech }}
-{% endfor %}
-
-## 주요 기능
-{% for feature in project.key_features %}
-- {{ feature }}
-{% endfor %}
-
-## 도전 과제와 해결 방법
-{% for challenge, solution in zip(project.challenges, project.solutions) %}
-### {{ challenge }}
-{{ solution }}
-{% endfor %}
-
-## 팀 구성
-{% for member in project.members %}
-### {{ member.name }} ({{ member.role }})
-{% for contribution in member.contributions %}
-- {{ contribution }}
-{% endfor %}
-{% endfor %}
-"""
-        env = jinja2.Environment()
-        template = env.from_string(template)
-        return template.render(project=project_info)
-    
-    return "Unsupported format"
+    rendered = render_project(project_id, template_name)
+    if rendered is None:
+        return "Project not found"
+    return rendered
 
 @mcp.tool()
 def conduct_project_interview(project_id: int) -> Dict[str, Any]:
     """프로젝트에 대한 사용자 인터뷰를 진행합니다."""
-    project_info = get_project_info(project_id)
-    if not project_info:
+    project_info = load_project(project_id)
+    if project_info is None:
         return {"error": "Project not found"}
     
     interview_questions = [
@@ -717,62 +809,108 @@ def conduct_project_interview(project_id: int) -> Dict[str, Any]:
 @mcp.tool()
 def generate_resume_section(project_id: int, section_type: str) -> str:
     """프로젝트 정보를 기반으로 자소서 섹션을 생성합니다."""
-    project_info = get_project_info(project_id)
-    if not project_info:
-        return "Project not found"
-    
-    templates = {
-        "motivation": """
-프로젝트 동기:
-{{ project.description }}
-
-이 프로젝트를 통해 {{ project.tech_stack|join(', ') }} 등의 기술을 활용하여 
-{{ project.key_features|join(', ') }}와 같은 기능을 구현하고자 했습니다.
-""",
-        "contribution": """
-주요 기여:
-{% for member in project.members %}
-{% if member.role == 'lead' or member.role == 'developer' %}
-- {{ member.name }}님은 {{ member.contributions|join(', ') }}를 담당했습니다.
-{% endif %}
-{% endfor %}
-""",
-        "challenge": """
-도전과 극복:
-{% for challenge, solution in zip(project.challenges, project.solutions) %}
-{{ challenge }}라는 문제에 직면했을 때, {{ solution }}라는 해결책을 제시했습니다.
-{% endfor %}
-"""
-    }
-    
-    if section_type not in templates:
+    if section_type not in RESUME_SECTIONS:
         return "Unsupported section type"
     
-    env = jinja2.Environment()
-    template = env.from_string(templates[section_type])
-    return template.render(project=project_info)
+    rendered = render_project(project_id, f"resume/{section_type}.j2")
+    if rendered is None:
+        return "Project not found"
+    return rendered
+
+async def liveness_check():
+    """liveness 프로브: 프로세스 안의 상태만 확인합니다."""
+    from fastapi.responses import JSONResponse
+    status_code, body = health.liveness()
+    return JSONResponse(status_code=status_code, content=body)
 
-@app.get("/health")
 async def health_check():
-    """서버 상태 확인을 위한 health check 엔드포인트"""
-    try:
-        # 데이터베이스 연결 확인
-        conn = sqlite3.connect('portfolio.db')
-        conn.close()
+    """readiness 프로브: SQLite ping과 백그라운드에서 캐시된 GitHub 상태를 확인합니다.
+
+    GitHub API는 호출하지 않으므로 프로브가 rate limit을 쓰지 않습니다.
+    """
+    from fastapi.responses import JSONResponse
+    status_code, body = health.readiness()
+    return JSONResponse(status_code=status_code, content=body)
+
+@mcp.tool()
+def configure_profiling(enabled: bool = None, slow_ms: float = None, sample_rate: float = None) -> Dict[str, Any]:
+    """느린 도구 호출의 cProfile 샘플링을 켜거나 끄고 기준을 바꿉니다.
+
+    sample_rate 비율의 호출을 측정해 slow_ms 이상 걸린 호출의 프로파일만 보관합니다.
+    인자를 모두 생략하면 현재 설정을 반환합니다.
+    """
+    return metrics.configure_profiling(enabled, slow_ms, sample_rate)
+
+@mcp.tool()
+def get_slow_call_profiles(limit: int = 5, tool: str = None) -> List[Dict[str, Any]]:
+    """최근 보관된 느린 호출 프로파일 (누적 시간 상위 함수 요약)"""
+    return metrics.profiler.recent(limit, tool)
+
+async def metrics_endpoint():
+    """Prometheus 텍스트 형식의 지표"""
+    from fastapi.responses import Response
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+_app = None
+
+def get_app():
+    """health check, 지표, MCP HTTP 전송(/mcp, /sse)을 서빙하는 FastAPI 앱을 반환합니다.
+
+    fastapi는 이때 처음 불러옵니다.
+    """
+    global _app
+    if _app is None:
+        from fastapi import FastAPI
         
-        # GitHub API 연결 확인
-        github.get_user()
+        # 세션 관리자는 streamable_http_app()을 처음 호출할 때 만들어지므로 설정을 먼저 바꿈
+        mcp.settings.stateless_http = serving.MCP_STATELESS_HTTP
+        mcp_routes = list(mcp.streamable_http_app().routes)
+        if serving.MCP_SSE:
+            mcp_routes.extend(mcp.sse_app().routes)
         
-        return JSONResponse(
-            status_code=200,
-            content={"status": "healthy", "timestamp": datetime.now().isoformat()}
-        )
-    except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={"status": "unhealthy", "error": str(e)}
-        )
+        @asynccontextmanager
+        async def lifespan(app):
+            global _http_serving
+            _http_serving = True
+            # GitHub 상태는 프로브가 아니라 백그라운드 작업이 갱신
+            health.github_status.start()
+            job_queue.get_queue().start()
+            try:
+                async with mcp.session_manager.run():
+                    yield
+            finally:
+                await job_queue.get_queue().stop()
+                await health.github_status.stop()
+                await github_async.close_async_client()
+        
+        app = FastAPI(lifespan=lifespan)
+        app.get("/health")(health_check)
+        app.get("/health/live")(liveness_check)
+        app.get("/health/ready")(health_check)
+        app.get("/metrics")(metrics_endpoint)
+        app.router.routes.extend(mcp_routes)
+        _app = app
+    return _app
+
+def __getattr__(name):
+    # `uvicorn project_portfolio_server:app` 처럼 모듈 속성으로 접근하는 경우
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="SSAFY Project Portfolio MCP Server")
+    parser.add_argument("--transport", choices=("http", "stdio"), default=os.getenv("MCP_TRANSPORT", "http"),
+                        help="http: FastAPI + MCP streamable HTTP/SSE (기본), stdio: 클라이언트 하위 프로세스")
+    parser.add_argument("--host", default=serving.HTTP_HOST)
+    parser.add_argument("--port", type=int, default=serving.HTTP_PORT)
+    parser.add_argument("--workers", type=int, default=serving.HTTP_WORKERS)
+    args = parser.parse_args()
+    
+    if args.transport == "stdio":
+        mcp.run()
+    else:
+        serving.serve(get_app() if args.workers == 1 else None, "project_portfolio_server:app",
+                      host=args.host, port=args.port, workers=args.workers)
@@ -0,0 +1,587 @@
+"""
+프로젝트 관계형 저장소
+
+프로젝트 문서(project_info_template.json 구조)를 섹션별 테이블에 나눠 저장하고,
+필요한 섹션만 골라 다시 조립합니다.
+
+- 템플릿에 정의된 섹션은 전용 테이블(basic_info, technical_info, ...)에 컬럼 단위로 저장합니다.
+  리스트 값은 JSON 문자열로 저장합니다.
+- 템플릿에 없는 섹션(예: POTLESS의 performance, timestamp)과 전용 섹션의 추가 키는
+  project_sections 테이블에 경로별 JSON으로 저장합니다.
+- 기술 스택은 project_tech 테이블에 한 행씩 색인해 기술 이름으로 프로젝트를 찾을 수 있습니다.
+- 검색 대상 섹션이 바뀌면 search_index의 전문 검색 행도 같은 트랜잭션에서 다시 씁니다.
+- apply_patch는 JSON Patch 연산을 섹션을 통째로 다시 쓰지 않고 SQLite JSON 함수로 그 자리에서 적용합니다.
+
+모든 함수는 호출자가 넘긴 커넥션(트랜잭션) 안에서 동작합니다.
+"""
+import json
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import search_index
+import serialization
+
+# 섹션 경로 -> (테이블, [(JSON 키, 컬럼, 값 종류)])
+# 값 종류: 'text'는 그대로, 'json'은 JSON 문자열, 'bool'은 0/1로 저장
+FIXED_SECTIONS: Dict[str, Tuple[str, List[Tuple[str, str, str]]]] = {
+    'projectInfo.basicInfo': ('basic_info', [
+        ('projectName', 'project_name', 'text'),
+        ('duration', 'duration', 'text'),
+        ('teamSize', 'team_size', 'text'),
+        ('yourRole', 'your_role', 'text'),
+        ('mainObjectives', 'main_objectives', 'json'),
+    ]),
+    'projectInfo.technicalInfo': ('technical_info', [
+        ('frontendTech', 'frontend_tech', 'json'),
+        ('backendTech', 'backend_tech', 'json'),
+        ('database', 'database', 'json'),
+        ('deployment', 'deployment', 'json'),
+        ('otherTools', 'other_tools', 'json'),
+    ]),
+    'projectInfo.architectureInfo': ('architecture_info', [
+        ('currentStructure', 'current_structure', 'text'),
+        ('painPoints', 'pain_points', 'json'),
+        ('desiredImprovements', 'desired_improvements', 'json'),
+    ]),
+    'projectInfo.codeQualityIssues': ('code_quality', [
+        ('debugCode', 'debug_code', 'json'),
+        ('duplications', 'duplications', 'json'),
+        ('performance', 'performance', 'json'),
+        ('readability', 'readability', 'json'),
+    ]),
+    'projectInfo.portfolioGoals': ('portfolio_goals', [
+        ('targetAudience', 'target_audience', 'text'),
+        ('keyHighlights', 'key_highlights', 'json'),
+        ('personalContributions', 'personal_contributions', 'json'),
+        ('uniqueSellingPoints', 'unique_selling_points', 'json'),
+    ]),
+    'projectInfo.githubInfo': ('github_info', [
+        ('repositoryUrl', 'repository_url', 'text'),
+        ('branchStructure', 'branch_structure', 'text'),
+        ('contributionStats', 'contribution_stats', 'text'),
+    ]),
+    'refactoringStatus': ('refactoring_status', [
+        ('completedTasks', 'completed_tasks', 'json'),
+        ('pendingTasks', 'pending_tasks', 'json'),
+        ('skippedTasks', 'skipped_tasks', 'json'),
+    ]),
+    'documentationStatus': ('documentation_status', [
+        ('readmeGenerated', 'readme_generated', 'bool'),
+        ('readmePath', 'readme_path', 'text'),
+        ('additionalDocs', 'additional_docs', 'json'),
+    ]),
+}
+
+# 하위 섹션을 갖는 최상위 키 (그 아래 각 키가 하나의 섹션)
+CONTAINER_KEYS = ('projectInfo',)
+
+TECH_SECTION = 'projectInfo.technicalInfo'
+
+
+def resolve_section(name: str) -> str:
+    """'basicInfo' 같은 짧은 이름을 'projectInfo.basicInfo' 경로로 바꿉니다."""
+    if name in FIXED_SECTIONS or '.' in name or name in CONTAINER_KEYS:
+        return name
+    nested = f"projectInfo.{name}"
+    if nested in FIXED_SECTIONS:
+        return nested
+    return name
+
+
+# 저장 시 검색 색인을 갱신해야 하는 섹션 경로
+SEARCH_PATHS = frozenset(resolve_section(name) for name in search_index.SEARCH_SECTIONS)
+
+
+def split_document(document: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """문서를 (섹션 경로, 값) 목록으로 나눕니다. 순서는 문서 순서를 따릅니다."""
+    sections = []
+    for key, value in document.items():
+        if key in CONTAINER_KEYS and isinstance(value, dict):
+            sections.extend((f"{key}.{sub}", sub_value) for sub, sub_value in value.items())
+        else:
+            sections.append((key, value))
+    return sections
+
+
+def _encode(value: Any, kind: str) -> Any:
+    if kind == 'json':
+        return serialization.dumps(value)
+    return value
+
+
+def _decode(value: Any, kind: str) -> Any:
+    if kind == 'json' and isinstance(value, str):
+        return serialization.loads(value)
+    if kind == 'bool' and isinstance(value, int):
+        return bool(value)
+    return value
+
+
+def save_section(conn: sqlite3.Connection, project_id: int, section: str, data: Any):
+    """섹션 하나를 통째로 교체합니다. 검색 대상 섹션이면 검색 색인도 갱신합니다."""
+    path = resolve_section(section)
+    _write_section(conn, project_id, path, data)
+    if path in SEARCH_PATHS:
+        reindex(conn, project_id)
+
+
+def _write_section(conn: sqlite3.Connection, project_id: int, path: str, data: Any, position: Optional[int] = None):
+    spec = FIXED_SECTIONS.get(path)
+    if spec is None or not isinstance(data, dict):
+        if spec is not None:
+            conn.execute(f"DELETE FROM {spec[0]} WHERE project_id = ?", (project_id,))
+        _save_generic(conn, project_id, path, data, position)
+        return
+
+    table, fields = spec
+    # 컬럼에 담을 수 없는 값(스키마에 없는 키, 문자열 컬럼의 리스트 등)은 범용 섹션에 보관
+    stored = {key for key, _, kind in fields
+              if key in data and (kind == 'json' or not isinstance(data[key], (dict, list)))}
+    columns = [column for _, column, _ in fields]
+    values = [_encode(data[key], kind) if key in stored else None for key, _, kind in fields]
+    conn.execute(
+        f"INSERT OR REPLACE INTO {table} (project_id, {', '.join(columns)}) "
+        f"VALUES (?, {', '.join('?' for _ in columns)})",
+        [project_id, *values]
+    )
+
+    extra = {key: value for key, value in data.items() if key not in stored}
+    if extra:
+        _save_generic(conn, project_id, path, extra, position)
+    else:
+        conn.execute('DELETE FROM project_sections WHERE project_id = ? AND path = ?', (project_id, path))
+
+    if path == TECH_SECTION:
+        _index_tech(conn, project_id, data)
+
+
+def _save_generic(conn: sqlite3.Connection, project_id: int, path: str, data: Any, position: Optional[int]):
+    if position is None:
+        row = conn.execute(
+            'SELECT position FROM project_sections WHERE project_id = ? AND path = ?', (project_id, path)
+        ).fetchone()
+        if row is None:
+            row = conn.execute(
+                'SELECT COALESCE(MAX(position), -1) + 1 FROM project_sections WHERE project_id = ?', (project_id,)
+            ).fetchone()
+        position = row[0]
+    conn.execute(
+        'INSERT OR REPLACE INTO project_sections (project_id, path, position, data) VALUES (?, ?, ?, ?)',
+        (project_id, path, position, serialization.dumps(data))
+    )
+
+
+def _index_tech(conn: sqlite3.Connection, project_id: int, tech_info: Dict[str, Any]):
+    conn.execute('DELETE FROM project_tech WHERE project_id = ?', (project_id,))
+    rows = set()
+    for category, names in tech_info.items():
+        if isinstance(names, list):
+            rows.update((project_id, category, str(name)) for name in names if name)
+    conn.executemany('INSERT INTO project_tech (project_id, category, name) VALUES (?, ?, ?)', rows)
+
+
+def save_document(conn: sqlite3.Connection, project_id: int, document: Dict[str, Any]):
+    """문서 전체를 섹션 테이블에 저장하고 검색 색인을 씁니다."""
+    for position, (path, data) in enumerate(split_document(document)):
+        _write_section(conn, project_id, path, data, position)
+    search_index.index_document(conn, project_id, document)
+
+
+def reindex(conn: sqlite3.Connection, project_id: int):
+    """저장된 섹션으로 프로젝트의 검색 색인을 다시 씁니다."""
+    document = load_project(conn, project_id, search_index.SEARCH_SECTIONS)
+    if document is not None:
+        search_index.index_document(conn, project_id, document)
+
+
+def insert_project(conn: sqlite3.Connection, document: Dict[str, Any]) -> int:
+    """새 프로젝트를 만들고 ID를 반환합니다."""
+    project_id = conn.execute('INSERT INTO projects DEFAULT VALUES').lastrowid
+    save_document(conn, project_id, document)
+    return project_id
+
+
+def insert_projects(conn: sqlite3.Connection, documents: Sequence[Dict[str, Any]]) -> List[int]:
+    """여러 프로젝트를 한 번에 만듭니다. 같은 트랜잭션 안에서 호출해야 합니다."""
+    if not documents:
+        return []
+    conn.executemany('INSERT INTO projects DEFAULT VALUES', [()] * len(documents))
+    # 트랜잭션 안에서는 쓰기 잠금을 쥐고 있으므로 ID가 연속으로 배정됨
+    last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+    ids = list(range(last_id - len(documents) + 1, last_id + 1))
+    for project_id, document in zip(ids, documents):
+        save_document(conn, project_id, document)
+    return ids
+
+
+def _selected(path: str, sections: Optional[Iterable[str]]) -> bool:
+    if sections is None:
+        return True
+    for name in sections:
+        name = resolve_section(name)
+        if path == name or path.startswith(name + '.') or path.endswith('.' + name):
+            return True
+    return False
+
+
+def _set_path(document: Dict[str, Any], path: str, value: Any):
+    parts = path.split('.')
+    target = document
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    if isinstance(value, dict) and isinstance(target.get(parts[-1]), dict):
+        target[parts[-1]].update(value)
+    else:
+        target[parts[-1]] = value
+
+
+def load_project(conn: sqlite3.Connection, project_id: int,
+                 sections: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+    """프로젝트 문서를 조립합니다. sections를 주면 해당 섹션 테이블만 조회합니다.
+
+    섹션 이름은 'basicInfo' 같은 짧은 이름, 'projectInfo.basicInfo' 같은 경로,
+    또는 'projectInfo' 같은 상위 키를 사용할 수 있습니다.
+    프로젝트가 없으면 None을 반환합니다.
+    """
+    if conn.execute('SELECT 1 FROM projects WHERE id = ?', (project_id,)).fetchone() is None:
+        return None
+
+    document: Dict[str, Any] = {}
+    fixed = [path for path in FIXED_SECTIONS if _selected(path, sections)]
+    # projectInfo가 항상 문서 맨 앞에 오도록 먼저 자리를 잡음
+    if any(path.startswith('projectInfo.') for path in fixed) or _selected('projectInfo.', sections):
+        document['projectInfo'] = {}
+
+    for path in fixed:
+        table, fields = FIXED_SECTIONS[path]
+        row = conn.execute(
+            f"SELECT {', '.join(column for _, column, _ in fields)} FROM {table} WHERE project_id = ?",
+            (project_id,)
+        ).fetchone()
+        if row is None:
+            continue
+        _set_path(document, path, {
+            key: _decode(value, kind)
+            for (key, _, kind), value in zip(fields, row)
+            if value is not None
+        })
+
+    for path, data in conn.execute(
+        'SELECT path, data FROM project_sections WHERE project_id = ? ORDER BY position', (project_id,)
+    ):
+        if _selected(path, sections):
+            _set_path(document, path, serialization.loads(data))
+
+    if document.get('projectInfo') == {} and sections is not None:
+        del document['projectInfo']
+    return document
+
+
+def find_projects(conn: sqlite3.Connection, name: Optional[str] = None, tech: Optional[str] = None,
+                  updated_since: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    """이름(접두어), 기술, 수정 시각으로 프로젝트를 찾습니다. 모두 색인을 사용합니다."""
+    clauses = []
+    params: List[Any] = []
+    if name:
+        # 접두어 검색을 범위 조건으로 바꿔 idx_basic_info_name을 타게 함
+        clauses.append('b.project_name >= ? COLLATE NOCASE AND b.project_name < ? COLLATE NOCASE')
+        params.extend([name, name + '\U0010ffff'])
+    if tech:
+        clauses.append('p.id IN (SELECT project_id FROM project_tech WHERE name = ? COLLATE NOCASE)')
+        params.append(tech)
+    if updated_since:
+        clauses.append('p.updated_at >= ?')
+        params.append(updated_since)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    rows = conn.execute(f'''
+    SELECT p.id, b.project_name, p.created_at, p.updated_at, p.revision
+    FROM projects p LEFT JOIN basic_info b ON b.project_id = p.id
+    {where}
+    ORDER BY p.updated_at DESC, p.id DESC
+    LIMIT ? OFFSET ?
+    ''', [*params, limit, offset]).fetchall()
+    return [
+        {'id': row[0], 'projectName': row[1], 'createdAt': row[2], 'updatedAt': row[3], 'revision': row[4]}
+        for row in rows
+    ]
+
+
+class PatchError(ValueError):
+    """적용할 수 없는 패치 연산 (잘못된 경로, 없는 값, test 실패 등)"""
+
+
+class PatchConflict(PatchError):
+    """expected_updated_at/expected_revision이 현재 값과 다름 (다른 곳에서 먼저 수정됨)"""
+
+    def __init__(self, message: str, updated_at: str, revision: int):
+        super().__init__(message)
+        self.updated_at = updated_at
+        self.revision = revision
+
+
+PATCH_OPS = ('add', 'replace', 'remove', 'test')
+
+# 낙관적 동시성 확인과 수정 시각 갱신을 한 문장으로 처리 (쓰기 잠금도 여기서 잡음)
+TOUCH_PROJECT = '''
+UPDATE projects SET updated_at = CURRENT_TIMESTAMP
+WHERE id = ? AND (? IS NULL OR updated_at = ?) AND (? IS NULL OR revision = ?)
+'''
+
+
+def get_version(conn: sqlite3.Connection, project_id: int) -> Optional[Tuple[str, int]]:
+    """프로젝트의 (updated_at, revision). 프로젝트가 없으면 None"""
+    row = conn.execute('SELECT updated_at, revision FROM projects WHERE id = ?', (project_id,)).fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def _parse_pointer(pointer: Any) -> List[str]:
+    """JSON Pointer('/projectInfo/basicInfo/projectName')를 토큰 목록으로 나눕니다."""
+    if not isinstance(pointer, str) or not pointer.startswith('/') or pointer == '/':
+        raise PatchError(f"잘못된 경로입니다: {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+ARRAY_INDEX = re.compile(r'0|[1-9][0-9]*')
+
+
+def _json_key(token: str, pointer: str) -> str:
+    """객체 키를 SQLite JSON 경로 조각(."key")으로 바꿉니다.
+
+    SQLite는 따옴표 안의 키를 이스케이프 없이 그대로 비교하므로, JSON 문자열로 쓸 때 이스케이프가
+    필요한 키(따옴표, 역슬래시, 제어 문자)는 경로로 표현할 수 없어 거절합니다.
+    """
+    if json.dumps(token, ensure_ascii=False)[1:-1] != token:
+        raise PatchError(f"JSON 경로로 표현할 수 없는 키입니다 (따옴표, 역슬래시, 제어 문자): {pointer}")
+    return f'."{token}"'
+
+
+def _json_step(parent_type: Optional[str], token: str, pointer: str) -> str:
+    """부모 값의 실제 타입에 맞는 경로 조각. 배열이면 인덱스([n], 끝은 [#]), 객체면 키입니다."""
+    if parent_type == 'array':
+        if token == '-':
+            return '[#]'
+        if not ARRAY_INDEX.fullmatch(token):
+            raise PatchError(f"배열 인덱스가 아닙니다: {pointer}")
+        return f'[{token}]'
+    if parent_type == 'object':
+        return _json_key(token, pointer)
+    raise PatchError(f"경로의 상위 값이 없습니다: {pointer}")
+
+
+class _Cell:
+    """JSON 문자열을 담은 컬럼 한 칸 (전용 테이블의 json 컬럼 또는 project_sections.data)"""
+
+    def __init__(self, table: str, column: str, where: str, params: Sequence[Any]):
+        self.table = table
+        self.column = column
+        self.where = where
+        self.params = list(params)
+
+    def exists(self, conn: sqlite3.Connection) -> bool:
+        return conn.execute(
+            f"SELECT 1 FROM {self.table} WHERE {self.where} AND {self.column} IS NOT NULL", self.params
+        ).fetchone() is not None
+
+    def type(self, conn: sqlite3.Connection, path: str) -> Optional[str]:
+        row = conn.execute(
+            f"SELECT json_type({self.column}, ?) FROM {self.table} WHERE {self.where}", [path, *self.params]
+        ).fetchone()
+        return row[0] if row else None
+
+    def length(self, conn: sqlite3.Connection, path: str) -> int:
+        row = conn.execute(
+            f"SELECT json_array_length({self.column}, ?) FROM {self.table} WHERE {self.where}", [path, *self.params]
+        ).fetchone()
+        return row[0]
+
+    def extract(self, conn: sqlite3.Connection, path: str) -> Any:
+        # json_extract는 문자열/숫자를 SQL 값으로 돌려주므로 배열/객체를 구분하기 위해 json_quote로 감쌈
+        row = conn.execute(
+            f"SELECT CASE WHEN json_type({self.column}, ?) IN ('object', 'array') "
+            f"THEN json_extract({self.column}, ?) ELSE json_quote(json_extract({self.column}, ?)) END "
+            f"FROM {self.table} WHERE {self.where}", [path, path, path, *self.params]
+        ).fetchone()
+        return serialization.loads(row[0])
+
+    def update(self, conn: sqlite3.Connection, function: str, path: str, value: Any = None):
+        if function == 'json_remove':
+            expression, args = f"json_remove({self.column}, ?)", [path]
+        else:
+            expression, args = f"{function}({self.column}, ?, json(?))", [path, serialization.dumps(value)]
+        conn.execute(f"UPDATE {self.table} SET {self.column} = {expression} WHERE {self.where}",
+                     [*args, *self.params])
+
+
+def _apply_json(conn: sqlite3.Connection, cell: _Cell, op: str, tokens: List[str], value: Any, pointer: str):
+    """JSON 컬럼 안의 경로에 연산 하나를 적용합니다. 부모 값은 이미 있어야 합니다."""
+    # 토큰마다 실제 값의 타입을 보고 경로를 만듦 (객체의 '2024' 같은 숫자 키를 배열 인덱스로 보지 않도록)
+    parent, parent_type = '$', cell.type(conn, '$')
+    for token in tokens[:-1]:
+        parent += _json_step(parent_type, token, pointer)
+        parent_type = cell.type(conn, parent)
+    last = tokens[-1]
+    path = parent + _json_step(parent_type, last, pointer)
+
+    if op == 'add':
+        if parent_type == 'array' and last != '-':
+            # 배열 중간 삽입은 SQLite JSON 함수로 표현할 수 없어 해당 배열만 읽어 다시 씀
+            items = cell.extract(conn, parent)
+            if int(last) > len(items):
+                raise PatchError(f"배열 인덱스가 범위를 벗어났습니다: {pointer}")
+            items.insert(int(last), value)
+            cell.update(conn, 'json_set', parent, items)
+            written = parent + f'[{last}]'
+        else:
+            cell.update(conn, 'json_insert' if last == '-' else 'json_set', path, value)
+            written = parent + '[#-1]' if last == '-' else path
+        _check_written(conn, cell, written, value, pointer)
+        return
+
+    if last == '-' or cell.type(conn, path) is None:
+        raise PatchError(f"경로에 값이 없습니다: {pointer}")
+    if op == 'test':
+        if cell.extract(conn, path) != value:
+            raise PatchError(f"test 실패: {pointer}")
+    elif op == 'replace':
+        cell.update(conn, 'json_replace', path, value)
+        _check_written(conn, cell, path, value, pointer)
+    else:
+        length = cell.length(conn, parent) if parent_type == 'array' else None
+        cell.update(conn, 'json_remove', path)
+        removed = (cell.length(conn, parent) == length - 1 if parent_type == 'array'
+                   else cell.type(conn, path) is None)
+        if not removed:
+            raise PatchError(f"경로의 값을 지우지 못했습니다: {pointer}")
+
+
+def _check_written(conn: sqlite3.Connection, cell: _Cell, path: str, value: Any, pointer: str):
+    """쓴 값을 다시 읽어 확인합니다. 경로가 잘못되어 아무것도 쓰지 않았는데 성공으로 처리되지 않도록"""
+    if cell.type(conn, path) is None or cell.extract(conn, path) != value:
+        raise PatchError(f"경로에 값을 쓰지 못했습니다: {pointer}")
+
+
+def _apply_section(conn: sqlite3.Connection, project_id: int, op: str, section: str, value: Any, pointer: str):
+    """섹션 전체에 연산 하나를 적용합니다."""
+    document = load_project(conn, project_id, [section])
+    current = document
+    for part in section.split('.'):
+        current = current.get(part) if isinstance(current, dict) else None
+    if op == 'test':
+        if current != value:
+            raise PatchError(f"test 실패: {pointer}")
+        return
+    if op in ('replace', 'remove') and current is None:
+        raise PatchError(f"경로에 값이 없습니다: {pointer}")
+    if op != 'remove':
+        _write_section(conn, project_id, section, value)
+        return
+    spec = FIXED_SECTIONS.get(section)
+    if spec is not None:
+        conn.execute(f"DELETE FROM {spec[0]} WHERE project_id = ?", (project_id,))
+    conn.execute('DELETE FROM project_sections WHERE project_id = ? AND path = ?', (project_id, section))
+
+
+def _apply_field(conn: sqlite3.Connection, project_id: int, op: str, table: str, column: str, kind: str,
+                 value: Any, pointer: str):
+    """전용 테이블의 컬럼 값 전체에 연산 하나를 적용합니다."""
+    row = conn.execute(f"SELECT {column} FROM {table} WHERE project_id = ?", (project_id,)).fetchone()
+    current = _decode(row[0], kind) if row else None
+    if op == 'test':
+        if current != value:
+            raise PatchError(f"test 실패: {pointer}")
+        return
+    if op in ('replace', 'remove') and current is None:
+        raise PatchError(f"경로에 값이 없습니다: {pointer}")
+    if op != 'remove':
+        if kind == 'bool' and not isinstance(value, bool):
+            raise PatchError(f"true/false 값이어야 합니다: {pointer}")
+        if kind == 'text' and isinstance(value, (dict, list)):
+            raise PatchError(f"문자열 값이어야 합니다: {pointer}")
+        if value is None:
+            raise PatchError(f"null은 저장할 수 없습니다. remove를 사용하세요: {pointer}")
+    conn.execute(f"INSERT OR IGNORE INTO {table} (project_id) VALUES (?)", (project_id,))
+    conn.execute(f"UPDATE {table} SET {column} = ? WHERE project_id = ?",
+                 (None if op == 'remove' else _encode(value, kind), project_id))
+
+
+def _apply_operation(conn: sqlite3.Connection, project_id: int, operation: Any) -> str:
+    """패치 연산 하나를 적용하고 바뀐 섹션 경로를 반환합니다."""
+    if not isinstance(operation, dict) or operation.get('op') not in PATCH_OPS:
+        raise PatchError(f"op는 {', '.join(PATCH_OPS)} 중 하나여야 합니다: {operation!r}")
+    op, pointer = operation['op'], operation.get('path')
+    if op != 'remove' and 'value' not in operation:
+        raise PatchError(f"{op} 연산에는 value가 필요합니다: {pointer}")
+    value = operation.get('value')
+
+    tokens = _parse_pointer(pointer)
+    if tokens[0] in CONTAINER_KEYS:
+        if len(tokens) < 2:
+            raise PatchError(f"{tokens[0]} 전체는 바꿀 수 없습니다. 하위 섹션 경로를 사용하세요.")
+        section, rest = f"{tokens[0]}.{tokens[1]}", tokens[2:]
+    else:
+        section, rest = tokens[0], tokens[1:]
+
+    if not rest:
+        _apply_section(conn, project_id, op, section, value, pointer)
+        return section
+
+    spec = FIXED_SECTIONS.get(section)
+    field = next((item for item in spec[1] if item[0] == rest[0]), None) if spec else None
+    if field is not None:
+        _, column, kind = field
+        if len(rest) == 1:
+            _apply_field(conn, project_id, op, spec[0], column, kind, value, pointer)
+            return section
+        if kind != 'json':
+            raise PatchError(f"하위 경로를 가질 수 없는 값입니다: {pointer}")
+        cell, tokens = _Cell(spec[0], column, 'project_id = ?', [project_id]), rest[1:]
+    else:
+        cell = _Cell('project_sections', 'data', 'project_id = ? AND path = ?', [project_id, section])
+        if spec is not None and op == 'add' and len(rest) == 1 and not cell.exists(conn):
+            # 전용 섹션의 추가 키는 범용 섹션에 보관하므로 처음 추가할 때 빈 객체를 만들어 둠
+            _save_generic(conn, project_id, section, {}, None)
+        tokens = rest
+    if not cell.exists(conn):
+        raise PatchError(f"경로에 값이 없습니다: {pointer}")
+    _apply_json(conn, cell, op, tokens, value, pointer)
+    return section
+
+
+def apply_patch(conn: sqlite3.Connection, project_id: int, operations: Sequence[Dict[str, Any]],
+                expected_updated_at: Optional[str] = None,
+                expected_revision: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """JSON Patch(RFC 6902) 형식의 연산(add, replace, remove, test)을 한 트랜잭션으로 적용합니다.
+
+    경로는 문서 기준 JSON Pointer이며('/projectInfo/basicInfo/projectName', '/refactoringStatus/pendingTasks/-'),
+    JSON 컬럼 안의 값은 json_set/json_replace/json_remove로 그 자리에서 고칩니다. 숫자 토큰은 부모가 배열일 때만
+    인덱스이고, JSON 이스케이프가 필요한 키(따옴표, 역슬래시, 제어 문자)는 PatchError로 거절합니다.
+    expected_updated_at/expected_revision을 주면 현재 값과 다를 때 PatchConflict를 냅니다.
+    수정 시각 갱신, 기술/검색 색인 갱신은 연산 수와 관계없이 한 번만 합니다.
+    연산 하나라도 실패하면 PatchError를 내며, 호출자의 트랜잭션을 롤백하면 아무것도 바뀌지 않습니다.
+    프로젝트가 없으면 None을 반환합니다.
+    """
+    cursor = conn.execute(TOUCH_PROJECT, (project_id, expected_updated_at, expected_updated_at,
+                                          expected_revision, expected_revision))
+    if cursor.rowcount == 0:
+        version = get_version(conn, project_id)
+        if version is None:
+            return None
+        raise PatchConflict(
+            f"프로젝트가 이미 수정되었습니다. (updated_at: {version[0]}, revision: {version[1]})", *version
+        )
+
+    sections = []
+    for operation in operations:
+        section = _apply_operation(conn, project_id, operation)
+        if section not in sections:
+            sections.append(section)
+
+    if TECH_SECTION in sections:
+        document = load_project(conn, project_id, [TECH_SECTION])
+        _index_tech(conn, project_id, document.get('projectInfo', {}).get('technicalInfo') or {})
+    if SEARCH_PATHS.intersection(sections):
+        reindex(conn, project_id)
+
+    updated_at, revision = get_version(conn, project_id)
+    return {'updated_at': updated_at, 'revision': revision, 'applied': len(operations), 'sections': sections}
@@ -0,0 +1,109 @@
+"""
+README 섹션 색인
+
+README를 한 번 훑으면서 Markdown 제목(ATX, `#` ~ `######`)을 토큰화해 섹션 목록을
+만들고, 추출 함수는 전체 본문을 다시 검색하는 대신 이 목록에서 제목으로 섹션을 찾습니다.
+
+- 줄 맨 앞의 제목만 인식하며, 코드 블록(``` / ~~~) 안의 `#` 줄은 제목으로 보지 않습니다.
+- 섹션 본문은 다음 같은 수준 이상의 제목 전까지이며 하위 섹션을 포함합니다.
+- 정규식은 모두 모듈 로드 시 한 번만 컴파일합니다.
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Pattern
+
+# 제목 줄과 코드 블록 경계를 한 번의 finditer로 찾음.
+# 패턴이 개행 + 고정 문자로 시작해야 re가 빠른 접두어 검색을 사용하므로 줄 맨 앞의 제목/펜스만
+# 인식함 (들여쓴 제목은 README에서 거의 쓰지 않음). 첫 줄도 찾도록 본문 앞에 개행을 붙여 검색함
+BLOCK_PATTERN = re.compile(r'\n(?:(?P<hashes>#{1,6})(?=[ \t\n]|\Z)(?P<title>[^\n]*)|(?P<fence>`{3,}|~{3,}))')
+# 제목 끝의 닫는 # 시퀀스 ("## 제목 ##")
+CLOSING_HASHES_PATTERN = re.compile(r'(?:^|[ \t]+)#+[ \t]*$')
+BULLET_PATTERN = re.compile(r'^[ \t]*[-\*+][ \t]+(.+)$', re.MULTILINE)
+NUMBERED_TITLE_PATTERN = re.compile(r'(\d+)\.\s*(.+)')
+
+
+@dataclass
+class Section:
+    # sections 목록에서의 위치
+    index: int
+    level: int
+    title: str
+    # 상위 섹션의 index (최상위면 None)
+    parent: Optional[int]
+    # 제목 줄 다음부터 다음 제목 전까지 (text 오프셋)
+    body_start: int
+    body_end: int
+    # 하위 섹션을 포함한 끝
+    end: int
+
+
+class ReadmeIndex:
+    """README 제목 기반 섹션 색인"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.sections: List[Section] = []
+        self._tokenize()
+
+    def _tokenize(self):
+        size = len(self.text)
+        fence = None
+        open_sections: List[Section] = []
+        # 앞에 붙인 개행 때문에 match.start()가 원문에서의 줄 시작 위치, match.end()가 다음 줄 시작 위치
+        for match in BLOCK_PATTERN.finditer('\n' + self.text):
+            hashes, title, marker = match.group('hashes', 'title', 'fence')
+            if marker:
+                if fence is None:
+                    fence = marker[0] * len(marker)
+                elif marker.startswith(fence):
+                    fence = None
+                continue
+            if fence is not None:
+                continue
+
+            level = len(hashes)
+            start = match.start()
+            if self.sections:
+                self.sections[-1].body_end = start
+            while open_sections and open_sections[-1].level >= level:
+                open_sections.pop().end = start
+            if title.endswith('#'):
+                title = CLOSING_HASHES_PATTERN.sub('', title)
+            title = title.strip()
+            parent = open_sections[-1].index if open_sections else None
+            section = Section(len(self.sections), level, title, parent, min(match.end(), size), size, size)
+            self.sections.append(section)
+            open_sections.append(section)
+
+    def find(self, pattern: Pattern) -> Optional[Section]:
+        """제목이 pattern과 맞는 첫 섹션"""
+        for section in self.sections:
+            if pattern.search(section.title):
+                return section
+        return None
+
+    def descendants(self, section: Section) -> List[Section]:
+        """섹션 안의 모든 하위 섹션 (문서 순서)"""
+        result = []
+        for child in self.sections[section.index + 1:]:
+            if child.body_start > section.end:
+                break
+            result.append(child)
+        return result
+
+    def children(self, section: Section) -> List[Section]:
+        """바로 아래 하위 섹션들 (제목 수준을 건너뛴 경우도 포함)"""
+        return [child for child in self.descendants(section) if child.parent == section.index]
+
+    def body(self, section: Section) -> str:
+        """하위 섹션을 제외한 섹션 본문"""
+        return self.text[section.body_start:section.body_end]
+
+    def section_text(self, section: Section) -> str:
+        """하위 섹션 본문까지 포함한 텍스트 (제목 줄 제외)"""
+        return '\n'.join([self.body(section), *(self.body(child) for child in self.descendants(section))])
+
+    def bullets(self, section: Section, include_children: bool = True) -> List[str]:
+        """섹션의 글머리 기호 항목"""
+        text = self.section_text(section) if include_children else self.body(section)
+        return [item.strip() for item in BULLET_PATTERN.findall(text)]
@@ -0,0 +1,179 @@
+"""
+포트폴리오/자소서 렌더링
+
+템플릿 디렉토리(TEMPLATE_DIR)의 Jinja2 템플릿을 한 번만 컴파일해 재사용합니다.
+
+- 컴파일된 템플릿은 이름별 dict에 보관하므로 렌더링은 조회 + render 한 번입니다.
+- 바이트코드 캐시를 디스크에 두어 프로세스를 새로 띄워도 파싱을 건너뜁니다.
+- 파일이 수정되면(mtime) RELOAD_CHECK_INTERVAL 간격으로 확인해 다시 불러옵니다.
+- 렌더링 결과는 RenderCache에 (프로젝트, 리비전, 템플릿, 템플릿 버전) 키로 보관합니다.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+import jinja2
+
+import metrics
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR = os.getenv('TEMPLATE_DIR', os.path.join(BASE_DIR, 'templates'))
+BYTECODE_CACHE_DIR = os.getenv('TEMPLATE_CACHE_DIR', os.path.join('.cache', 'jinja'))
+# 템플릿 파일 변경 여부를 확인하는 최소 간격(초)
+RELOAD_CHECK_INTERVAL = float(os.getenv('TEMPLATE_RELOAD_INTERVAL', '1.0'))
+# 렌더링 결과 캐시 상한 (문자 수 기준)
+RENDER_CACHE_MAX_CHARS = int(os.getenv('RENDER_CACHE_MAX_CHARS', str(8 * 1024 * 1024)))
+
+# 템플릿에서 사용하는 전역 함수
+TEMPLATE_GLOBALS = {
+    'zip': zip,
+}
+
+
+class Renderer:
+    """템플릿을 이름으로 캐시하고 mtime 변경 시 다시 불러오는 렌더러"""
+
+    def __init__(self, template_dir: str = TEMPLATE_DIR, bytecode_cache_dir: Optional[str] = BYTECODE_CACHE_DIR,
+                 reload_interval: float = RELOAD_CHECK_INTERVAL):
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(bytecode_cache_dir)
+        self.env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(template_dir),
+            bytecode_cache=bytecode_cache,
+            auto_reload=True,
+        )
+        self.env.globals.update(TEMPLATE_GLOBALS)
+        self.reload_interval = reload_interval
+        # 이름 -> (템플릿, 마지막 확인 시각, 버전)
+        self._templates: Dict[str, Tuple[jinja2.Template, float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> jinja2.Template:
+        """컴파일된 템플릿을 반환합니다."""
+        cached = self._templates.get(name)
+        now = time.monotonic()
+        if cached and now - cached[1] < self.reload_interval:
+            return cached[0]
+        with self._lock:
+            # auto_reload=True이므로 파일이 바뀐 경우에만 다시 컴파일됨
+            template = self.env.get_template(name)
+            version = cached[2] if cached else 0
+            if cached and template is not cached[0]:
+                version += 1
+            self._templates[name] = (template, now, version)
+        return template
+
+    def version(self, name: str) -> int:
+        """템플릿이 다시 로드될 때마다 증가하는 버전"""
+        self.get(name)
+        return self._templates[name][2]
+
+    def render(self, name: str, **context: Any) -> str:
+        return self.get(name).render(**context)
+
+    def exists(self, name: str) -> bool:
+        try:
+            self.get(name)
+        except jinja2.TemplateNotFound:
+            return False
+        return True
+
+
+class RenderCache:
+    """렌더링 결과 LRU 캐시
+
+    키의 첫 번째 요소는 프로젝트 ID여야 하며, invalidate(project_id)로
+    해당 프로젝트의 모든 결과를 지울 수 있습니다.
+    """
+
+    def __init__(self, max_chars: int = RENDER_CACHE_MAX_CHARS):
+        self.max_chars = max_chars
+        self._entries: 'OrderedDict[Tuple, str]' = OrderedDict()
+        self._by_project: Dict[Hashable, Set[Tuple]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: Tuple, render_fn: Callable[[], str]) -> str:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = render_fn()
+        if len(value) > self.max_chars:
+            return value
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = value
+                self._by_project.setdefault(key[0], set()).add(key)
+                self._size += len(value)
+            while self._size > self.max_chars:
+                self._remove(next(iter(self._entries)))
+        return value
+
+    def _remove(self, key: Tuple):
+        value = self._entries.pop(key)
+        self._size -= len(value)
+        keys = self._by_project.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_project[key[0]]
+
+    def invalidate(self, project_id: Hashable):
+        """프로젝트의 캐시된 결과를 모두 지웁니다."""
+        with self._lock:
+            for key in list(self._by_project.get(project_id, ())):
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'entries': len(self._entries), 'chars': self._size, 'hits': self.hits, 'misses': self.misses}
+
+
+_renderer: Optional[Renderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer() -> Renderer:
+    """프로세스 전역 렌더러를 반환합니다."""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = Renderer()
+    return _renderer
+
+
+def render(name: str, **context: Any) -> str:
+    return get_renderer().render(name, **context)
+
+
+_render_cache = RenderCache()
+
+
+def get_render_cache() -> RenderCache:
+    return _render_cache
+
+
+def _collect_metrics():
+    stats = _render_cache.stats()
+    lookups = stats['hits'] + stats['misses']
+    yield ('render_cache_lookups_total', 'counter', '렌더링 결과 캐시 조회 결과별 수',
+           [({'result': 'hits'}, stats['hits']), ({'result': 'misses'}, stats['misses'])])
+    yield ('render_cache_hit_ratio', 'gauge', '렌더링 결과 캐시 적중률',
+           [({}, round(stats['hits'] / lookups, 4) if lookups else 0.0)])
+    yield ('render_cache_chars', 'gauge', '캐시된 렌더링 결과 크기 (문자 수)', [({}, stats['chars'])])
+
+
+metrics.register_collector('render_cache', _collect_metrics)
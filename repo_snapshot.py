@@ -0,0 +1,55 @@
+"""
+요청 단위 저장소 스냅샷
+
+한 번의 분석에 필요한 README, 언어, 브랜치, 커밋 수, 이슈, 매니페스트, 기여 통계를 담습니다.
+비동기 클라이언트(github_async.AsyncGitHubClient, git_local.LocalGitClient)의 fetch_snapshot()이
+요청한 리소스를 동시에 가져와 채우고, 모든 추출 함수는 저장소 대신 스냅샷을 받아서
+같은 리소스를 여러 번 요청하지 않습니다.
+"""
+import re
+from collections import Counter
+from functools import cached_property
+from typing import Optional
+
+from readme_parser import ReadmeIndex
+
+GITHUB_URL_PATTERN = re.compile(r"https://github\.com/([^/]+)/([^/]+)")
+
+
+def parse_github_url(url: str) -> Optional[str]:
+    """GitHub URL에서 'owner/repo'를 추출합니다. 형식이 맞지 않으면 None"""
+    match = GITHUB_URL_PATTERN.match(url or '')
+    if not match:
+        return None
+    owner, repo_name = match.groups()
+    return f"{owner}/{repo_name}"
+
+
+class RepoSnapshot:
+    """가져온 저장소 리소스 묶음
+
+    info(name, full_name, description, default_branch)와 fetch_snapshot()의 resources로 요청한
+    리소스(readme_text, languages, branches, commit_count, issues, manifests, contribution_stats)를
+    속성으로 가집니다. 가져오지 않은 리소스에 접근하면 요청하지 않고 AttributeError를 냅니다.
+    """
+
+    def __init__(self, **resources):
+        self.__dict__.update(resources)
+        # 리소스별 요청 횟수
+        self.fetch_counts = Counter()
+
+    @classmethod
+    def preloaded(cls, **resources) -> 'RepoSnapshot':
+        """이미 가져온 리소스로 스냅샷을 만듭니다."""
+        return cls(**resources)
+
+    def __getattr__(self, name: str):
+        # 인스턴스 __dict__에 없는 속성만 여기로 옴
+        raise AttributeError(f"스냅샷에 없는 리소스입니다: {name} (fetch_snapshot의 resources에 추가하세요)")
+
+    @cached_property
+    def readme_index(self) -> Optional[ReadmeIndex]:
+        """README 섹션 색인. 추출 함수들이 공유하도록 한 번만 만듭니다."""
+        if self.readme_text is None:
+            return None
+        return ReadmeIndex(self.readme_text)
@@ -0,0 +1,168 @@
+"""
+저장소 변경 감지 (증분 재분석)
+
+프로젝트별로 마지막으로 분석한 기본 브랜치 HEAD SHA, README와 매니페스트의 blob SHA를
+`repo_sync_state`에 저장하고, 이슈 수정 시각의 high-water mark는 필터 없는 이슈 스캔의 위치
+(issue_scanner.load_scan_state())를 그대로 씁니다.
+
+다시 분석할 때는 먼저 값싼 조건부 요청으로 바뀐 부분만 찾습니다.
+
+- HEAD: `commits/HEAD`를 SHA 미디어 타입으로 조회 (본문 40바이트, 바뀌지 않았으면 304)
+- 이슈: 가장 최근에 수정된 이슈 한 건 (per_page=1, 바뀌지 않았으면 304)
+
+HEAD가 바뀌었을 때만 트리를 조회해 README/매니페스트 blob SHA를 비교하므로, 바뀌지 않은 저장소는
+HEAD 요청 한 번(이슈 포함 시 두 번)으로 끝나며 304 응답은 rate limit에 포함되지 않습니다.
+"""
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+import tech_classifier
+from storage import get_pool
+
+# 저장소 루트에서 README로 인정하는 파일 (앞에 있을수록 우선)
+README_NAMES = ('readme.md', 'readme.markdown', 'readme.rst', 'readme.txt', 'readme')
+
+SELECT_STATE = '''
+SELECT github_url, head_sha, head_etag, files, issues_etag, checked_at, refreshed_at
+FROM repo_sync_state WHERE project_id = ?
+'''
+UPSERT_STATE = '''
+INSERT INTO repo_sync_state (project_id, github_url, head_sha, head_etag, files, issues_etag, checked_at, refreshed_at)
+VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CASE WHEN ? THEN CURRENT_TIMESTAMP END)
+ON CONFLICT(project_id) DO UPDATE SET
+    github_url = excluded.github_url,
+    head_sha = excluded.head_sha,
+    head_etag = excluded.head_etag,
+    files = excluded.files,
+    issues_etag = excluded.issues_etag,
+    checked_at = excluded.checked_at,
+    refreshed_at = COALESCE(excluded.refreshed_at, repo_sync_state.refreshed_at)
+'''
+
+
+def select_readme(paths) -> Optional[str]:
+    """트리의 파일 경로 중 루트의 README 경로"""
+    candidates = {path.lower(): path for path in paths if '/' not in path}
+    for name in README_NAMES:
+        if name in candidates:
+            return candidates[name]
+    return None
+
+
+def tracked_files(tree: Dict[str, str]) -> Dict[str, str]:
+    """변경을 추적하는 파일 {경로: blob SHA} (README와 분석에 쓰는 매니페스트)"""
+    paths = tech_classifier.select_manifests(tree)
+    readme = select_readme(tree)
+    if readme:
+        paths.append(readme)
+    return {path: tree[path] for path in paths}
+
+
+def load_state(project_id: int) -> Dict[str, Any]:
+    """마지막 분석 상태. 한 번도 분석하지 않았으면 빈 dict"""
+    row = get_pool().fetchone(SELECT_STATE, (project_id,))
+    if not row:
+        return {}
+    github_url, head_sha, head_etag, files, issues_etag, checked_at, refreshed_at = row
+    return {
+        'github_url': github_url,
+        'head_sha': head_sha,
+        'head_etag': head_etag,
+        'files': json.loads(files or '{}'),
+        'issues_etag': issues_etag,
+        'checked_at': checked_at,
+        'refreshed_at': refreshed_at,
+    }
+
+
+def save_state(conn, project_id: int, github_url: str, changes: 'RepoChanges'):
+    conn.execute(UPSERT_STATE, (
+        project_id, github_url, changes.head_sha, changes.head_etag,
+        json.dumps(changes.files, sort_keys=True), changes.issues_etag, changes.any,
+    ))
+
+
+class RepoChanges:
+    """마지막 분석 이후 바뀐 부분"""
+
+    def __init__(self, state: Dict[str, Any], issue_mark: Optional[str]):
+        self.previous_files: Dict[str, str] = state.get('files') or {}
+        self.head_sha: Optional[str] = state.get('head_sha')
+        self.head_etag: Optional[str] = state.get('head_etag')
+        self.files: Dict[str, str] = dict(self.previous_files)
+        self.issues_etag: Optional[str] = state.get('issues_etag')
+        self.issue_mark = issue_mark
+        self.latest_issue_update: Optional[str] = None
+        self.head_changed = False
+        self.issues_changed = False
+        self.readme_path: Optional[str] = select_readme(self.files)
+
+    @property
+    def readme_changed(self) -> bool:
+        old = select_readme(self.previous_files)
+        return self.head_changed and (
+            self.readme_path != old or self.files.get(self.readme_path) != self.previous_files.get(old)
+        )
+
+    @property
+    def manifests_changed(self) -> List[str]:
+        """추가, 수정, 삭제된 매니페스트 경로"""
+        if not self.head_changed:
+            return []
+        paths = set(tech_classifier.select_manifests(self.files))
+        paths.update(tech_classifier.select_manifests(self.previous_files))
+        return sorted(path for path in paths if self.files.get(path) != self.previous_files.get(path))
+
+    @property
+    def any(self) -> bool:
+        return self.head_changed or self.issues_changed
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'headSha': self.head_sha,
+            'code': self.head_changed,
+            'readme': self.readme_changed,
+            'manifests': self.manifests_changed,
+            'issues': self.issues_changed,
+            'latestIssueUpdate': self.latest_issue_update,
+        }
+
+
+async def _check_head(client, full_name: str, changes: RepoChanges):
+    sha, etag = await client.get_head_sha(full_name, changes.head_etag)
+    changes.head_etag = etag
+    if sha is None or sha == changes.head_sha:
+        return
+    changes.head_changed = True
+    changes.head_sha = sha
+    changes.files = tracked_files(await client.get_tree(full_name, sha)) if sha else {}
+    changes.readme_path = select_readme(changes.files)
+
+
+async def _check_issues(client, full_name: str, changes: RepoChanges):
+    response, etag = await client.get_conditional(
+        f"/repos/{full_name}/issues",
+        {'state': 'all', 'sort': 'updated', 'direction': 'desc', 'per_page': 1},
+        etag=changes.issues_etag,
+    )
+    changes.issues_etag = etag
+    if response is None or response.status_code != 200:
+        # 304: 바뀌지 않음, 410: 이슈 비활성화
+        return
+    items = response.json()
+    changes.latest_issue_update = items[0].get('updated_at') if items else None
+    changes.issues_changed = bool(changes.latest_issue_update) and (
+        changes.issue_mark is None or changes.latest_issue_update > changes.issue_mark
+    )
+
+
+async def detect_changes(client, full_name: str, state: Dict[str, Any], issue_mark: Optional[str],
+                         include_issues: bool = True) -> RepoChanges:
+    """저장된 상태와 비교해 바뀐 부분을 찾습니다. HEAD와 이슈 확인은 동시에 보냅니다."""
+    changes = RepoChanges(state, issue_mark)
+    checks = [_check_head(client, full_name, changes)]
+    if include_issues:
+        checks.append(_check_issues(client, full_name, changes))
+    await asyncio.gather(*checks)
+    return changes
@@ -0,0 +1,146 @@
+"""
+프로젝트 전문 검색 (SQLite FTS5)
+
+프로젝트 이름, 목표, 주요 기능, 도전 과제, 기술 스택, README에서 뽑은 텍스트를
+`project_search` FTS5 테이블(rowid = 프로젝트 ID)에 색인합니다.
+
+- 데이터 대부분이 한국어라 공백 단위 토크나이저 대신 trigram 토크나이저를 사용합니다.
+  조사가 붙은 단어('포트홀을')도 부분 문자열로 찾을 수 있습니다.
+- trigram은 3글자 미만 검색어를 색인으로 찾을 수 없으므로 그런 검색어는
+  색인 결과를 부분 문자열 비교(instr)로 한 번 더 거릅니다. 검색어가 모두 3글자 미만이면
+  색인 없이 전체 행을 비교하므로 순위(score)가 없고, 결과는 프로젝트 이름(같으면 ID) 순입니다.
+- 순위는 컬럼 가중치를 준 BM25입니다.
+- project_store가 섹션을 저장할 때마다 해당 프로젝트의 행만 다시 씁니다.
+"""
+import sqlite3
+from typing import Any, Dict, List
+
+# 색인에 필요한 섹션 (project_store.load_project의 sections 인자)
+SEARCH_SECTIONS = ('basicInfo', 'technicalInfo', 'architectureInfo', 'portfolioGoals')
+
+# (컬럼, BM25 가중치) - 순서가 테이블 컬럼 순서
+COLUMNS = (
+    ('name', 10.0),
+    ('tech', 5.0),
+    ('objectives', 3.0),
+    ('features', 3.0),
+    ('challenges', 2.0),
+    ('readme', 1.0),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+# trigram 토크나이저가 색인할 수 있는 최소 검색어 길이
+MIN_TOKEN_CHARS = 3
+# 색인할 README 텍스트 최대 길이
+README_MAX_CHARS = 20000
+
+
+def create_table(conn: sqlite3.Connection):
+    """검색 테이블을 만듭니다. trigram 토크나이저가 없는 SQLite(3.34 미만)는 unicode61을 사용합니다."""
+    columns = ', '.join(COLUMN_NAMES)
+    try:
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS project_search USING fts5({columns}, tokenize='trigram')"
+        )
+    except sqlite3.OperationalError:
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS project_search USING fts5({columns}, tokenize='unicode61')"
+        )
+
+
+def _join(*values: Any) -> str:
+    parts = []
+    for value in values:
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value if item)
+        elif value:
+            parts.append(str(value))
+    return '\n'.join(parts)
+
+
+def document_fields(document: Dict[str, Any]) -> Dict[str, str]:
+    """프로젝트 문서에서 색인할 컬럼 값을 뽑습니다. (readme 제외)"""
+    info = document.get('projectInfo', {})
+    basic = info.get('basicInfo', {})
+    architecture = info.get('architectureInfo', {})
+    goals = info.get('portfolioGoals', {})
+    return {
+        'name': _join(basic.get('projectName')),
+        'tech': _join(*info.get('technicalInfo', {}).values()),
+        'objectives': _join(basic.get('mainObjectives')),
+        'features': _join(goals.get('keyHighlights'), goals.get('uniqueSellingPoints')),
+        'challenges': _join(architecture.get('painPoints'), architecture.get('desiredImprovements')),
+    }
+
+
+def index_document(conn: sqlite3.Connection, project_id: int, document: Dict[str, Any]):
+    """프로젝트 행을 다시 씁니다. README 컬럼은 기존 값을 유지합니다."""
+    row = conn.execute('SELECT readme FROM project_search WHERE rowid = ?', (project_id,)).fetchone()
+    fields = document_fields(document)
+    fields['readme'] = row[0] if row else ''
+    _write(conn, project_id, fields)
+
+
+def set_readme_text(conn: sqlite3.Connection, project_id: int, text: str):
+    """README에서 뽑은 텍스트를 색인합니다."""
+    row = conn.execute(
+        f"SELECT {', '.join(COLUMN_NAMES)} FROM project_search WHERE rowid = ?", (project_id,)
+    ).fetchone()
+    fields = dict(zip(COLUMN_NAMES, row)) if row else {name: '' for name in COLUMN_NAMES}
+    fields['readme'] = text[:README_MAX_CHARS]
+    _write(conn, project_id, fields)
+
+
+def _write(conn: sqlite3.Connection, project_id: int, fields: Dict[str, str]):
+    conn.execute('DELETE FROM project_search WHERE rowid = ?', (project_id,))
+    conn.execute(
+        f"INSERT INTO project_search (rowid, {', '.join(COLUMN_NAMES)}) "
+        f"VALUES (?, {', '.join('?' for _ in COLUMN_NAMES)})",
+        [project_id, *(fields[name] for name in COLUMN_NAMES)]
+    )
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def search(conn: sqlite3.Connection, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+    """검색어의 모든 단어를 포함하는 프로젝트를 BM25 순으로 반환합니다."""
+    terms = [term for term in query.split() if term]
+    if not terms:
+        return {'total': 0, 'results': []}
+
+    long_terms = [term for term in terms if len(term) >= MIN_TOKEN_CHARS]
+    short_terms = [term for term in terms if len(term) < MIN_TOKEN_CHARS]
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    if long_terms:
+        clauses.append('project_search MATCH ?')
+        params.append(' AND '.join(_quote(term) for term in long_terms))
+    for term in short_terms:
+        clauses.append(f"instr(lower({' || char(10) || '.join(COLUMN_NAMES)}), lower(?)) > 0")
+        params.append(term)
+    where = ' AND '.join(clauses)
+
+    total = conn.execute(f'SELECT COUNT(*) FROM project_search WHERE {where}', params).fetchone()[0]
+    if long_terms:
+        weights = ', '.join(str(weight) for _, weight in COLUMNS)
+        select = f"rowid, name, bm25(project_search, {weights}), snippet(project_search, -1, '[', ']', '…', 16)"
+        order = 'ORDER BY 3'
+    else:
+        # 색인을 쓸 수 없는 짧은 검색어만 있으면 순위가 없으므로 페이지가 흔들리지 않게 이름 순으로 고정
+        select = 'rowid, name, NULL, NULL'
+        order = 'ORDER BY name COLLATE NOCASE, rowid'
+    rows = conn.execute(
+        f'SELECT {select} FROM project_search WHERE {where} {order} LIMIT ? OFFSET ?',
+        [*params, limit, offset]
+    ).fetchall()
+
+    return {
+        'total': total,
+        'results': [
+            {'id': row[0], 'projectName': row[1], 'score': -row[2] if row[2] is not None else None, 'snippet': row[3]}
+            for row in rows
+        ],
+    }
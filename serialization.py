@@ -0,0 +1,184 @@
+"""
+JSON 직렬화
+
+도구 응답과 섹션 저장에 쓰는 JSON 인코딩/디코딩을 한 곳에서 처리합니다.
+
+- 설치되어 있으면 orjson, 없으면 msgspec, 둘 다 없으면 표준 json을 씁니다 (선택 의존성).
+  SERIALIZATION_BACKEND로 강제할 수 있습니다 (auto|orjson|msgspec|json).
+- 기본 출력은 공백 없는 compact JSON이며 indent=True일 때만 2칸 들여쓰기를 합니다.
+  한글 등 비 ASCII 문자는 이스케이프하지 않습니다 (json.dumps(ensure_ascii=False)와 같음).
+- Record는 __slots__로 필드를 선언하는 타입 있는 레코드입니다. 인코더가 dict로 바꾸지 않고 바로 씁니다.
+
+    serialization.dumps(project)               # '{"projectInfo":{...}}'
+    serialization.dumps(project, indent=True)  # 사람이 읽기 위한 출력
+"""
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Callable, ClassVar, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+BACKEND_PREFERENCE = ('orjson', 'msgspec', 'json')
+
+
+class Record:
+    """__slots__로 필드를 선언하는 가벼운 레코드
+
+    필드 타입은 클래스 애너테이션으로, 기본값은 _defaults로, 읽을 때의 변환(중첩 레코드, datetime 등)은
+    _decoders로 선언합니다. 인스턴스마다 __dict__가 없어 dict나 Pydantic 모델보다 작고 빠릅니다.
+    """
+    __slots__ = ()
+    _defaults: ClassVar[Dict[str, Any]] = {}
+    _decoders: ClassVar[Dict[str, Callable[[Any], Any]]] = {}
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.__slots__):
+            raise TypeError(f"{type(self).__name__}: 인자가 너무 많습니다.")
+        values = dict(zip(self.__slots__, args))
+        values.update(kwargs)
+        for name in self.__slots__:
+            if name in values:
+                setattr(self, name, values.pop(name))
+            elif name in self._defaults:
+                setattr(self, name, self._defaults[name])
+            else:
+                raise TypeError(f"{type(self).__name__}: {name} 값이 없습니다.")
+        if values:
+            raise TypeError(f"{type(self).__name__}: 알 수 없는 필드 {', '.join(values)}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON으로 쓸 수 있는 dict (중첩 레코드와 datetime도 변환)"""
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        values = {}
+        for name in cls.__slots__:
+            if name in data:
+                decode = cls._decoders.get(name)
+                values[name] = decode(data[name]) if decode and data[name] is not None else data[name]
+        return cls(**values)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def records(cls) -> Callable[[List[Dict[str, Any]]], list]:
+    """_decoders에 쓰는 '레코드 목록' 변환 함수"""
+    return lambda items: [cls.from_dict(item) for item in items]
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+
+def _default(value: Any) -> Any:
+    """각 백엔드가 직접 인코딩하지 못하는 값의 변환"""
+    if isinstance(value, Record):
+        return {name: getattr(value, name) for name in value.__slots__}
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"JSON으로 직렬화할 수 없는 값입니다: {type(value).__name__}")
+
+
+class Codec:
+    """JSON 인코더/디코더 한 쌍"""
+
+    def __init__(self, name: str, dumps: Callable[[Any, bool], str], loads: Callable[[Any], Any]):
+        self.name = name
+        self._dumps = dumps
+        self.loads = loads
+
+    def dumps(self, value: Any, indent: bool = False) -> str:
+        return self._dumps(value, indent)
+
+
+def _orjson_codec() -> Codec:
+    compact = orjson.OPT_NON_STR_KEYS
+    pretty = compact | orjson.OPT_INDENT_2
+
+    def dumps(value, indent):
+        return orjson.dumps(value, default=_default, option=pretty if indent else compact).decode()
+    return Codec('orjson', dumps, orjson.loads)
+
+
+def _msgspec_codec() -> Codec:
+    encoder = msgspec.json.Encoder(enc_hook=_default)
+    decoder = msgspec.json.Decoder()
+
+    def dumps(value, indent):
+        data = encoder.encode(value)
+        return (msgspec.json.format(data, indent=2) if indent else data).decode()
+    return Codec('msgspec', dumps, decoder.decode)
+
+
+def _json_codec() -> Codec:
+    compact = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_default)
+    pretty = json.JSONEncoder(ensure_ascii=False, indent=2, default=_default)
+
+    def dumps(value, indent):
+        return (pretty if indent else compact).encode(value)
+    return Codec('json', dumps, json.loads)
+
+
+_FACTORIES = {
+    'orjson': (lambda: orjson is not None, _orjson_codec),
+    'msgspec': (lambda: msgspec is not None, _msgspec_codec),
+    'json': (lambda: True, _json_codec),
+}
+
+
+def available_backends() -> List[str]:
+    """설치되어 사용할 수 있는 백엔드 (선호 순)"""
+    return [name for name in BACKEND_PREFERENCE if _FACTORIES[name][0]()]
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """이름으로 코덱을 만듭니다. 생략하거나 'auto'면 설치된 것 중 가장 빠른 백엔드를 씁니다."""
+    if name in (None, '', 'auto'):
+        name = available_backends()[0]
+    if name not in _FACTORIES:
+        raise ValueError(f"알 수 없는 직렬화 백엔드입니다: {name}")
+    installed, factory = _FACTORIES[name]
+    if not installed():
+        raise ValueError(f"{name}이(가) 설치되어 있지 않습니다.")
+    return factory()
+
+
+codec = get_codec(os.getenv('SERIALIZATION_BACKEND', 'auto'))
+BACKEND = codec.name
+
+
+def dumps(value: Any, indent: bool = False) -> str:
+    """JSON 문자열 (기본은 compact, indent=True면 2칸 들여쓰기)"""
+    return codec.dumps(value, indent)
+
+
+def loads(data: Any) -> Any:
+    """JSON 문자열(또는 bytes)을 파이썬 값으로"""
+    return codec.loads(data)
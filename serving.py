@@ -0,0 +1,285 @@
+"""
+HTTP 서빙 (한 배포를 여러 에이전트가 공유)
+
+`python project_portfolio_server.py`는 FastAPI 앱(/health, /metrics)에 MCP streamable HTTP(/mcp)와
+SSE(/sse, /messages/) 전송을 함께 올려 uvicorn으로 서빙합니다. `--transport stdio`는 기존처럼
+클라이언트마다 stdio 프로세스 하나로 실행합니다.
+
+- 여러 워커: HTTP_WORKERS개의 uvicorn 프로세스가 같은 SQLite 파일(WAL, busy_timeout)을 공유합니다.
+  요청이 어느 워커로 갈지 알 수 없으므로 워커가 둘 이상이면 streamable HTTP를 stateless로 실행하고,
+  세션을 프로세스 메모리에 두는 SSE는 끕니다(MCP_STATELESS_HTTP, MCP_SSE의 기본값은 import 시점의
+  HTTP_WORKERS로 정해지며 직접 설정하면 그 값을 씀). 마이그레이션과 작업 큐는 이미 여러 프로세스에서 안전합니다.
+  워커는 uvicorn 내부 supervisor 대신 WorkerSupervisor가 uvicorn 공개 API로 띄웁니다. 종료 신호 없이
+  끝난 워커는 WORKER_RESTART_DELAY초(연달아 죽으면 두 배씩, 최대 WORKER_RESTART_MAX초) 뒤 다시 띄웁니다.
+- backpressure: 워커마다 동시에 실행하는 도구 호출을 MAX_CONCURRENT_TOOL_CALLS개로 제한합니다.
+  자리가 날 때까지 TOOL_QUEUE_TIMEOUT초 기다리고, 그래도 없으면 ServerBusy로 바로 거절합니다.
+  동기 도구는 이벤트 루프(다른 호출, 작업 큐)를 막지 않도록 스레드에서 실행합니다.
+- graceful drain: SIGTERM을 받으면 readiness가 503을 반환하고 새 도구 호출을 거절합니다.
+  DRAIN_DELAY초 뒤 새 연결을 받지 않고(그 사이 신호를 한 번 더 받으면 바로), 실행 중인 요청은
+  SHUTDOWN_TIMEOUT초까지 기다린 다음 작업 큐를 멈춥니다. 워커가 여럿이면 모든 워커가 동시에 drain합니다. 실행 중이던 백그라운드 작업은 대기열로 돌아가 다른 워커가 이어서 실행합니다.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+import metrics
+
+HTTP_HOST = os.getenv('HTTP_HOST', '0.0.0.0')
+HTTP_PORT = int(os.getenv('HTTP_PORT', '8000'))
+HTTP_WORKERS = int(os.getenv('HTTP_WORKERS', '1'))
+# 워커가 여럿이면 세션 상태를 워커 사이에 공유할 수 없으므로 기본값이 바뀜.
+# import 시점의 HTTP_WORKERS로 정해지며, --workers로 바꾸면 serve()가 환경 변수로 워커에 넘겨 워커가 다시 계산함
+MCP_STATELESS_HTTP = os.getenv('MCP_STATELESS_HTTP', '1' if HTTP_WORKERS > 1 else '0') == '1'
+MCP_SSE = os.getenv('MCP_SSE', '1' if HTTP_WORKERS == 1 else '0') == '1'
+
+MAX_CONCURRENT_TOOL_CALLS = int(os.getenv('MAX_CONCURRENT_TOOL_CALLS', '16'))
+TOOL_QUEUE_TIMEOUT = float(os.getenv('TOOL_QUEUE_TIMEOUT', '5'))
+# SIGTERM 후 새 연결을 닫기 전까지 readiness 실패만 알리는 시간 (로드 밸런서가 빼 가도록)
+DRAIN_DELAY = float(os.getenv('DRAIN_DELAY', '0'))
+SHUTDOWN_TIMEOUT = float(os.getenv('SHUTDOWN_TIMEOUT', '30'))
+# 비정상 종료한 워커를 다시 띄우기 전 대기 시간 (초). 연달아 죽으면 두 배씩 늘림
+WORKER_RESTART_DELAY = float(os.getenv('WORKER_RESTART_DELAY', '1'))
+WORKER_RESTART_MAX = 30.0
+# 이보다 오래 실행된 워커가 죽으면 대기 시간을 처음부터 다시 셈
+WORKER_STABLE_AFTER = 60.0
+
+logger = logging.getLogger('uvicorn.error')
+
+TOOL_REJECTED = metrics.REGISTRY.register(metrics.Counter(
+    'mcp_tool_rejected_total', '동시 호출 제한(reason=busy)이나 종료 중(reason=draining)으로 거절한 도구 호출 수',
+    ('tool', 'reason')))
+
+
+class ServerBusy(Exception):
+    """동시 호출 제한을 넘었거나 종료 중이라 도구 호출을 거절함"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ToolLimiter:
+    """프로세스 안의 동시 도구 호출 수 제한"""
+
+    def __init__(self, limit: int = MAX_CONCURRENT_TOOL_CALLS, queue_timeout: float = TOOL_QUEUE_TIMEOUT):
+        self.limit = max(limit, 1)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.draining = False
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # 세마포어는 이벤트 루프에 묶이므로 루프가 바뀌면(테스트, 스크립트) 새로 만듦
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+        return self._semaphore
+
+    def _reject(self, tool: str, reason: str, message: str, retry_after: float):
+        TOOL_REJECTED.inc(tool=tool, reason=reason)
+        raise ServerBusy(message, retry_after)
+
+    @asynccontextmanager
+    async def slot(self, tool: str):
+        """도구 호출 한 건의 실행 자리. 자리가 없으면 queue_timeout초까지 기다립니다."""
+        if self.draining:
+            self._reject(tool, 'draining', "서버가 종료 중입니다. 다른 인스턴스로 다시 시도하세요.", 1)
+        semaphore = self._get_semaphore()
+        if semaphore.locked():
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._reject(tool, 'busy', f"동시 도구 호출이 {self.limit}개로 가득 찼습니다. "
+                                           f"{self.queue_timeout:.0f}초 뒤 다시 시도하세요.", self.queue_timeout)
+            finally:
+                self.waiting -= 1
+        else:
+            await semaphore.acquire()
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'inFlight': self.in_flight,
+            'waiting': self.waiting,
+            'limit': self.limit,
+            'draining': self.draining,
+        }
+
+
+limiter = ToolLimiter()
+
+
+def limit_tool(fn: Callable, name: Optional[str] = None) -> Callable:
+    """도구 함수를 limiter로 감쌉니다. 동기 함수는 스레드에서 실행하는 비동기 함수가 됩니다.
+
+    functools.wraps로 시그니처를 보존하므로 FastMCP가 인자 스키마를 그대로 만듭니다.
+    """
+    tool = name or fn.__name__
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            async with limiter.slot(tool):
+                return await fn(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        async with limiter.slot(tool):
+            return await asyncio.to_thread(fn, *args, **kwargs)
+    return wrapper
+
+
+def _collect_metrics():
+    yield ('mcp_tool_calls_in_flight', 'gauge', '실행 중인 도구 호출 수', [({}, limiter.in_flight)])
+    yield ('mcp_tool_calls_waiting', 'gauge', '실행 자리를 기다리는 도구 호출 수', [({}, limiter.waiting)])
+    yield ('server_draining', 'gauge', '종료 중이면 1', [({}, int(limiter.draining))])
+
+
+metrics.register_collector('serving', _collect_metrics)
+
+
+def _server_class():
+    import uvicorn
+
+    class DrainingServer(uvicorn.Server):
+        """SIGTERM/SIGINT를 받으면 먼저 drain 상태로 바꾸고 DRAIN_DELAY초 뒤 종료를 시작하는 uvicorn 서버"""
+
+        def handle_exit(self, sig, frame):
+            if limiter.draining or DRAIN_DELAY <= 0:
+                limiter.draining = True
+                return super().handle_exit(sig, frame)
+            limiter.draining = True
+            try:
+                asyncio.get_running_loop().call_later(DRAIN_DELAY, super().handle_exit, sig, frame)
+            except RuntimeError:
+                super().handle_exit(sig, frame)
+
+    return DrainingServer
+
+
+def _run_server(config, sockets=None):
+    # 워커 프로세스에서도 이 함수로 시작하므로 서버 클래스를 pickle할 필요가 없음
+    _server_class()(config).run(sockets=sockets)
+
+
+def _worker(config, sockets):
+    # spawn으로 시작한 워커 프로세스의 진입점 (로깅 설정은 pickle되지 않으므로 다시 적용)
+    config.configure_logging()
+    _run_server(config, sockets)
+
+
+class WorkerSupervisor:
+    """워커 프로세스를 띄우고 종료 신호를 모든 워커에 한 번에 전달하는 supervisor
+
+    종료 신호 없이 끝난(비정상 종료한) 워커는 로그를 남기고 대기 시간 뒤 같은 자리에 다시 띄웁니다.
+
+    uvicorn의 Multiprocess는 생성자 인자와 속성이 버전마다 바뀌는 내부 API이므로 쓰지 않고,
+    공개 API(Config.bind_socket, Server.run)와 multiprocessing으로 워커를 관리합니다.
+    drain은 워커마다 DrainingServer가 처리합니다.
+    """
+
+    def __init__(self, config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.processes: List[multiprocessing.Process] = []
+        self._stop = threading.Event()
+        # 워커 자리별 시작 시각, 연속 비정상 종료 횟수, 다시 띄울 시각
+        self._started: List[float] = []
+        self._failures: List[int] = []
+        self._restart_at: List[Optional[float]] = []
+
+    def _handle_signal(self, sig, frame):
+        # 두 번째 신호도 그대로 전달하므로 drain 중인 워커는 바로 종료를 시작함
+        self._stop.set()
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+
+    def _spawn(self, context, sockets) -> multiprocessing.Process:
+        process = context.Process(target=_worker, args=(self.config, sockets))
+        process.start()
+        # 시작하는 사이 종료 신호를 받았으면 새 워커도 멈춤
+        if self._stop.is_set():
+            process.terminate()
+        return process
+
+    def _check_workers(self, context, sockets):
+        """종료 신호 없이 끝난 워커를 대기 시간 뒤 다시 띄웁니다."""
+        now = time.monotonic()
+        for index, process in enumerate(self.processes):
+            if process.is_alive():
+                continue
+            if self._restart_at[index] is None:
+                if now - self._started[index] >= WORKER_STABLE_AFTER:
+                    self._failures[index] = 0
+                self._failures[index] += 1
+                delay = min(WORKER_RESTART_DELAY * 2 ** (self._failures[index] - 1), WORKER_RESTART_MAX)
+                logger.warning("Worker process [%s] exited with code %s; restarting in %.1fs",
+                               process.pid, process.exitcode, delay)
+                self._restart_at[index] = now + delay
+            elif now >= self._restart_at[index] and not self._stop.is_set():
+                process.join()
+                self.processes[index] = self._spawn(context, sockets)
+                self._started[index] = time.monotonic()
+                self._restart_at[index] = None
+
+    def run(self):
+        sockets = [self.config.bind_socket()]
+        context = multiprocessing.get_context('spawn')
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self._handle_signal)
+        try:
+            for _ in range(self.workers):
+                self.processes.append(self._spawn(context, sockets))
+                self._started.append(time.monotonic())
+                self._failures.append(0)
+                self._restart_at.append(None)
+            # 종료 신호를 받을 때까지 죽은 워커를 다시 띄우며 대기
+            while not self._stop.wait(0.5):
+                self._check_workers(context, sockets)
+            for process in self.processes:
+                process.join()
+        finally:
+            for sock in sockets:
+                sock.close()
+
+
+def serve(app: Any, import_path: str, host: str = HTTP_HOST, port: int = HTTP_PORT, workers: int = HTTP_WORKERS):
+    """uvicorn으로 앱을 서빙합니다.
+
+    워커가 여럿이면 각 워커 프로세스가 import_path('모듈:속성')로 앱을 다시 불러오고,
+    하나면 이 프로세스에서 app을 그대로 씁니다.
+    """
+    import uvicorn
+
+    # 워커 프로세스는 모듈을 새로 불러오므로 워커 수에 따른 기본값(stateless, SSE)을 환경 변수로 넘김
+    os.environ['HTTP_WORKERS'] = str(workers)
+    config = uvicorn.Config(
+        import_path if workers > 1 else app,
+        host=host,
+        port=port,
+        lifespan='on',
+        timeout_graceful_shutdown=SHUTDOWN_TIMEOUT,
+    )
+    if workers > 1:
+        WorkerSupervisor(config, workers).run()
+    else:
+        _run_server(config)
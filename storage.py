@@ -0,0 +1,164 @@
+"""
+SQLite 저장소 계층
+
+모든 MCP 도구는 이 모듈의 커넥션 풀을 통해 데이터베이스에 접근합니다.
+커넥션은 스레드별로 한 번만 열리고, WAL 모드와 튜닝된 PRAGMA가 적용된 채로
+재사용됩니다. SQL 문은 모듈 상수로 두어 sqlite3의 statement 캐시가
+컴파일된 문장을 그대로 재사용하도록 합니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterable, List, Optional, Sequence
+
+import metrics
+from migrations import migrate
+
+# 데이터베이스 파일 경로
+DB_PATH = os.getenv('PORTFOLIO_DB', 'portfolio.db')
+
+# 커넥션마다 한 번 적용되는 PRAGMA
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+)
+
+# 커넥션별로 캐시할 prepared statement 수
+STATEMENT_CACHE_SIZE = 256
+
+
+class TimedConnection(sqlite3.Connection):
+    """execute/executemany 실행 시간을 metrics에 기록하는 커넥션"""
+
+    def execute(self, sql: str, *args) -> sqlite3.Cursor:
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, *args)
+        finally:
+            metrics.query_timer(sql).observe(time.perf_counter() - start)
+
+    def executemany(self, sql: str, *args) -> sqlite3.Cursor:
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, *args)
+        finally:
+            metrics.query_timer(sql).observe(time.perf_counter() - start)
+
+
+class ConnectionPool:
+    """스레드별 SQLite 커넥션 풀"""
+
+    def __init__(self, path: str = DB_PATH, statement_cache_size: int = STATEMENT_CACHE_SIZE):
+        self.path = path
+        self.statement_cache_size = statement_cache_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._pid = os.getpid()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            cached_statements=self.statement_cache_size,
+            check_same_thread=False,
+            factory=TimedConnection,
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """현재 스레드의 커넥션을 반환합니다. 없으면 새로 엽니다."""
+        # fork된 워커는 부모 프로세스의 커넥션을 재사용하면 안 됨
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _reset_after_fork(self):
+        self._pid = os.getpid()
+        self._local = threading.local()
+        with self._lock:
+            self._connections = []
+
+    @contextmanager
+    def transaction(self):
+        """커밋/롤백을 자동으로 처리하는 트랜잭션 컨텍스트"""
+        conn = self.connection()
+        with conn:
+            yield conn
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        """단일 문장을 실행하고 커밋합니다."""
+        with self.transaction() as conn:
+            return conn.execute(sql, params)
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> sqlite3.Cursor:
+        """여러 행을 한 트랜잭션에서 실행합니다."""
+        with self.transaction() as conn:
+            return conn.executemany(sql, seq_of_params)
+
+    def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[tuple]:
+        return self.connection().execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        return self.connection().execute(sql, params).fetchall()
+
+    def ping(self) -> bool:
+        """커넥션이 살아있는지 확인합니다."""
+        return self.fetchone("SELECT 1") == (1,)
+
+    def close_all(self):
+        """풀에 열린 모든 커넥션을 닫습니다."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """프로세스 전역 커넥션 풀을 반환합니다.
+
+    처음 호출될 때 스키마 마이그레이션을 확인합니다.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool()
+                migrate(pool.connection())
+                _pool = pool
+    return _pool
+
+
+def configure(path: str) -> ConnectionPool:
+    """다른 데이터베이스 파일을 사용하도록 전역 풀을 교체합니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+        pool = ConnectionPool(path)
+        migrate(pool.connection())
+        _pool = pool
+    return _pool
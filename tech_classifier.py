@@ -0,0 +1,300 @@
+"""
+기술 스택 분류기
+
+tech_taxonomy.yaml의 분류표를 한 번 읽어 두 가지 매처로 컴파일합니다.
+
+- 해시 테이블: GitHub 언어 이름과 의존성 이름을 정확히 일치로 한 번에 조회
+- Aho-Corasick 오토마톤: README 본문이나 의존성 이름에 들어 있는 모든 별칭을
+  텍스트 길이에 비례하는 한 번의 스캔으로 찾음 (가장 왼쪽, 가장 긴 별칭 우선)
+
+매니페스트(package.json, requirements.txt, pom.xml, build.gradle, pubspec.yaml)에서
+의존성 이름을 뽑는 파서도 함께 제공합니다. 매니페스트 목록은 저장소 트리 조회
+한 번으로 찾습니다 (RepoSnapshot.manifests).
+"""
+import json
+import os
+import posixpath
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from lazy_import import lazy_import
+
+# 분류표를 처음 읽을 때 로드
+yaml = lazy_import('yaml')
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TAXONOMY_PATH = os.getenv('TECH_TAXONOMY', os.path.join(BASE_DIR, 'tech_taxonomy.yaml'))
+
+# technicalInfo 키 순서 (분류표에 없는 언어는 마지막 분류로)
+CATEGORIES = ('frontendTech', 'backendTech', 'database', 'deployment', 'otherTools')
+DEFAULT_CATEGORY = 'otherTools'
+
+# 본문 검색에 쓰지 않는 짧은 언어 이름 기준 (Go, C, R 등은 일반 단어와 겹침)
+MIN_TEXT_LANGUAGE_CHARS = 3
+
+# 인식하는 매니페스트 파일 이름
+MANIFEST_FILES = ('package.json', 'requirements.txt', 'pom.xml', 'build.gradle', 'build.gradle.kts', 'pubspec.yaml')
+# 매니페스트를 찾지 않는 디렉토리
+IGNORED_DIRS = frozenset(('node_modules', 'vendor', '.git', 'build', 'dist', 'target', '.dart_tool', 'venv', '.venv'))
+# 저장소당 읽을 최대 매니페스트 수 (얕은 경로 우선)
+MAX_MANIFESTS = 20
+
+_WORD_CHAR = re.compile(r'[0-9a-z]')
+_REQUIREMENT_NAME = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+_GRADLE_DEPENDENCY = re.compile(
+    r'''\b(?:implementation|api|compileOnly|runtimeOnly|testImplementation|kapt|annotationProcessor|classpath)'''
+    r'''\s*\(?\s*['"]([^'":]+):([^'":]+)'''
+)
+_GRADLE_PLUGIN = re.compile(r'''\bid\s*\(?\s*['"]([^'"]+)['"]''')
+
+
+class AhoCorasick:
+    """다중 문자열 매처
+
+    add()로 (패턴, 값)을 넣고 build()한 뒤 find()로 텍스트의 모든 일치를 찾습니다.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 노드에서 끝나는 (패턴 길이, 값) 목록 (실패 링크로 이어진 노드의 출력 포함)
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+
+    def add(self, pattern: str, value: Any):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append((len(pattern), value))
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> List[Tuple[int, int, Any]]:
+        """(시작, 끝, 값) 목록을 반환합니다. 겹치는 일치도 모두 포함합니다."""
+        matches = []
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, value in out[node]:
+                matches.append((index + 1 - length, index + 1, value))
+        return matches
+
+
+def _is_boundary(text: str, start: int, end: int) -> bool:
+    """일치 앞뒤가 영숫자가 아닌지 (단어 단위 일치)"""
+    return ((start == 0 or not _WORD_CHAR.match(text[start - 1]))
+            and (end == len(text) or not _WORD_CHAR.match(text[end])))
+
+
+class Taxonomy:
+    """컴파일된 기술 분류표"""
+
+    def __init__(self, data: Dict[str, Any]):
+        # 소문자 이름 -> (기술 이름, 분류)
+        self.languages: Dict[str, Tuple[str, str]] = {}
+        self.packages: Dict[str, Tuple[str, str]] = {}
+        self.text_matcher = AhoCorasick()
+        self.package_matcher = AhoCorasick()
+
+        for category, names in (data.get('languages') or {}).items():
+            for name in names or []:
+                self.languages[name.lower()] = (name, category)
+
+        for category, entries in (data.get('technologies') or {}).items():
+            for name, spec in (entries or {}).items():
+                if isinstance(spec, dict):
+                    aliases, packages = spec.get('aliases') or [], spec.get('packages') or []
+                else:
+                    aliases, packages = spec or [], []
+                tech = (name, category)
+                for alias in {name.lower(), *(alias.lower() for alias in aliases)}:
+                    self.text_matcher.add(alias, tech)
+                    self.package_matcher.add(alias, tech)
+                    self.packages[alias] = tech
+                for package in packages:
+                    self.package_matcher.add(package.lower(), tech)
+                    self.packages[package.lower()] = tech
+
+        # 본문에서는 같은 이름의 기술(vue -> Vue.js)이 언어보다 우선
+        for lowered, language in self.languages.items():
+            if len(lowered) >= MIN_TEXT_LANGUAGE_CHARS and lowered not in self.packages:
+                self.text_matcher.add(lowered, language)
+
+        self.text_matcher.build()
+        self.package_matcher.build()
+
+    @classmethod
+    def load(cls, path: str = TAXONOMY_PATH) -> 'Taxonomy':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(yaml.safe_load(f) or {})
+
+    @staticmethod
+    def _select(text: str, matches: List[Tuple[int, int, Any]]) -> List[Tuple[str, str]]:
+        """단어 단위 일치 중 겹치지 않는 가장 왼쪽, 가장 긴 것들을 고릅니다."""
+        result = []
+        position = 0
+        for start, end, tech in sorted(matches, key=lambda m: (m[0], -m[1])):
+            if start < position or not _is_boundary(text, start, end):
+                continue
+            result.append(tech)
+            position = end
+        return result
+
+    def find_in_text(self, text: str) -> List[Tuple[str, str]]:
+        """본문에 언급된 (기술 이름, 분류) 목록 (중복 제거, 등장 순서)"""
+        lowered = text.lower()
+        return list(dict.fromkeys(self._select(lowered, self.text_matcher.find(lowered))))
+
+    def classify_language(self, language: str) -> str:
+        entry = self.languages.get(language.lower())
+        return entry[1] if entry else DEFAULT_CATEGORY
+
+    def classify_package(self, package: str) -> List[Tuple[str, str]]:
+        """의존성 이름에 해당하는 기술. 정확히 일치하는 별칭이 우선입니다."""
+        lowered = package.lower()
+        entry = self.packages.get(lowered)
+        if entry:
+            return [entry]
+        return self._select(lowered, self.package_matcher.find(lowered))
+
+    def classify(self, languages: Iterable[str] = (), packages: Iterable[str] = ()) -> Dict[str, List[str]]:
+        """언어와 의존성 이름을 technicalInfo 형식({분류: [기술, ...]})으로 분류합니다."""
+        result: Dict[str, List[str]] = {category: [] for category in CATEGORIES}
+        for language in languages:
+            result.setdefault(self.classify_language(language), []).append(language)
+        for package in packages:
+            for name, category in self.classify_package(package):
+                techs = result.setdefault(category, [])
+                if name not in techs:
+                    techs.append(name)
+        return result
+
+
+_taxonomy: Optional[Taxonomy] = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> Taxonomy:
+    """프로세스 전역 분류표를 반환합니다."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = Taxonomy.load()
+    return _taxonomy
+
+
+# ----------------------------------------------------------------------
+# 매니페스트
+
+def select_manifests(paths: Iterable[str]) -> List[str]:
+    """트리의 파일 경로 중 읽을 매니페스트 경로를 고릅니다. (얕은 경로 우선, 최대 MAX_MANIFESTS개)"""
+    selected = [
+        path for path in paths
+        if posixpath.basename(path) in MANIFEST_FILES
+        and not IGNORED_DIRS.intersection(path.split('/')[:-1])
+    ]
+    selected.sort(key=lambda path: (path.count('/'), path))
+    return selected[:MAX_MANIFESTS]
+
+
+def _package_json(text: str) -> List[str]:
+    data = json.loads(text)
+    names = []
+    for key in ('dependencies', 'devDependencies', 'peerDependencies'):
+        names.extend((data.get(key) or {}).keys())
+    return names
+
+
+def _requirements_txt(text: str) -> List[str]:
+    names = []
+    for line in text.splitlines():
+        line = line.split('#', 1)[0]
+        if line.strip().startswith('-'):
+            continue
+        match = _REQUIREMENT_NAME.match(line)
+        if match:
+            names.append(match.group(1))
+    return names
+
+
+def _pom_xml(text: str) -> List[str]:
+    root = ElementTree.fromstring(text)
+    names = []
+    for dependency in root.iterfind('.//{*}dependency'):
+        for tag in ('groupId', 'artifactId'):
+            element = dependency.find(f'{{*}}{tag}')
+            if element is not None and element.text:
+                names.append(element.text.strip())
+    for plugin in root.iterfind('.//{*}plugin'):
+        element = plugin.find('{*}artifactId')
+        if element is not None and element.text:
+            names.append(element.text.strip())
+    return names
+
+
+def _build_gradle(text: str) -> List[str]:
+    names = []
+    for group, artifact in _GRADLE_DEPENDENCY.findall(text):
+        names.extend((group, artifact))
+    names.extend(_GRADLE_PLUGIN.findall(text))
+    return names
+
+
+def _pubspec_yaml(text: str) -> List[str]:
+    data = yaml.safe_load(text) or {}
+    names = []
+    for key in ('dependencies', 'dev_dependencies'):
+        names.extend((data.get(key) or {}).keys())
+    return names
+
+
+MANIFEST_PARSERS = {
+    'package.json': _package_json,
+    'requirements.txt': _requirements_txt,
+    'pom.xml': _pom_xml,
+    'build.gradle': _build_gradle,
+    'build.gradle.kts': _build_gradle,
+    'pubspec.yaml': _pubspec_yaml,
+}
+
+
+def parse_manifest(path: str, text: str) -> List[str]:
+    """매니페스트에서 의존성 이름을 추출합니다. 형식이 잘못된 파일은 빈 목록"""
+    parser = MANIFEST_PARSERS.get(posixpath.basename(path))
+    if parser is None:
+        return []
+    try:
+        return parser(text)
+    except (ValueError, ElementTree.ParseError, yaml.YAMLError, AttributeError):
+        return []
+
+
+def manifest_packages(manifests: Dict[str, str]) -> List[str]:
+    """{경로: 내용} 매니페스트들의 의존성 이름 (중복 제거)"""
+    names: Dict[str, None] = {}
+    for path, text in manifests.items():
+        names.update(dict.fromkeys(parse_manifest(path, text)))
+    return list(names)
@@ -0,0 +1,32 @@
+"""
+테스트 공통 설정
+
+서버 모듈은 import 시점에 환경 변수(PORTFOLIO_DB, GITHUB_CACHE_DIR 등)를 읽으므로
+테스트 모듈을 불러오기 전에 임시 경로로 바꿔 둡니다.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+_TMP = tempfile.mkdtemp(prefix='portfolio_tests_')
+os.environ['PORTFOLIO_DB'] = os.path.join(_TMP, 'portfolio.db')
+os.environ['GITHUB_CACHE_DIR'] = os.path.join(_TMP, 'github_cache')
+os.environ.setdefault('GITHUB_CACHE', '0')
+
+
+@pytest.fixture
+def conn(tmp_path) -> sqlite3.Connection:
+    """마이그레이션을 마친 빈 데이터베이스 커넥션 (테스트마다 새 파일)"""
+    from migrations import migrate
+    from storage import ConnectionPool
+
+    pool = ConnectionPool(str(tmp_path / 'portfolio.db'))
+    migrate(pool.connection())
+    yield pool.connection()
+    pool.close_all()
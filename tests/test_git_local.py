@@ -0,0 +1,133 @@
+import asyncio
+import os
+import subprocess
+
+import pytest
+
+import git_local
+from git_local import LocalGitClient, LocalGitError
+
+FILES = {
+    'README.md': '# App\n\n## 주요 기능\n- 오프라인 분석\n',
+    'requirements.txt': 'fastapi==0.110.0\n',
+    'app.py': 'print("hello")\n' * 10,
+    'web/index.ts': 'export const x = 1;\n',
+    'node_modules/lib/index.js': 'module.exports = 1;\n' * 100,
+}
+
+
+def git(path, *args):
+    env = {**os.environ, 'GIT_AUTHOR_EMAIL': 'dev@example.com', 'GIT_COMMITTER_NAME': 'ci',
+           'GIT_COMMITTER_EMAIL': 'ci@example.com', 'GIT_CONFIG_GLOBAL': os.devnull, 'GIT_CONFIG_NOSYSTEM': '1'}
+    return subprocess.run(['git', '-C', str(path), *args], check=True, capture_output=True, env=env).stdout
+
+
+def commit(path, author: str, files: dict):
+    for name, text in files.items():
+        target = path / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding='utf-8')
+    git(path, 'add', '-A')
+    os.environ['GIT_AUTHOR_NAME'] = author
+    try:
+        git(path, 'commit', '-q', '-m', f"{author} commit")
+    finally:
+        del os.environ['GIT_AUTHOR_NAME']
+
+
+@pytest.fixture
+def repos(tmp_path, monkeypatch):
+    """허용 디렉터리(roots) 안의 클론 하나, 미러 디렉터리의 bare 미러 하나, 허용 디렉터리 밖의 클론 하나"""
+    roots, mirrors, outside = tmp_path / 'roots', tmp_path / 'mirrors', tmp_path / 'outside'
+    clone = roots / 'app'
+    clone.mkdir(parents=True)
+    git(clone, 'init', '-q', '-b', 'main')
+    commit(clone, 'alice', FILES)
+    commit(clone, 'bob', {'app.py': 'print("bye")\n'})
+    (mirrors / 'octo').mkdir(parents=True)
+    git(tmp_path, 'clone', '-q', '--mirror', str(clone), str(mirrors / 'octo' / 'app.git'))
+    outside.mkdir()
+    git(tmp_path, 'clone', '-q', str(clone), str(outside / 'secret'))
+
+    monkeypatch.setattr(git_local, 'LOCAL_REPO_ROOTS', [str(roots)])
+    monkeypatch.setattr(git_local, 'GIT_MIRROR_DIR', str(mirrors))
+    monkeypatch.setattr(git_local, 'GITHUB_BACKEND', 'auto')
+    return {'clone': clone, 'mirror': mirrors / 'octo' / 'app.git', 'outside': outside / 'secret',
+            'roots': roots, 'mirrors': mirrors}
+
+
+def test_resolve_allowed_paths(repos):
+    clone = str(repos['clone'])
+    assert git_local.resolve(clone) == os.path.realpath(clone)
+    assert git_local.resolve(f"file://{clone}") == os.path.realpath(clone)
+    assert os.path.realpath(git_local.resolve('https://github.com/octo/app')) == os.path.realpath(repos['mirror'])
+    assert git_local.resolve('https://github.com/octo/other') is None
+    assert git_local.resolve('not a url') is None
+
+
+@pytest.mark.parametrize('make_url', [
+    lambda r: str(r['outside']),
+    lambda r: f"file://{r['outside']}",
+    lambda r: f"{r['roots']}/../outside/secret",
+    lambda r: '/',
+])
+def test_resolve_rejects_paths_outside_roots(repos, make_url):
+    with pytest.raises(LocalGitError) as info:
+        git_local.resolve(make_url(repos))
+    assert info.value.status == 403
+
+
+def test_resolve_rejects_symlink_out_of_roots(repos):
+    link = repos['roots'] / 'link'
+    link.symlink_to(repos['outside'])
+    with pytest.raises(LocalGitError) as info:
+        git_local.resolve(str(link))
+    assert info.value.status == 403
+
+
+def test_resolve_without_roots_disables_local_paths(repos, monkeypatch):
+    monkeypatch.setattr(git_local, 'LOCAL_REPO_ROOTS', [])
+    monkeypatch.setattr(git_local, 'GIT_MIRROR_DIR', None)
+    with pytest.raises(LocalGitError, match='LOCAL_REPO_ROOTS') as info:
+        git_local.resolve(str(repos['clone']))
+    assert info.value.status == 403
+
+
+def test_resolve_non_repository_inside_roots(repos):
+    (repos['roots'] / 'plain').mkdir()
+    with pytest.raises(LocalGitError) as info:
+        git_local.resolve(str(repos['roots'] / 'plain'))
+    assert info.value.status == 404
+
+
+def test_mirror_names_cannot_escape_mirror_dir(repos):
+    assert git_local.mirror_path('../roots', str(repos['mirrors'])) is None
+    assert git_local.resolve('https://github.com/../..') is None
+    assert git_local.mirror_owner_urls('..', str(repos['mirrors'])) is None
+    assert git_local.mirror_owner_urls('octo', str(repos['mirrors'])) == ['https://github.com/octo/app']
+
+
+@pytest.mark.parametrize('key', ['clone', 'mirror'])
+def test_fetch_snapshot_offline(repos, key):
+    client = LocalGitClient()
+    commands = []
+    run = client._run
+
+    async def counting_run(path, *args, **kwargs):
+        commands.append(args[0])
+        return await run(path, *args, **kwargs)
+
+    client._run = counting_run
+    snapshot = asyncio.run(client.fetch_snapshot(str(repos[key])))
+
+    assert snapshot.readme_text.startswith('# App')
+    assert set(snapshot.languages) == {'Python', 'TypeScript'}
+    assert set(snapshot.manifests) == {'requirements.txt'}
+    assert snapshot.commit_count == 2
+    assert snapshot.branches == ['main']
+    assert snapshot.issues == []
+    assert snapshot.info['default_branch'] == 'main'
+    assert {author['login'] for author in snapshot.contribution_stats['contributors']} == {'alice', 'bob'}
+    assert snapshot.contribution_stats['totalCommits'] == 2
+    # README, 언어, 매니페스트가 트리 하나를 함께 씀
+    assert commands.count('ls-tree') == 1
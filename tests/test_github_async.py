@@ -0,0 +1,229 @@
+import asyncio
+
+import pytest
+
+import git_local
+import github_async
+import github_cache
+import job_queue
+import project_portfolio_server as server
+import token_pool
+from benchmarks.fake_github import FakeGitHub
+from github_async import AsyncGitHubClient, GitHubRateLimitError
+
+FULL_NAME = 'octo/potless'
+
+
+def run(fake, coroutine_fn, **kwargs):
+    """가짜 서버를 가리키는 클라이언트로 coroutine_fn(client)를 실행합니다."""
+    async def main():
+        async with AsyncGitHubClient(base_url=fake.url, **kwargs) as client:
+            return await coroutine_fn(client)
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def fake():
+    with FakeGitHub() as fake:
+        fake.add_sample_repo(FULL_NAME, issues=30)
+        yield fake
+
+
+def test_snapshot_from_fake_server(fake):
+    snapshot = run(fake, lambda client: client.fetch_snapshot(FULL_NAME))
+
+    repo = f"/repos/{FULL_NAME}"
+    assert fake.requests[repo] == 1
+    for path in ('/readme', '/languages', '/branches', '/commits', '/issues', '/git/trees/HEAD',
+                 '/stats/contributors', '/stats/commit_activity'):
+        assert fake.requests[repo + path] == 1, path
+    assert snapshot.info['description'] == 'AI 기반 포트홀 자동 탐지 시스템'
+    assert snapshot.commit_count == 512
+    assert snapshot.branches == ['main', 'develop', 'feature/detect', 'feature/upload']
+    assert len(snapshot.issues) == 30
+    assert set(snapshot.manifests) == {'app/pubspec.yaml', 'server/requirements.txt'}
+    assert {author['login'] for author in snapshot.contribution_stats['contributors']} == {'alice', 'bob', 'carol'}
+    with pytest.raises(AttributeError, match='스냅샷에 없는 리소스'):
+        run(fake, lambda client: client.fetch_snapshot(FULL_NAME, ('languages',))).readme_text
+
+
+def test_pagination_follows_link_headers():
+    with FakeGitHub(per_page_max=10) as fake:
+        fake.add_sample_repo(FULL_NAME, issues=25)
+        fake.add_repo('octo/many', branches=[f"b{i}" for i in range(23)])
+        issues = run(fake, lambda client: client.get_issues(FULL_NAME))
+        branches = run(fake, lambda client: client.get_branches('octo/many'))
+
+    assert sorted(issue['number'] for issue in issues) == list(range(1, 26))
+    assert fake.requests[f"/repos/{FULL_NAME}/issues"] == 3
+    assert branches == [f"b{i}" for i in range(23)]
+    assert fake.requests['/repos/octo/many/branches'] == 3
+
+
+def test_exhausted_token_is_skipped_until_all_run_out():
+    with FakeGitHub(rate_limit=3) as fake:
+        fake.add_sample_repo(FULL_NAME)
+        pool = token_pool.TokenPool.from_tokens(['first', 'second'])
+
+        async def six_then_one_more(client):
+            for _ in range(6):
+                assert await client.get_languages(FULL_NAME)
+            with pytest.raises(GitHubRateLimitError) as info:
+                await client.get_languages(FULL_NAME)
+            return info.value
+
+        error = run(fake, six_then_one_more, tokens=pool)
+
+    assert fake.requests_by_token == {'token first': 3, 'token second': 3}
+    # 소진된 토큰으로는 보내지 않고, 리셋까지 남은 시간을 알려 줌
+    assert fake.statuses[403] == 0
+    assert error.retry_after > github_async.MAX_RATE_LIMIT_WAIT
+
+
+def test_secondary_rate_limit_retries_with_another_token():
+    with FakeGitHub(secondary_limit_every=3) as fake:
+        fake.add_sample_repo(FULL_NAME)
+        pool = token_pool.TokenPool.from_tokens(['first', 'second'])
+
+        async def four_requests(client):
+            return [await client.get_languages(FULL_NAME) for _ in range(4)]
+
+        results = run(fake, four_requests, tokens=pool)
+
+    assert all(result['Dart'] == 120000 for result in results)
+    assert fake.statuses[403] == 1
+    assert sum(fake.requests_by_token.values()) == 5
+    assert len(fake.requests_by_token) == 2
+
+
+def test_etag_revalidation_uses_cache(fake, tmp_path):
+    cache = github_cache.ResponseCache(str(tmp_path / 'cache'))
+
+    async def fetch_twice(client):
+        first = await client.get_languages(FULL_NAME)
+        cached = await client.get_languages(FULL_NAME)
+        with github_async.revalidating():
+            revalidated = await client.get_languages(FULL_NAME)
+        return first, cached, revalidated
+
+    first, cached, revalidated = run(fake, fetch_twice, cache=cache)
+
+    assert first == cached == revalidated
+    assert fake.requests[f"/repos/{FULL_NAME}/languages"] == 2
+    assert fake.statuses[304] == 1
+    stats = cache.stats()
+    assert (stats['misses'], stats['hits'], stats['revalidated']) == (1, 1, 1)
+    # 304는 할당량을 쓰지 않음
+    assert fake.remaining == fake.rate_limit - 1
+
+
+def test_create_project_job_with_fake_server(fake, monkeypatch):
+    monkeypatch.setattr(git_local, 'GIT_MIRROR_DIR', None)
+
+    class Job:
+        def report(self, *args, **kwargs):
+            pass
+
+    async def create():
+        client = AsyncGitHubClient(base_url=fake.url)
+        monkeypatch.setattr(github_async, 'get_async_client', lambda: client)
+        async with client:
+            return await server.create_project_job(Job(), f"https://github.com/{FULL_NAME}")
+
+    project_id = asyncio.run(create())['project_id']
+    document = server.load_project(project_id)
+
+    github_info = document['projectInfo']['githubInfo']
+    assert github_info['repositoryUrl'] == f"https://github.com/{FULL_NAME}"
+    assert github_info['branchStructure'] == 'main, develop, feature/detect, feature/upload'
+    # GITHUB_INFO_RESOURCES만 요청
+    assert fake.requests[f"/repos/{FULL_NAME}/readme"] == 0
+    assert fake.requests[f"/repos/{FULL_NAME}/issues"] == 0
+
+
+def test_shared_client_is_per_loop_and_closed_with_it():
+    async def use_shared(close: bool):
+        client = github_async.get_async_client()
+        assert github_async.get_async_client() is client
+        if close:
+            await github_async.close_async_client()
+        return client
+
+    first = asyncio.run(use_shared(close=False))
+    second = asyncio.run(use_shared(close=True))
+
+    assert first is not second
+    # 끝난 루프의 클라이언트는 다음 루프에서 목록에서 빠지고, 닫은 클라이언트는 남지 않음
+    assert github_async._clients == {}
+    assert second._client.is_closed
+
+
+def test_failed_app_token_refresh_waits_before_retrying(fake):
+    class FailingAppToken(token_pool.AppInstallationToken):
+        attempts = 0
+
+        def refresh(self):
+            self.attempts += 1
+            raise RuntimeError('App 토큰 발급 서버 오류')
+
+    app = FailingAppToken('1', 'key', 42)
+    pool = token_pool.TokenPool([token_pool.TokenState('pat-1', 'first'), app])
+
+    async def two_requests(client):
+        return [await client.get_languages(FULL_NAME) for _ in range(2)]
+
+    run(fake, two_requests, tokens=pool)
+
+    # 실패한 토큰은 APP_TOKEN_RETRY_AFTER 동안 다시 발급하지 않고 나머지 토큰으로 요청
+    assert app.attempts == 1
+    assert not pool.expiring()
+    assert fake.requests_by_token == {'token first': 2}
+
+
+def test_bulk_create_records_partial_results(fake, monkeypatch):
+    monkeypatch.setattr(git_local, 'GIT_MIRROR_DIR', None)
+    monkeypatch.setattr(server, 'BULK_CHUNK', 1)
+    for name in ('octo/a', 'octo/b', 'octo/slow'):
+        fake.add_sample_repo(name, issues=0)
+    urls = [f"https://github.com/{name}" for name in ('octo/a', 'octo/b', 'octo/missing', 'octo/slow')]
+    fetch_snapshot = github_async.fetch_snapshot
+
+    async def slow_fetch_snapshot(url, resources):
+        if url.endswith('/slow'):
+            await asyncio.Event().wait()
+        return await fetch_snapshot(url, resources)
+
+    monkeypatch.setattr(github_async, 'fetch_snapshot', slow_fetch_snapshot)
+
+    async def main():
+        client = AsyncGitHubClient(base_url=fake.url)
+        monkeypatch.setattr(github_async, 'get_async_client', lambda: client)
+        async with client:
+            try:
+                job_id = (await server.bulk_create_projects(urls))['job_id']
+                # 마지막 저장소가 끝나지 않아도 저장된 프로젝트와 실패한 저장소가 부분 결과로 보임
+                deadline = asyncio.get_running_loop().time() + 10
+                while True:
+                    partial = server.get_job_result(job_id)['result']
+                    if partial and len(partial['created']) == 2 and partial['errors']:
+                        break
+                    assert asyncio.get_running_loop().time() < deadline, partial
+                    await asyncio.sleep(0.05)
+                running = server.get_job_status(job_id)
+                server.cancel_job(job_id)
+                cancelled = await job_queue.get_queue().wait(job_id, 5)
+                return partial, running, cancelled, server.get_job_result(job_id)
+            finally:
+                await job_queue.get_queue().stop()
+
+    partial, running, cancelled, final = asyncio.run(main())
+
+    assert running['status'] == 'running'
+    assert running['progress'] == 0.75
+    assert [error['github_url'] for error in partial['errors']] == [urls[2]]
+    assert {item['github_url'] for item in partial['created']} == set(urls[:2])
+    for item in partial['created']:
+        assert server.load_project(item['project_id'])['projectInfo']['githubInfo']['repositoryUrl'] == item['github_url']
+    # 취소해도 이미 저장한 프로젝트와 부분 결과는 남음
+    assert cancelled['status'] == 'cancelled'
+    assert final['result'] == partial
@@ -0,0 +1,49 @@
+import os
+
+import github_cache
+
+
+def blob_files(cache: github_cache.ResponseCache) -> set:
+    return {name for _, _, files in os.walk(cache._blob_dir) for name in files}
+
+
+def test_eviction_removes_only_unreferenced_blobs(tmp_path, monkeypatch):
+    cache = github_cache.ResponseCache(str(tmp_path / 'cache'), max_bytes=25)
+    cache.store('shared-old', '/a', {}, b'0123456789', 60)
+    cache.store('unique', '/b', {}, b'abcdefghij', 60)
+    cache.store('shared-new', '/c', {}, b'0123456789', 60)
+    assert len(blob_files(cache)) == 2
+
+    def no_walk(*args, **kwargs):
+        raise AssertionError('본문 디렉터리 전체를 훑으면 안 됩니다')
+
+    monkeypatch.setattr(github_cache.os, 'walk', no_walk)
+    # 가장 오래된 두 항목이 지워지지만, 'shared-old'의 본문은 'shared-new'가 아직 사용
+    cache.store('last', '/d', {}, b'ABCDEFGHIJ', 60)
+    monkeypatch.undo()
+
+    assert cache.stats()['evictions'] == 2
+    assert cache.lookup('shared-old') is None and cache.lookup('unique') is None
+    assert cache.lookup('shared-new')['body'] == b'0123456789'
+    assert cache.lookup('last')['body'] == b'ABCDEFGHIJ'
+    assert len(blob_files(cache)) == 2
+
+
+def test_store_rewrites_blob_removed_after_check(tmp_path):
+    cache = github_cache.ResponseCache(str(tmp_path / 'cache'))
+    write_blob = cache._write_blob
+    writes = []
+
+    def evicted_meanwhile(path, body):
+        write_blob(path, body)
+        if not writes:
+            # 존재 확인과 색인 기록 사이에 다른 스레드의 정리로 파일이 지워진 상황
+            os.remove(path)
+        writes.append(path)
+
+    cache._write_blob = evicted_meanwhile
+    cache.store('key', '/a', {}, b'body', 60)
+
+    # 색인을 기록하기 전에 락 안에서 파일을 다시 확인하므로 항목이 빈 파일을 가리키지 않음
+    assert len(writes) == 2
+    assert cache.lookup('key')['body'] == b'body'
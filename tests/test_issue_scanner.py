@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+import issue_scanner
+import project_store
+from benchmarks.fake_github import FakeGitHub
+from github_async import AsyncGitHubClient
+from storage import get_pool
+
+FULL_NAME = 'octo/potless'
+
+
+@pytest.fixture
+def fake():
+    with FakeGitHub() as fake:
+        fake.add_sample_repo(FULL_NAME, issues=30)
+        yield fake
+
+
+@pytest.fixture
+def project_id():
+    with get_pool().transaction() as conn:
+        return project_store.insert_project(conn, {'projectInfo': {'basicInfo': {'projectName': 'POTLESS'}}})
+
+
+def scan(fake, project_id: int, state: str = 'all', labels=None) -> issue_scanner.IssueScan:
+    """저장된 위치에서 이어 스캔하고 위치를 저장합니다."""
+    async def run():
+        async with AsyncGitHubClient(base_url=fake.url) as client:
+            resume = issue_scanner.load_scan_state(project_id, state, labels)
+            issue_scan = issue_scanner.IssueScan(client, FULL_NAME, state=state, labels=labels, **resume)
+            async for _ in issue_scan:
+                pass
+            return issue_scan
+    issue_scan = asyncio.run(run())
+    issue_scanner.save_scan_state(project_id, f"https://github.com/{FULL_NAME}", issue_scan)
+    return issue_scan
+
+
+def test_filtered_scan_does_not_advance_unfiltered_scan(fake, project_id):
+    assert scan(fake, project_id, labels=['feature']).scanned == 15
+    # 라벨 필터 스캔의 위치는 필터 없는 스캔에 쓰지 않으므로 더 오래된 이슈도 모두 읽음
+    assert issue_scanner.load_scan_state(project_id) == {}
+    assert scan(fake, project_id).scanned == 30
+
+    # 같은 필터끼리는 위치를 이어 씀
+    assert scan(fake, project_id).scanned == 0
+    assert scan(fake, project_id, labels=['feature']).scanned == 0
+    assert scan(fake, project_id, state='closed').scanned == 20
+
+
+def test_scan_scope_ignores_label_order():
+    assert issue_scanner.scan_scope('all', ['b', 'a', 'a']) == issue_scanner.scan_scope('all', ['a', 'b'])
+    assert issue_scanner.scan_scope('all') == issue_scanner.scan_scope('all', [])
+    assert issue_scanner.scan_scope('open') != issue_scanner.scan_scope('all')
@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import job_queue
+from job_queue import JobQueue
+
+
+@job_queue.handler('test_sleep')
+async def sleep_job(job, seconds: float):
+    await asyncio.sleep(seconds)
+    return {'slept': seconds}
+
+
+def test_wait_wakes_on_local_completion():
+    async def main():
+        queue = JobQueue(workers=1)
+        queue.start()
+        try:
+            job_id, _ = queue.submit('test_sleep', {'seconds': 0.01})
+            started = time.monotonic()
+            job = await queue.wait(job_id, 5)
+            return job, time.monotonic() - started, queue._waiters
+        finally:
+            await queue.stop()
+
+    job, elapsed, waiters = asyncio.run(main())
+    assert job['status'] == 'succeeded'
+    # 데이터베이스 폴링 주기를 기다리지 않고 바로 깨어남
+    assert elapsed < job_queue.POLL_INTERVAL / 2
+    assert waiters == {}
+
+
+def test_wait_wakes_on_local_cancel():
+    async def main():
+        queue = JobQueue(workers=1)
+        queue.start()
+        try:
+            job_id, _ = queue.submit('test_sleep', {'seconds': 30})
+            waiting = asyncio.ensure_future(queue.wait(job_id, 10))
+            await asyncio.sleep(0.05)
+            started = time.monotonic()
+            queue.cancel(job_id)
+            return await waiting, time.monotonic() - started
+        finally:
+            await queue.stop()
+
+    job, elapsed = asyncio.run(main())
+    assert job['status'] == 'cancelled'
+    assert elapsed < job_queue.POLL_INTERVAL / 2
+
+
+def test_wait_polls_jobs_run_by_another_worker():
+    async def main():
+        waiter, worker = JobQueue(workers=1), JobQueue(workers=1)
+        job_id, _ = waiter.submit('test_sleep', {'seconds': 0})
+        # waiter에는 워커가 없으므로 다른 프로세스처럼 데이터베이스로만 결과를 확인
+        worker.start()
+        try:
+            return await waiter.wait(job_id, 5)
+        finally:
+            await worker.stop()
+
+    assert asyncio.run(main())['status'] == 'succeeded'
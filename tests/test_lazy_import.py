@@ -0,0 +1,44 @@
+import sys
+import threading
+
+from lazy_import import lazy_import
+
+SLOW_MODULE = '''
+import time
+with open({log!r}, 'a') as f:
+    f.write('x')
+time.sleep(0.2)
+VALUE = 42
+'''
+
+
+def test_concurrent_first_access_loads_once(tmp_path, monkeypatch):
+    log = tmp_path / 'executions.log'
+    (tmp_path / 'lazy_slow_module.py').write_text(SLOW_MODULE.format(log=str(log)), encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'lazy_slow_module', raising=False)
+
+    module = lazy_import('lazy_slow_module')
+    assert not log.exists()
+
+    barrier = threading.Barrier(8)
+    values, errors = [], []
+
+    def access():
+        barrier.wait()
+        try:
+            values.append(module.VALUE)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=access) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 다른 스레드가 로딩 중인 모듈의 빈 네임스페이스를 보지 않고, 모듈 코드는 한 번만 실행
+    assert errors == []
+    assert values == [42] * 8
+    assert log.read_text() == 'x'
+    sys.modules.pop('lazy_slow_module')
@@ -0,0 +1,36 @@
+import json
+import sqlite3
+
+import migrations
+import project_store
+import search_index
+
+DOCUMENT = {
+    'projectInfo': {
+        'basicInfo': {'projectName': 'LEGACY', 'mainObjectives': ['지도 기반 신고'], 'extra': 1},
+        'technicalInfo': {'frontendTech': ['React'], 'custom': ['Redis']},
+        'architectureInfo': {'painPoints': ['느린 업로드'], 'currentStructure': {'layers': 3}},
+        'githubInfo': 'not a section',
+    },
+    'performance': None,
+}
+
+
+def test_v5_v6_migrate_legacy_documents(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'legacy.db'))
+    conn.execute('CREATE TABLE schema_version (version INTEGER PRIMARY KEY, description TEXT, '
+                 'applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)')
+    # v4까지 적용된 예전 데이터베이스 (문서는 projects.project_data에만 있음)
+    for version, description, step in migrations.MIGRATIONS[:4]:
+        step(conn)
+        conn.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)', (version, description))
+    project_id = conn.execute('INSERT INTO projects (project_data) VALUES (?)', (json.dumps(DOCUMENT),)).lastrowid
+    conn.commit()
+
+    assert migrations.migrate(conn) == migrations.LATEST_VERSION
+
+    assert project_store.load_project(conn, project_id) == DOCUMENT
+    assert [project['id'] for project in project_store.find_projects(conn, tech='redis')] == [project_id]
+    found = search_index.search(conn, '업로드')
+    assert [result['id'] for result in found['results']] == [project_id]
+    assert search_index.search(conn, 'LEGACY')['results'][0]['id'] == project_id
@@ -0,0 +1,117 @@
+import pytest
+
+import project_store
+from project_store import PatchConflict, PatchError
+
+
+def make_project(conn) -> int:
+    with conn:
+        return project_store.insert_project(conn, {
+            'projectInfo': {
+                'basicInfo': {'projectName': 'POTLESS', 'mainObjectives': ['포트홀 탐지']},
+                'achievements': {'2023': 'first'},
+            },
+            'performance': {'items': [1, 2]},
+        })
+
+
+def patch(conn, project_id: int, *operations, **kwargs):
+    with conn:
+        return project_store.apply_patch(conn, project_id, list(operations), **kwargs)
+
+
+def load(conn, project_id: int) -> dict:
+    return project_store.load_project(conn, project_id)
+
+
+def test_patch_nested_values(conn):
+    pid = make_project(conn)
+    result = patch(
+        conn, pid,
+        {'op': 'replace', 'path': '/projectInfo/basicInfo/projectName', 'value': 'POTLESS 2'},
+        {'op': 'add', 'path': '/projectInfo/basicInfo/mainObjectives/-', 'value': '끝'},
+        {'op': 'add', 'path': '/projectInfo/basicInfo/mainObjectives/0', 'value': '처음'},
+        {'op': 'add', 'path': '/performance/items/-', 'value': 3},
+        {'op': 'remove', 'path': '/performance/items/0'},
+        {'op': 'test', 'path': '/performance/items', 'value': [2, 3]},
+    )
+    assert result['applied'] == 6
+    document = load(conn, pid)
+    assert document['projectInfo']['basicInfo']['projectName'] == 'POTLESS 2'
+    assert document['projectInfo']['basicInfo']['mainObjectives'] == ['처음', '포트홀 탐지', '끝']
+    assert document['performance'] == {'items': [2, 3]}
+
+
+def test_digit_key_on_object_is_a_key(conn):
+    pid = make_project(conn)
+    patch(conn, pid,
+          {'op': 'add', 'path': '/projectInfo/achievements/2024', 'value': 'yr'},
+          {'op': 'replace', 'path': '/projectInfo/achievements/2023', 'value': 'updated'},
+          {'op': 'add', 'path': '/performance/0', 'value': 'zero'})
+    document = load(conn, pid)
+    assert document['projectInfo']['achievements'] == {'2023': 'updated', '2024': 'yr'}
+    assert document['performance']['0'] == 'zero'
+
+    patch(conn, pid, {'op': 'remove', 'path': '/projectInfo/achievements/2023'})
+    assert load(conn, pid)['projectInfo']['achievements'] == {'2024': 'yr'}
+
+
+@pytest.mark.parametrize('pointer,key', [
+    ('/performance/a.b', 'a.b'),
+    ('/performance/x[0]', 'x[0]'),
+    ('/performance/a~1b', 'a/b'),
+    ('/performance/m~0n', 'm~n'),
+    ('/performance/', ''),
+    ('/performance/한글 키', '한글 키'),
+])
+def test_keys_needing_path_quoting(conn, pointer, key):
+    pid = make_project(conn)
+    patch(conn, pid, {'op': 'add', 'path': pointer, 'value': 1})
+    assert load(conn, pid)['performance'][key] == 1
+    patch(conn, pid, {'op': 'replace', 'path': pointer, 'value': 2}, {'op': 'test', 'path': pointer, 'value': 2})
+    patch(conn, pid, {'op': 'remove', 'path': pointer})
+    assert key not in load(conn, pid)['performance']
+
+
+@pytest.mark.parametrize('key', ['say "hi"', 'a\\b', 'tab\tkey'])
+def test_keys_needing_json_escapes_are_rejected(conn, key):
+    pid = make_project(conn)
+    revision = project_store.get_version(conn, pid)[1]
+    pointer = '/performance/' + key
+    with pytest.raises(PatchError, match='표현할 수 없는 키'):
+        patch(conn, pid, {'op': 'add', 'path': pointer, 'value': 1})
+    assert project_store.get_version(conn, pid)[1] == revision
+    assert load(conn, pid)['performance'] == {'items': [1, 2]}
+
+
+def test_array_index_rules(conn):
+    pid = make_project(conn)
+    for pointer in ('/performance/items/01', '/performance/items/x', '/performance/items/²'):
+        with pytest.raises(PatchError, match='배열 인덱스가 아닙니다'):
+            patch(conn, pid, {'op': 'add', 'path': pointer, 'value': 0})
+    with pytest.raises(PatchError, match='범위를 벗어났습니다'):
+        patch(conn, pid, {'op': 'add', 'path': '/performance/items/5', 'value': 0})
+    with pytest.raises(PatchError, match='상위 값이 없습니다'):
+        patch(conn, pid, {'op': 'add', 'path': '/performance/missing/key', 'value': 0})
+
+
+def test_failed_operation_rolls_back_whole_patch(conn):
+    pid = make_project(conn)
+    version = project_store.get_version(conn, pid)
+    with pytest.raises(PatchError, match='test 실패'):
+        patch(conn, pid,
+              {'op': 'replace', 'path': '/projectInfo/basicInfo/projectName', 'value': 'X'},
+              {'op': 'test', 'path': '/performance/items', 'value': []})
+    assert project_store.get_version(conn, pid) == version
+    assert load(conn, pid)['projectInfo']['basicInfo']['projectName'] == 'POTLESS'
+
+
+def test_revision_conflict(conn):
+    pid = make_project(conn)
+    revision = project_store.get_version(conn, pid)[1]
+    result = patch(conn, pid, {'op': 'add', 'path': '/performance/p95', 'value': 90}, expected_revision=revision)
+    assert result['revision'] == revision + 1
+    with pytest.raises(PatchConflict) as info:
+        patch(conn, pid, {'op': 'add', 'path': '/performance/p95', 'value': 80}, expected_revision=revision)
+    assert info.value.revision == revision + 1
+    assert patch(conn, 999, {'op': 'add', 'path': '/performance/x', 'value': 1}) is None
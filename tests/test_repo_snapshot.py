@@ -0,0 +1,118 @@
+import asyncio
+import base64
+from collections import Counter
+
+import httpx
+import pytest
+
+import github_async
+import project_portfolio_server as server
+
+README = '''# POTLESS
+
+## 기획 배경
+- 포트홀 신고가 늦게 처리됨
+
+## 주요 기능
+### 1. 포트홀 탐지
+- 카메라 영상에서 실시간 탐지
+### 2. 지도 표시
+'''
+FULL_NAME = 'octo/potless'
+URL = f"https://github.com/{FULL_NAME}"
+TREE = {'README.md': 'sha-readme', 'pubspec.yaml': 'sha-pubspec', 'server/requirements.txt': 'sha-req',
+        'lib/main.dart': 'sha-main'}
+BLOBS = {'sha-pubspec': 'name: potless\ndependencies:\n  firebase_core: ^2.24.0\n',
+         'sha-req': 'fastapi==0.110.0\n'}
+WEEK = 1704585600
+
+
+def encode(text: str) -> str:
+    return base64.b64encode(text.encode('utf-8')).decode()
+
+
+class FakeGitHubAPI:
+    """경로별 요청 수를 세는 GitHub REST 응답 (httpx.MockTransport 핸들러)"""
+
+    def __init__(self):
+        self.requests = Counter()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix(f"/repos/{FULL_NAME}")
+        key = '/git/blobs' if path.startswith('/git/blobs/') else path
+        self.requests[key] += 1
+        if path == '':
+            return httpx.Response(200, json={'name': 'potless', 'full_name': FULL_NAME,
+                                             'description': '포트홀 탐지', 'default_branch': 'main'})
+        if path == '/readme':
+            return httpx.Response(200, json={'content': encode(README)})
+        if path == '/languages':
+            return httpx.Response(200, json={'Dart': 9000, 'Python': 3000})
+        if path == '/branches':
+            return httpx.Response(200, json=[{'name': 'main'}, {'name': 'develop'}])
+        if path == '/commits':
+            link = f'<https://api.github.com/repos/{FULL_NAME}/commits?per_page=1&page=42>; rel="last"'
+            return httpx.Response(200, json=[{}], headers={'link': link})
+        if path == '/issues':
+            return httpx.Response(200, json=[{'number': 1, 'title': '[Feature] 지도 표시', 'body': '',
+                                              'updated_at': '2024-05-01T00:00:00Z'}])
+        if path == '/git/trees/HEAD':
+            return httpx.Response(200, json={'tree': [{'path': p, 'sha': s, 'type': 'blob'} for p, s in TREE.items()]})
+        if key == '/git/blobs':
+            return httpx.Response(200, json={'content': encode(BLOBS[path.rsplit('/', 1)[1]])})
+        if path == '/stats/contributors':
+            return httpx.Response(200, json=[{'author': {'login': 'alice'}, 'total': 42,
+                                              'weeks': [{'w': WEEK, 'a': 100, 'd': 10, 'c': 42}]}])
+        if path == '/stats/commit_activity':
+            return httpx.Response(200, json=[{'week': WEEK, 'total': 42}])
+        return httpx.Response(404, json={'message': 'Not Found'})
+
+
+@pytest.fixture
+def api():
+    return FakeGitHubAPI()
+
+
+def fetch(api, resources=github_async.SNAPSHOT_RESOURCES):
+    async def run():
+        async with github_async.AsyncGitHubClient(base_url='https://api.github.com', cache=None,
+                                                  transport=httpx.MockTransport(api)) as client:
+            return await client.fetch_snapshot(FULL_NAME, resources)
+    return asyncio.run(run())
+
+
+def test_snapshot_fetches_each_resource_once(api):
+    snapshot = fetch(api)
+    assert dict(api.requests) == {
+        '': 1, '/readme': 1, '/languages': 1, '/branches': 1, '/commits': 1, '/issues': 1,
+        '/git/trees/HEAD': 1, '/git/blobs': len(BLOBS), '/stats/contributors': 1, '/stats/commit_activity': 1,
+    }
+    assert snapshot.commit_count == 42
+    assert snapshot.branches == ['main', 'develop']
+    assert set(snapshot.manifests) == {'pubspec.yaml', 'server/requirements.txt'}
+
+
+def test_extractors_share_one_snapshot(api):
+    snapshot = fetch(api)
+    fetched = api.requests.copy()
+
+    info = server.extract_github_info(URL, snapshot)
+    tech_stack = server.extract_tech_stack(snapshot)
+    features, challenges, _ = server.extract_features_and_challenges(snapshot)
+    server.readme_search_text(snapshot.info['description'], snapshot)
+    server.extract_github_info(URL, snapshot)
+
+    # 필드마다 다시 요청하지 않고, README 색인도 한 번만 만듦
+    assert api.requests == fetched
+    assert snapshot.readme_index is snapshot.readme_index
+    assert info['githubInfo']['repositoryUrl'] == URL
+    assert info['githubInfo']['branchStructure'] == 'main, develop'
+    assert [author['login'] for author in info['githubInfo']['contributors']] == ['alice']
+    assert 'Dart' in tech_stack
+    assert features == ['포트홀 탐지: 카메라 영상에서 실시간 탐지', '지도 표시']
+    assert challenges == ['포트홀 신고가 늦게 처리됨']
+
+
+def test_snapshot_requests_only_listed_resources(api):
+    fetch(api, ('readme_text', 'languages'))
+    assert set(api.requests) == {'', '/readme', '/languages'}
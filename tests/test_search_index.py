@@ -0,0 +1,29 @@
+import project_store
+import search_index
+
+
+def make_projects(conn, *names: str):
+    with conn:
+        return project_store.insert_projects(conn, [
+            {'projectInfo': {'basicInfo': {'projectName': name, 'mainObjectives': ['Qz 탐지']}}} for name in names
+        ])
+
+
+def test_short_terms_fall_back_to_name_order(conn):
+    ids = make_projects(conn, 'zeta', 'Alpha', 'beta', 'alpha')
+    found = search_index.search(conn, 'qz')
+
+    assert found['total'] == 4
+    assert [result['projectName'] for result in found['results']] == ['Alpha', 'alpha', 'beta', 'zeta']
+    assert [result['id'] for result in found['results'][:2]] == [ids[1], ids[3]]
+    assert all(result['score'] is None for result in found['results'])
+    # 페이지를 나눠도 같은 순서
+    pages = [search_index.search(conn, 'qz', limit=2, offset=offset)['results'] for offset in (0, 2)]
+    assert [result['id'] for page in pages for result in page] == [result['id'] for result in found['results']]
+
+
+def test_long_terms_are_ranked(conn):
+    make_projects(conn, 'POTHOLE', 'other')
+    found = search_index.search(conn, 'POTHOLE qz')
+    assert [result['projectName'] for result in found['results']] == ['POTHOLE']
+    assert found['results'][0]['score'] is not None
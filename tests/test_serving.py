@@ -0,0 +1,95 @@
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from conftest import ROOT
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_log(log_path, text: str, count: int, process: subprocess.Popen, timeout: float = 30):
+    """서버 로그에 text가 count번 나올 때까지 기다립니다."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        log = log_path.read_text(encoding='utf-8', errors='replace')
+        assert process.poll() is None, log
+        if log.count(text) >= count:
+            return
+        time.sleep(0.2)
+    raise AssertionError(f"서버가 시작되지 않았습니다:\n{log}")
+
+
+def test_multiple_workers_start_and_drain(tmp_path):
+    port = free_port()
+    log_path = tmp_path / 'server.log'
+    env = {**os.environ, 'PORTFOLIO_DB': str(tmp_path / 'portfolio.db'), 'HTTP_WORKERS': '1',
+           'DRAIN_DELAY': '0', 'SHUTDOWN_TIMEOUT': '5'}
+    with open(log_path, 'wb') as log_file:
+        process = subprocess.Popen(
+            [sys.executable, 'project_portfolio_server.py', '--workers', '2',
+             '--host', '127.0.0.1', '--port', str(port)],
+            cwd=ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT,
+        )
+    try:
+        wait_for_log(log_path, 'Application startup complete', 2, process)
+        assert httpx.get(f"http://127.0.0.1:{port}/health/live", timeout=5).status_code == 200
+        # --workers 2로 바꾼 워커 수가 워커 프로세스의 기본값에 반영되어 SSE를 끔
+        assert httpx.get(f"http://127.0.0.1:{port}/sse", timeout=5).status_code == 404
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=20)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            raise
+    assert process.returncode == 0
+    # 두 워커 모두 종료 신호를 받아 정상 종료
+    assert log_path.read_text(encoding='utf-8').count('Finished server process') == 2
+
+
+def test_crashed_worker_is_replaced(tmp_path):
+    port = free_port()
+    log_path = tmp_path / 'server.log'
+    env = {**os.environ, 'PORTFOLIO_DB': str(tmp_path / 'portfolio.db'), 'HTTP_WORKERS': '1',
+           'DRAIN_DELAY': '0', 'SHUTDOWN_TIMEOUT': '5', 'WORKER_RESTART_DELAY': '0.1'}
+    with open(log_path, 'wb') as log_file:
+        process = subprocess.Popen(
+            [sys.executable, 'project_portfolio_server.py', '--workers', '2',
+             '--host', '127.0.0.1', '--port', str(port)],
+            cwd=ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT,
+        )
+    try:
+        wait_for_log(log_path, 'Application startup complete', 2, process)
+        pids = re.findall(r'Started server process \[(\d+)\]', log_path.read_text(encoding='utf-8'))
+        assert len(pids) == 2
+        os.kill(int(pids[0]), signal.SIGKILL)
+
+        # 죽은 워커를 알리고 새 워커를 띄움
+        wait_for_log(log_path, 'Application startup complete', 3, process)
+        log = log_path.read_text(encoding='utf-8')
+        assert f"Worker process [{pids[0]}] exited with code -9" in log
+        restarted = re.findall(r'Started server process \[(\d+)\]', log)
+        assert len(restarted) == 3 and restarted[2] not in pids
+        assert httpx.get(f"http://127.0.0.1:{port}/health/live", timeout=5).status_code == 200
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=20)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            raise
+    assert process.returncode == 0
+    # 남은 워커와 새 워커만 정상 종료 (종료 신호로 끝난 워커는 다시 띄우지 않음)
+    log = log_path.read_text(encoding='utf-8')
+    assert log.count('Finished server process') == 2
+    assert log.count('restarting in') == 1
@@ -0,0 +1,312 @@
+"""
+GitHub 토큰 풀
+
+여러 개의 개인 액세스 토큰(PAT)과 GitHub App 설치 토큰을 함께 사용해 rate limit을 나눠 씁니다.
+
+- 응답의 X-RateLimit-Remaining / X-RateLimit-Reset 헤더로 토큰별 남은 요청 수와 리셋 시각을 추적합니다.
+- 요청마다 여유(남은 요청 수 - 처리 중인 요청 수)가 가장 큰 토큰을 고릅니다.
+- 2차(secondary) rate limit은 해당 토큰만 Retry-After 동안 제외합니다.
+- 모든 토큰이 소진되면 가장 먼저 풀리는 시각까지 남은 시간을 정확히 알려 줍니다.
+  기다릴지(MAX_RATE_LIMIT_WAIT 이하) 바로 실패할지는 호출하는 쪽에서 정합니다.
+- App 설치 토큰은 만료 APP_TOKEN_REFRESH_MARGIN초 전에 새로 발급받습니다. 발급에 실패한 토큰은
+  APP_TOKEN_RETRY_AFTER초 동안 제외하고 그동안 다시 발급하지 않습니다.
+
+설정 (환경 변수)
+
+- GITHUB_TOKENS: 쉼표 또는 공백으로 구분한 PAT 목록. GITHUB_TOKEN도 함께 사용합니다.
+- GITHUB_APP_ID, GITHUB_APP_PRIVATE_KEY(PEM 내용) 또는 GITHUB_APP_PRIVATE_KEY_PATH,
+  GITHUB_APP_INSTALLATION_IDS(쉼표로 구분)
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+# 응답을 받기 전까지 가정하는 시간당 요청 수
+DEFAULT_LIMIT = 5000
+ANONYMOUS_LIMIT = 60
+# 만료까지 이보다 적게 남은 App 설치 토큰은 새로 발급
+APP_TOKEN_REFRESH_MARGIN = 300
+# App 토큰 발급에 실패한 토큰을 제외하는 시간
+APP_TOKEN_RETRY_AFTER = 60.0
+# Retry-After 없이 2차 rate limit을 받았을 때 기다리는 시간 (GitHub 권장값)
+SECONDARY_LIMIT_WAIT = 60.0
+
+_SEPARATOR = re.compile(r'[\s,]+')
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def rate_limit_delay(response) -> Optional[float]:
+    """rate limit 응답이면 토큰을 다시 쓸 수 있을 때까지 남은 초, 아니면 None
+
+    response는 status_code, headers(대소문자 구분 없음), text를 가진 httpx/requests 응답입니다.
+    """
+    if response.status_code not in (403, 429):
+        return None
+    retry_after = response.headers.get('retry-after')
+    if retry_after is not None:
+        return float(retry_after)
+    if response.headers.get('x-ratelimit-remaining') == '0':
+        reset = float(response.headers.get('x-ratelimit-reset', time.time()))
+        # 리셋 시각은 초 단위로 잘려 있으므로 이미 지났더라도 1초는 기다림
+        return max(1.0, reset - time.time())
+    if 'secondary rate limit' in response.text.lower():
+        return SECONDARY_LIMIT_WAIT
+    return None
+
+
+class TokenState:
+    """토큰 하나의 rate limit 상태"""
+
+    def __init__(self, label: str, token: Optional[str], limit: int = DEFAULT_LIMIT):
+        # 지표와 로그에 쓰는 이름 (토큰 원문은 노출하지 않음)
+        self.label = label
+        self.token = token
+        self.limit = limit
+        # 아직 응답을 받지 못했으면 None
+        self.remaining: Optional[int] = None
+        # 할당량이 리셋되는 시각 (epoch)
+        self.reset = 0.0
+        # 2차 rate limit 등으로 쓰지 않아야 하는 시각 (epoch)
+        self.blocked_until = 0.0
+        self.inflight = 0
+
+    @property
+    def identity(self) -> str:
+        """토큰이 바뀌어도 유지되는 식별자 (캐시 키에 사용)"""
+        return 'token:' + hashlib.sha256((self.token or '').encode()).hexdigest()
+
+    @property
+    def authorization(self) -> Optional[str]:
+        return f"token {self.token}" if self.token else None
+
+    def headroom(self, now: float) -> int:
+        """지금 보낼 수 있는 요청 수. 리셋 시각이 지났으면 전체 한도를 씁니다."""
+        if now < self.blocked_until:
+            return 0
+        remaining = self.limit if self.remaining is None or now >= self.reset else self.remaining
+        return remaining - self.inflight
+
+    def available_at(self, now: float) -> float:
+        """다시 요청을 보낼 수 있게 되는 시각"""
+        at = self.blocked_until
+        if self.remaining is not None and now < self.reset and self.remaining - self.inflight <= 0:
+            at = max(at, self.reset)
+        return max(at, now)
+
+    @property
+    def ready(self) -> bool:
+        """요청에 쓸 수 있는 토큰이 있는지 (발급 전인 App 토큰은 False)"""
+        return True
+
+    def needs_refresh(self, now: float) -> bool:
+        return False
+
+    def refresh(self):
+        pass
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            'token': self.label,
+            'limit': self.limit,
+            'remaining': self.remaining,
+            'reset': _isoformat(self.reset),
+            'inflight': self.inflight,
+            'blockedFor': round(max(self.blocked_until - now, 0.0), 1),
+        }
+
+
+class AppInstallationToken(TokenState):
+    """GitHub App 설치 토큰. 만료가 가까워지면 App 개인 키로 새로 발급받습니다."""
+
+    def __init__(self, app_id: str, private_key: str, installation_id: int, base_url: str = GITHUB_API_URL):
+        super().__init__(f"app-{installation_id}", None)
+        self.app_id = app_id
+        self.private_key = private_key
+        self.installation_id = installation_id
+        self.base_url = base_url
+        self.expires_at = 0.0
+
+    @property
+    def identity(self) -> str:
+        # 설치 토큰은 한 시간마다 바뀌지만 접근 권한은 설치 단위로 같음
+        return f"app:{self.app_id}:{self.installation_id}"
+
+    @property
+    def ready(self) -> bool:
+        return self.token is not None
+
+    def needs_refresh(self, now: float) -> bool:
+        # 발급에 실패해 제외된 동안에는 요청마다 다시 발급을 시도하지 않음
+        if now < self.blocked_until:
+            return False
+        return self.token is None or self.expires_at - APP_TOKEN_REFRESH_MARGIN <= now
+
+    def refresh(self):
+        """설치 토큰을 발급받습니다. 네트워크 요청이 있으므로 이벤트 루프 밖에서 호출해야 합니다."""
+        from github import Auth, GithubIntegration
+
+        integration = GithubIntegration(auth=Auth.AppAuth(self.app_id, self.private_key), base_url=self.base_url)
+        access = integration.get_access_token(self.installation_id)
+        self.token = access.token
+        self.expires_at = access.expires_at.timestamp()
+
+
+class TokenPool:
+    """여유가 가장 큰 토큰으로 요청을 보내는 토큰 풀"""
+
+    def __init__(self, states: List[TokenState]):
+        self.states = states or [TokenState('anonymous', None, ANONYMOUS_LIMIT)]
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        identities = '\n'.join(sorted(state.identity for state in self.states))
+        # 토큰을 바꿔 가며 보내도 같은 캐시 항목을 쓰도록 풀 전체를 하나의 인증 정보로 취급
+        self.identity = 'pool:' + hashlib.sha256(identities.encode()).hexdigest()
+
+    @classmethod
+    def from_tokens(cls, tokens: List[str]) -> 'TokenPool':
+        unique = list(dict.fromkeys(token for token in tokens if token))
+        return cls([TokenState(f"pat-{index}", token) for index, token in enumerate(unique, 1)])
+
+    @classmethod
+    def from_env(cls) -> 'TokenPool':
+        tokens = _SEPARATOR.split(os.getenv('GITHUB_TOKENS', '').strip())
+        tokens.append(os.getenv('GITHUB_TOKEN', ''))
+        pool = cls.from_tokens(tokens)
+        apps = _app_tokens_from_env()
+        if apps:
+            pool = cls([state for state in pool.states if state.token] + apps)
+        return pool
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def expiring(self) -> bool:
+        """새로 발급받아야 하는 App 토큰이 있는지"""
+        now = time.time()
+        return any(state.needs_refresh(now) for state in self.states)
+
+    def refresh_expiring(self):
+        """만료가 가까운 App 토큰을 새로 발급받습니다. 실패한 토큰은 잠시 제외합니다."""
+        with self._refresh_lock:
+            now = time.time()
+            for state in self.states:
+                if not state.needs_refresh(now):
+                    continue
+                try:
+                    state.refresh()
+                except Exception as e:
+                    logger.warning("GitHub App 토큰 발급 실패 (%s): %s", state.label, e)
+                    with self._lock:
+                        state.blocked_until = max(state.blocked_until, now + APP_TOKEN_RETRY_AFTER)
+
+    def acquire(self) -> Tuple[Optional[TokenState], float]:
+        """여유가 가장 큰 토큰을 예약합니다.
+
+        (토큰, 0)을 반환하며, 모든 토큰이 소진되었으면 (None, 가장 먼저 풀릴 때까지 남은 초)입니다.
+        예약한 토큰은 응답을 받은 뒤 반드시 release()해야 합니다.
+        """
+        now = time.time()
+        with self._lock:
+            ready = [state for state in self.states if state.ready]
+            if ready:
+                best = max(ready, key=lambda state: state.headroom(now))
+                if best.headroom(now) > 0:
+                    best.inflight += 1
+                    return best, 0.0
+            return None, self._wait_time(now)
+
+    def release(self, state: TokenState, headers=None, retry_after: Optional[float] = None):
+        """응답 헤더로 토큰 상태를 갱신하고 예약을 해제합니다.
+
+        headers는 대소문자를 구분하지 않는 매핑이어야 합니다. retry_after는 rate limit 응답에서
+        계산한 대기 시간으로, 주어지면 그동안 이 토큰을 쓰지 않습니다.
+        """
+        now = time.time()
+        with self._lock:
+            state.inflight = max(state.inflight - 1, 0)
+            # 검색 API 등은 한도가 따로 있으므로 core 한도만 추적
+            if headers is not None and headers.get('x-ratelimit-resource', 'core') == 'core':
+                remaining = headers.get('x-ratelimit-remaining')
+                if remaining is not None:
+                    state.remaining = int(remaining)
+                limit = headers.get('x-ratelimit-limit')
+                if limit is not None:
+                    state.limit = int(limit)
+                reset = headers.get('x-ratelimit-reset')
+                if reset is not None:
+                    state.reset = float(reset)
+            if retry_after is not None:
+                state.blocked_until = max(state.blocked_until, now + retry_after)
+
+    def _wait_time(self, now: float) -> float:
+        ready = [state for state in self.states if state.ready]
+        if any(state.headroom(now) > 0 for state in ready):
+            return 0.0
+        return min(state.available_at(now) for state in (ready or self.states)) - now
+
+    def wait_time(self) -> float:
+        """모든 토큰이 소진되었을 때 가장 먼저 풀릴 때까지 남은 초 (여유가 있으면 0)"""
+        now = time.time()
+        with self._lock:
+            return self._wait_time(now)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            return [state.snapshot(now) for state in self.states]
+
+
+def _app_tokens_from_env() -> List[AppInstallationToken]:
+    app_id = os.getenv('GITHUB_APP_ID')
+    installations = [value for value in _SEPARATOR.split(os.getenv('GITHUB_APP_INSTALLATION_IDS', '')) if value]
+    if not app_id or not installations:
+        return []
+    private_key = os.getenv('GITHUB_APP_PRIVATE_KEY')
+    key_path = os.getenv('GITHUB_APP_PRIVATE_KEY_PATH')
+    if not private_key and key_path:
+        with open(key_path, encoding='utf-8') as f:
+            private_key = f.read()
+    if not private_key:
+        logger.warning("GITHUB_APP_ID가 설정되었지만 개인 키가 없어 App 토큰을 사용하지 않습니다.")
+        return []
+    return [AppInstallationToken(app_id, private_key, int(installation)) for installation in installations]
+
+
+_pool: Optional[TokenPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_token_pool() -> TokenPool:
+    """환경 변수로 구성한 프로세스 전역 토큰 풀을 반환합니다."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = TokenPool.from_env()
+                metrics.register_collector('github_tokens', _collect_metrics)
+    return _pool
+
+
+def _collect_metrics():
+    states = get_token_pool().snapshot()
+    yield ('github_token_remaining', 'gauge', '토큰별 남은 GitHub API 요청 수 (응답 헤더 기준)',
+           [({'token': state['token']}, state['remaining']) for state in states if state['remaining'] is not None])
+    yield ('github_token_inflight', 'gauge', '토큰별 처리 중인 GitHub API 요청 수',
+           [({'token': state['token']}, state['inflight']) for state in states])
+    yield ('github_token_blocked_seconds', 'gauge', '2차 rate limit 등으로 토큰을 쓰지 않는 남은 시간',
+           [({'token': state['token']}, state['blockedFor']) for state in states])